@@ -2,12 +2,16 @@ import pygame
 import sys
 import os
 from enum import Enum, auto
-from pathlib import Path
 import time
 import math
 import random
 from typing import List, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from frame_profiler import FrameProfiler
+from scene_manager import BaseScene, SceneManager, preload_scene, register
+from prefetch import prefetcher
+from asset_manager import assets
+from runtime import get_runtime
+import profiling
 
 # Game Constants
 SCREEN_WIDTH = 1280
@@ -53,27 +57,30 @@ VICTORY_SOUND_PATH = os.path.join(AUDIO_DIR, "gong.wav")
 # Font path
 FONT_PATH = os.path.join(FONT_DIR, "pixel_font.ttf")
 
-class AssetLoader:
-    @staticmethod
-    def load_image(path):
-        """Load and scale an image"""
-        try:
-            image = pygame.image.load(path)
-            return pygame.transform.scale(image, (1280, 720))
-        except Exception as e:
-            print(f"Warning: Could not load image {path}: {e}")
-            surface = pygame.Surface((1280, 720))
-            surface.fill((128, 128, 128))
-            return surface
-    
-    @staticmethod
-    def load_sound(path):
-        """Load a sound file"""
-        try:
-            return pygame.mixer.Sound(path)
-        except Exception as e:
-            print(f"Warning: Could not load sound {path}: {e}")
-            return None
+# Everything the story and the card game load, prefetched behind the loading bar (or from the map)
+BANAUE_ASSETS = [
+    ('scaled_image', BACKGROUND_PATH, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    ('scaled_image', CARD_BACK_PATH, (CARD_WIDTH, CARD_HEIGHT)),
+    ('scaled_image', FIRST_FARM_PATH, (1280, 720)),
+    ('scaled_image', SECOND_RITUAL_PATH, (1280, 720)),
+    ('scaled_image', THIRD_PANIC_PATH, (1280, 720)),
+    ('scaled_image', FOURTH_CLICK_PATH, (1280, 720)),
+    ('sound', CLICK_SOUND_PATH),
+    ('sound', MATCH_SOUND_PATH),
+    ('sound', WRONG_SOUND_PATH),
+    ('sound', VICTORY_SOUND_PATH),
+    ('sound', FIRST_NATURE_SOUND_PATH),
+    ('sound', SECOND_RITUAL_SOUND_PATH),
+    ('sound', THIRD_PANIC_SOUND_PATH),
+    ('sound', FOURTH_CLICK_SOUND_PATH),
+    ('sound', TYPEWRITER_SOUND_PATH),
+    ('font', FONT_PATH, 14),
+    ('font', FONT_PATH, 20),
+    ('font', FONT_PATH, 24),
+    ('font', FONT_PATH, 32),
+]
+BANAUE_ASSETS += [('scaled_image', os.path.join(CARDS_DIR, f"pair{i}_card{card}.png"), (CARD_WIDTH, CARD_HEIGHT))
+                  for i in range(1, 9) for card in (1, 2)]
 
 class LoadingScreen:
     def __init__(self, screen: pygame.Surface):
@@ -223,16 +230,14 @@ class Card:
         self.is_matched = False
         
         try:
-            self.image = pygame.image.load(image_path)
-            self.image = pygame.transform.scale(self.image, (CARD_WIDTH, CARD_HEIGHT))
+            self.image = assets.scaled_image(image_path, (CARD_WIDTH, CARD_HEIGHT))
         except pygame.error as e:
             print(f"Error loading card image {image_path}: {e}")
             self.image = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
             self.image.fill(WHITE)
             
         try:
-            self.back = pygame.image.load(CARD_BACK_PATH)
-            self.back = pygame.transform.scale(self.back, (CARD_WIDTH, CARD_HEIGHT))
+            self.back = assets.scaled_image(CARD_BACK_PATH, (CARD_WIDTH, CARD_HEIGHT))
         except pygame.error as e:
             print(f"Error loading card back image: {e}")
             self.back = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
@@ -245,16 +250,12 @@ class Card:
         else:
             screen.blit(self.back, self.rect)
 
-class Game:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-        
-        self.screen = pygame.display.get_surface()
-        if not self.screen:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-            
-        pygame.display.set_caption("BANAUE")
+class Game(BaseScene):
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("BANAUE")
+        self.profiler = FrameProfiler('banaue')  # F3 overlay, CSV dump with ISLA_FRAME_CSV
             
         # Fade-in effect variables
         self.fade_alpha = 255
@@ -263,10 +264,10 @@ class Game:
         
         # Load sound effects
         try:
-            self.click_sound = pygame.mixer.Sound(CLICK_SOUND_PATH)
-            self.match_sound = pygame.mixer.Sound(MATCH_SOUND_PATH)
-            self.wrong_sound = pygame.mixer.Sound(WRONG_SOUND_PATH)
-            self.victory_sound = pygame.mixer.Sound(VICTORY_SOUND_PATH) 
+            self.click_sound = assets.sound(CLICK_SOUND_PATH)
+            self.match_sound = assets.sound(MATCH_SOUND_PATH)
+            self.wrong_sound = assets.sound(WRONG_SOUND_PATH)
+            self.victory_sound = assets.sound(VICTORY_SOUND_PATH) 
             
             self.click_sound.set_volume(0.4)
             self.match_sound.set_volume(0.6)
@@ -281,8 +282,7 @@ class Game:
         
         # Load background
         try:
-            self.background = pygame.image.load(BACKGROUND_PATH)
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.background = assets.scaled_image(BACKGROUND_PATH, (SCREEN_WIDTH, SCREEN_HEIGHT))
         except pygame.error as e:
             print(f"Error loading background: {e}")
             self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -290,9 +290,9 @@ class Game:
         
         # Initialize fonts
         try:
-            self.font = pygame.font.Font(FONT_PATH, 24)
-            self.font_large = pygame.font.Font(FONT_PATH, 32)
-            self.font_small = pygame.font.Font(FONT_PATH, 20)
+            self.font = assets.font(FONT_PATH, 24)
+            self.font_large = assets.font(FONT_PATH, 32)
+            self.font_small = assets.font(FONT_PATH, 20)
         except pygame.error as e:
             print(f"Error loading font: {e}")
             self.font = pygame.font.SysFont(None, 24)
@@ -320,16 +320,11 @@ class Game:
         self.flip_timer = 0
         self.waiting_to_flip_back = False
         
-        # Start background music with fade-in
+        # Start background music silent, it fades in with the screen
         try:
             pygame.mixer.music.load(BACKGROUND_MUSIC_PATH)
             pygame.mixer.music.set_volume(0.0)
             pygame.mixer.music.play(-1)
-            
-            # Fade in music
-            for vol in range(0, 31):
-                pygame.mixer.music.set_volume(vol/100)
-                pygame.time.delay(30)
         except pygame.error as e:
             print(f"Error loading background music: {e}")
 
@@ -406,54 +401,29 @@ class Game:
                 break
 
     def transition_to_map(self):
-        # Create fade out effect
-        fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        fade_surface.fill((0, 0, 0))
-        fade_alpha = 0
-        fade_speed = 5
-
-        # Fade out loop
-        while fade_alpha < 255:
-            # Handle any quit events during transition
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-            # Draw current game state
-            self.screen.blit(self.background, (0, 0))
-            for card in self.cards:
-                card.draw(self.screen)
-            if self.player_won:
-                self.draw_victory_screen()
-
-            # Draw fade overlay
-            fade_surface.set_alpha(fade_alpha)
-            self.screen.blit(fade_surface, (0, 0))
-            pygame.display.flip()
-            
-            fade_alpha += fade_speed
-            pygame.time.Clock().tick(60)
+        # Fade out over the game, then return to the map
+        self.manager.fade_out(self.leave_to_map)
 
+    def leave_to_map(self):
         # Stop all sounds
         pygame.mixer.music.stop()
         pygame.mixer.stop()
+        self.manager.back_to('map')
 
-        # Import and start map
-        import map
-        try:
-            self.running = False
-            map.main()
-        except Exception as e:
-            print(f"Error transitioning to map: {e}")
-            self.running = False
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and not self.player_won:
+            self.handle_click(event.pos)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE and self.player_won:
+                self.transition_to_map()
 
-    def update(self):
+    def update(self, dt):
         if self.player_won:
             # Play victory sound once when victory is first achieved
             if not self.victory_sound_played:
                 self.victory_sound.play()
                 self.victory_sound_played = True
+                preload_scene('map', self.runtime)  # Ready before the player presses space
             
             self.victory_prompt_timer += 1/60
             if self.victory_prompt_timer >= self.victory_prompt_interval:
@@ -504,7 +474,7 @@ class Game:
             prompt_surface.set_alpha(alpha)
             self.screen.blit(prompt_surface, prompt_rect)
 
-    def draw(self):
+    def draw(self, screen):
         self.screen.blit(self.background, (0, 0))
         
         for card in self.cards:
@@ -519,40 +489,20 @@ class Game:
             fade_surface.set_alpha(self.fade_alpha)
             self.screen.blit(fade_surface, (0, 0))
             self.fade_alpha = max(0, self.fade_alpha - self.fade_speed)
+            pygame.mixer.music.set_volume(0.3 * (1 - self.fade_alpha / 255))
             if self.fade_alpha <= 0:
                 self.fading_in = False
-                pygame.mixer.music.set_volume(0.3)
-        
-        pygame.display.flip()
 
     def run(self):
-        clock = pygame.time.Clock()
-        running = True
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN and not self.player_won:
-                    self.handle_click(event.pos)
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.player_won:
-                        self.transition_to_map()
-                        return  # Exit run loop after transition starts
-            
-            self.update()
-            self.draw()
-            clock.tick(60)
-
-        pygame.quit()
+        SceneManager(self.runtime).run(self)
+        self.runtime.shutdown()
 
 class Scene:
     def __init__(self, image_path: str, text: str, font: pygame.font.Font, 
                  sound_path: str = None, is_first_scene: bool = False, 
                  is_final_scene: bool = False):
         # Visual elements
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(self.image, (1280, 720))
+        self.image = assets.scaled_image(image_path, (1280, 720))
         self.text = text
         self.font = font
         
@@ -591,7 +541,7 @@ class Scene:
         self.sound = None
         if sound_path:
             try:
-                self.sound = pygame.mixer.Sound(sound_path)
+                self.sound = assets.sound(sound_path)
                 self.sound.set_volume(0.0)
             except Exception as e:
                 print(f"Warning: Could not load sound {sound_path}: {e}")
@@ -602,7 +552,7 @@ class Scene:
         # Typewriter sound
         self.typewriter_sound = None
         try:
-            self.typewriter_sound = pygame.mixer.Sound(TYPEWRITER_SOUND_PATH)
+            self.typewriter_sound = assets.sound(TYPEWRITER_SOUND_PATH)
             self.typewriter_sound.set_volume(0.5)
         except Exception as e:
             print(f"Warning: Could not load typewriter sound: {e}")
@@ -761,19 +711,11 @@ class Scene:
         if self.typewriter_sound and self.typewriter_sound.get_num_channels() > 0:
             self.typewriter_sound.stop()
 
-class OpeningSequence:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-        
-        self.screen = pygame.display.get_surface()
-        if not self.screen:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-                
-        pygame.display.set_caption("BANAUE")
-
-        # Add clock initialization here
-        self.clock = pygame.time.Clock()
+class OpeningSequence(BaseScene):
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("BANAUE")
 
         # Fade-in effect variables
         self.fade_alpha = 255
@@ -781,7 +723,7 @@ class OpeningSequence:
         self.fade_speed = 5
         
         try:
-            self.font = pygame.font.Font(FONT_PATH, 14)
+            self.font = assets.font(FONT_PATH, 14)
             pygame.display.set_icon(pygame.image.load(FIRST_FARM_PATH))
         except pygame.error as e:
             print(f"Error loading font or icon: {e}")
@@ -820,181 +762,98 @@ class OpeningSequence:
 
     def transition_to_game(self):
         """Smooth transition from story to game"""
-        # Create fade out effect
-        fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        fade_surface.fill((0, 0, 0))
-        fade_alpha = 0
-        fade_speed = 5
-
-        # Fade out loop
-        while fade_alpha < 255:
-            # Handle any quit events during transition
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-            # Draw current scene state
-            self.screen.fill((0, 0, 0))
-            self.scenes[self.current_scene].render(self.screen)
-
-            # Draw fade overlay
-            fade_surface.set_alpha(fade_alpha)
-            self.screen.blit(fade_surface, (0, 0))
-            pygame.display.flip()
-            
-            fade_alpha += fade_speed
-            self.clock.tick(60)
+        self.manager.fade_out(self.start_game)
 
+    def start_game(self):
         # Stop all sounds from story sequence
         for scene in self.scenes:
             scene.stop_sound()
+        self.manager.replace('banaue_game')
 
-        try:
-            # Start game with fade in
-            game = Game()
-            game.run()
-        except Exception as e:
-            print(f"Error starting game: {e}")
-            self.cleanup()
-            sys.exit(1)
+    def enter(self):
+        self.scenes[self.current_scene].start_sound()
 
-    def cleanup(self):
+    def exit(self):
         for scene in self.scenes:
             scene.stop_sound()
-        pygame.quit()
-        sys.exit()
 
-    def run(self):
-        running = True
-        self.scenes[0].start_sound()
-        
-        while running:
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_SPACE:
             current_time = pygame.time.get_ticks()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        current_scene = self.scenes[self.current_scene]
-                        
-                        if current_scene.is_final_scene and current_scene.final_text_shown:
-                            self.transition_to_game()
-                            return
-                        
-                        if current_time - self.last_space_time >= self.space_cooldown:
-                            self.last_space_time = current_time
-                            if not self.transitioning:
-                                if current_scene.typewriter_sound and current_scene.typewriter_sound.get_num_channels() > 0:
-                                    current_scene.typewriter_sound.stop()
-                                current_scene.ready_for_next = True
-                                current_scene.state = SceneState.FADE_OUT
-                                self.transitioning = True
-                                
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
-            
-            self.screen.fill((0, 0, 0))
             current_scene = self.scenes[self.current_scene]
-            current_scene.update()
             
-            if self.transitioning and current_scene.transition_complete:
-                if self.current_scene < len(self.scenes) - 1:
-                    current_scene.stop_sound()
-                    self.current_scene += 1
-                    self.scenes[self.current_scene].start_sound()
-                    self.transitioning = False
-                    current_scene.transition_complete = False
+            if current_scene.is_final_scene and current_scene.final_text_shown:
+                self.transition_to_game()
+                return
             
-            current_scene.render(self.screen)
-            pygame.display.flip()
-            self.clock.tick(60)
+            if current_time - self.last_space_time >= self.space_cooldown:
+                self.last_space_time = current_time
+                if not self.transitioning:
+                    if current_scene.typewriter_sound and current_scene.typewriter_sound.get_num_channels() > 0:
+                        current_scene.typewriter_sound.stop()
+                    current_scene.ready_for_next = True
+                    current_scene.state = SceneState.FADE_OUT
+                    self.transitioning = True
+                    
+        elif event.key == pygame.K_ESCAPE:
+            self.manager.quit()
 
-        self.cleanup()
+    def update(self, dt):
+        current_scene = self.scenes[self.current_scene]
+        current_scene.update()
+        
+        if self.transitioning and current_scene.transition_complete:
+            if self.current_scene < len(self.scenes) - 1:
+                current_scene.stop_sound()
+                self.current_scene += 1
+                self.scenes[self.current_scene].start_sound()
+                self.transitioning = False
+                current_scene.transition_complete = False
 
-def main():
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-    
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("BANAUE")
-    clock = pygame.time.Clock()
-    
-    # Initialize loading screen
-    loading_screen = LoadingScreen(screen)
-    
-    # Asset loading configuration
-    assets_to_load = [
-        (AssetLoader.load_image, BACKGROUND_PATH),
-        (AssetLoader.load_image, CARD_BACK_PATH),
-        (AssetLoader.load_image, FIRST_FARM_PATH),
-        (AssetLoader.load_image, SECOND_RITUAL_PATH),
-        (AssetLoader.load_image, THIRD_PANIC_PATH),
-        (AssetLoader.load_image, FOURTH_CLICK_PATH),
-        (AssetLoader.load_sound, BACKGROUND_MUSIC_PATH),
-        (AssetLoader.load_sound, CLICK_SOUND_PATH),
-        (AssetLoader.load_sound, MATCH_SOUND_PATH),
-        (AssetLoader.load_sound, WRONG_SOUND_PATH),
-        (AssetLoader.load_sound, FIRST_NATURE_SOUND_PATH),
-        (AssetLoader.load_sound, SECOND_RITUAL_SOUND_PATH),
-        (AssetLoader.load_sound, THIRD_PANIC_SOUND_PATH),
-        (AssetLoader.load_sound, FOURTH_CLICK_SOUND_PATH),
-        (AssetLoader.load_sound, TYPEWRITER_SOUND_PATH),
-    ]
-    
-    # Add card images to assets
-    card_pairs_path = Path(CARDS_DIR)
-    for i in range(1, 9):
-        assets_to_load.append((AssetLoader.load_image, str(card_pairs_path / f"pair{i}_card1.png")))
-        assets_to_load.append((AssetLoader.load_image, str(card_pairs_path / f"pair{i}_card2.png")))
-    
-    total_assets = len(assets_to_load)
-    loaded_assets = 0
-    chunk_size = 4  # Load assets in smaller chunks to prevent thread overload
-    
-    # Load assets with progress tracking
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        for i in range(0, total_assets, chunk_size):
-            chunk = assets_to_load[i:i + chunk_size]
-            futures = []
-            
-            for loader_func, asset_path in chunk:
-                future = executor.submit(loader_func, asset_path)
-                futures.append(future)
-            
-            running = True
-            while running and not all(f.done() for f in futures):
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                        break
-                
-                completed = sum(1 for f in futures if f.done())
-                current_progress = (loaded_assets + completed) / total_assets
-                
-                loading_screen.update(current_progress)
-                loading_screen.draw()
-                pygame.display.flip()
-                
-                pygame.time.wait(10)  # Small delay to prevent CPU overload
-                clock.tick(60)
-            
-            if not running:
-                break
-                
-            loaded_assets += len(chunk)
-            pygame.time.wait(20)  # Brief pause between chunks
-    
-    if running:
-        # Brief pause to ensure all resources are properly loaded
-        pygame.time.wait(100)
-        # Start the opening sequence
-        sequence = OpeningSequence()
-        sequence.run()
-    else:
-        pygame.quit()
+    def draw(self, screen):
+        self.screen.fill((0, 0, 0))
+        self.scenes[self.current_scene].render(self.screen)
+
+    def run(self):
+        SceneManager(self.runtime).run(self)
+        self.runtime.shutdown()
         sys.exit()
 
+class Loading(BaseScene):
+    """Prefetches the Banaue assets in the background behind a loading bar, then starts the story"""
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("BANAUE")
+        
+        # Initialize loading screen
+        self.loading_screen = LoadingScreen(self.screen)
+
+    def enter(self):
+        # Usually already under way, started when Ifugao was picked on the map
+        prefetcher.prefetch(['banaue'])
+
+    def update(self, dt):
+        prefetcher.update()
+        self.loading_screen.update(prefetcher.progress())
+        if prefetcher.done:
+            # Start the opening sequence
+            self.manager.replace('banaue_story')
+
+    def draw(self, screen):
+        self.loading_screen.draw()
+
+register('banaue', Loading, assets=BANAUE_ASSETS)
+register('banaue_story', OpeningSequence)
+register('banaue_game', Game)
+
+def main():
+    runtime = get_runtime(caption="BANAUE")
+    SceneManager(runtime).run(Loading(runtime))
+    runtime.shutdown()
+    sys.exit()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiling.run('banaue', main)
\ No newline at end of file
@@ -4,25 +4,29 @@ import time
 import math
 from pygame import gfxdraw
 from pygame import mixer
-from storyscreen_intramuros import OpeningSequence  # Import the OpeningSequence class
+from frame_profiler import FrameProfiler
+from scene_manager import BaseScene, SceneManager, register
+from runtime import get_runtime
+from asset_manager import assets
+import profiling
 
-class GameLauncher:
-    def __init__(self):
-        pygame.init()
-        mixer.init()
-        self.screen_width = 1280
-        self.screen_height = 720
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("ISLA")
-        self.clock = pygame.time.Clock()
+class GameLauncher(BaseScene):
+    fps = 144
+
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.screen_width, self.screen_height = self.runtime.size
+        self.runtime.set_caption("ISLA")
+        self.profiler = FrameProfiler('launcher')  # F3 overlay, CSV dump with ISLA_FRAME_CSV
         self.state = 'splash'
         
         self.background = (0, 0, 0)
         
         # Audio setup
         try:
-            self.music = mixer.Sound("audio/islamapost.mp3")
-            self.click_sound = mixer.Sound("audio/click.wav")
+            self.music = assets.sound("audio/islamapost.mp3")
+            self.click_sound = assets.sound("audio/click.wav")
             self.click_sound.set_volume(0.5)
             self.current_volume = 0.0
             self.target_volume = 0.7
@@ -33,13 +37,9 @@ class GameLauncher:
             sys.exit(1)
         
         try:
-            self.pygame_logo = pygame.image.load("assets/pygame_powered.png").convert_alpha()
-            self.dev_logo = pygame.image.load("assets/Logo2.png").convert_alpha()
-            self.menu_background = pygame.image.load('assets/menu_screen.png')
-            self.menu_background = pygame.transform.scale(
-                self.menu_background, 
-                (self.screen_width, self.screen_height)
-            )
+            self.pygame_logo = assets.image("assets/pygame_powered.png")
+            self.dev_logo = assets.image("assets/Logo2.png")
+            self.menu_background = assets.scaled_image('assets/menu_screen.png', (self.screen_width, self.screen_height))
             
             pygame_aspect = self.pygame_logo.get_width() / self.pygame_logo.get_height()
             dev_aspect = self.dev_logo.get_width() / self.dev_logo.get_height()
@@ -68,6 +68,16 @@ class GameLauncher:
         self.menu_reveal_complete = False
         self.click_played = False
 
+        # Splash steps, each drawn frame by frame: (step, extra arguments)
+        self.cross_fade_surface = pygame.Surface((self.screen_width, self.screen_height))
+        self.cross_fade_surface.fill(self.background)
+        self.splash_steps = [(self.cross_fade, 0.8),
+                             (self.display_logo, self.pygame_logo_orig),
+                             (self.cross_fade, 0.8),
+                             (self.display_logo, self.dev_logo_orig, True),
+                             (self.cross_fade, 0.8),
+                             (self.reveal_menu,)]
+
     def scale_image(self, surface, size):
         return pygame.transform.smoothscale(surface, size)  # Using smoothscale for better quality
 
@@ -101,180 +111,129 @@ class GameLauncher:
             
         return scaled
 
-    def display_logo(self, logo, is_final=False):
-        start_time = time.time()
+    def display_logo(self, current_time, logo, is_final=False):
+        """Draw one frame of a logo zooming in, holding and fading out; False once it has finished"""
         zoom_in_duration = 2.5
         hold_duration = 3.0 if is_final else 1.8
         fade_out_duration = 1.2
         total_duration = zoom_in_duration + hold_duration + fade_out_duration
         
-        last_scale = 0.01
-        last_rotation = 0
-        
-        while True:
-            current_time = time.time() - start_time
-            
-            if current_time >= total_duration:
-                break
-                
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        return True
+        if current_time >= total_duration:
+            return False
 
-            if self.music_started:
-                if current_time < zoom_in_duration:
-                    target_volume = self.target_volume * (current_time / zoom_in_duration)
-                elif current_time < (zoom_in_duration + hold_duration):
-                    target_volume = self.target_volume
-                else:
-                    fade_progress = (current_time - (zoom_in_duration + hold_duration)) / fade_out_duration
-                    target_volume = self.target_volume * (1 - self.smooth_step(fade_progress))
-                
-                self.update_music_volume(target_volume, rate=0.025)
-            
-            self.screen.fill(self.background)
-            
+        if self.music_started:
             if current_time < zoom_in_duration:
-                progress = current_time / zoom_in_duration
-                ease_progress = self.smooth_step(progress)
-                target_scale = 0.01 + (0.99 * ease_progress)
-                scale = last_scale + (target_scale - last_scale) * 0.25  # Smoother scale interpolation
-                last_scale = scale
-                
-                target_rotation = 5 * (1 - ease_progress)
-                rotation = last_rotation + (target_rotation - last_rotation) * 0.25  # Smoother rotation
-                last_rotation = rotation
-                
-                alpha = int(255 * min(1, progress * 2))
+                target_volume = self.target_volume * (current_time / zoom_in_duration)
             elif current_time < (zoom_in_duration + hold_duration):
-                scale = 1.0
-                rotation = 0
-                alpha = 255
+                target_volume = self.target_volume
             else:
                 fade_progress = (current_time - (zoom_in_duration + hold_duration)) / fade_out_duration
-                scale = 1.0 + (0.05 * self.smooth_step(fade_progress))
-                rotation = 0
-                alpha = int(255 * (1 - self.smooth_step(fade_progress)))
+                target_volume = self.target_volume * (1 - self.smooth_step(fade_progress))
             
-            current_logo = self.transform_image(logo, scale, rotation)
-            x = (self.screen_width - current_logo.get_width()) // 2
-            y = (self.screen_height - current_logo.get_height()) // 2
-            
-            # Enhanced shadow
-            shadow_surf = pygame.Surface(current_logo.get_size(), pygame.SRCALPHA)
-            shadow_alpha = int(alpha * 0.3)
-            pygame.draw.ellipse(shadow_surf, (0, 0, 0, shadow_alpha),
-                              (0, 0, current_logo.get_width(), current_logo.get_height()))
-            shadow_surf = pygame.transform.smoothscale(
-                shadow_surf,
-                (int(current_logo.get_width() * 1.1),
-                 int(current_logo.get_height() * 1.1))
-            )
-            shadow_x = x - (shadow_surf.get_width() - current_logo.get_width()) // 2
-            shadow_y = y - (shadow_surf.get_height() - current_logo.get_height()) // 2
-            self.screen.blit(shadow_surf, (shadow_x, shadow_y))
+            self.update_music_volume(target_volume, rate=0.025)
+        
+        self.screen.fill(self.background)
+        
+        if current_time < zoom_in_duration:
+            progress = current_time / zoom_in_duration
+            ease_progress = self.smooth_step(progress)
+            target_scale = 0.01 + (0.99 * ease_progress)
+            scale = self.last_scale + (target_scale - self.last_scale) * 0.25  # Smoother scale interpolation
+            self.last_scale = scale
             
-            temp_surface = current_logo.copy()
-            temp_surface.set_alpha(alpha)
-            self.screen.blit(temp_surface, (x, y))
+            target_rotation = 5 * (1 - ease_progress)
+            rotation = self.last_rotation + (target_rotation - self.last_rotation) * 0.25  # Smoother rotation
+            self.last_rotation = rotation
             
-            pygame.display.flip()
-            self.clock.tick(144)
+            alpha = int(255 * min(1, progress * 2))
+        elif current_time < (zoom_in_duration + hold_duration):
+            scale = 1.0
+            rotation = 0
+            alpha = 255
+        else:
+            fade_progress = (current_time - (zoom_in_duration + hold_duration)) / fade_out_duration
+            scale = 1.0 + (0.05 * self.smooth_step(fade_progress))
+            rotation = 0
+            alpha = int(255 * (1 - self.smooth_step(fade_progress)))
+        
+        current_logo = self.transform_image(logo, scale, rotation)
+        x = (self.screen_width - current_logo.get_width()) // 2
+        y = (self.screen_height - current_logo.get_height()) // 2
         
+        # Enhanced shadow
+        shadow_surf = pygame.Surface(current_logo.get_size(), pygame.SRCALPHA)
+        shadow_alpha = int(alpha * 0.3)
+        pygame.draw.ellipse(shadow_surf, (0, 0, 0, shadow_alpha),
+                          (0, 0, current_logo.get_width(), current_logo.get_height()))
+        shadow_surf = pygame.transform.smoothscale(
+            shadow_surf,
+            (int(current_logo.get_width() * 1.1),
+             int(current_logo.get_height() * 1.1))
+        )
+        shadow_x = x - (shadow_surf.get_width() - current_logo.get_width()) // 2
+        shadow_y = y - (shadow_surf.get_height() - current_logo.get_height()) // 2
+        self.screen.blit(shadow_surf, (shadow_x, shadow_y))
+        
+        temp_surface = current_logo.copy()
+        temp_surface.set_alpha(alpha)
+        self.screen.blit(temp_surface, (x, y))
         return True
 
-    def reveal_menu(self):
+    def reveal_menu(self, current_time):
+        """Draw one frame of the menu fading in with its music; False once it is fully shown"""
         if not self.music_started:
             self.music.play(-1)
             self.music_started = True
             
-        start_time = time.time()
         fade_duration = 2.5
+        progress = min(current_time / fade_duration, 1.0)
         
-        self.screen.blit(self.menu_background, (0, 0))
-        
-        while True:
-            current_time = time.time() - start_time
-            progress = min(current_time / fade_duration, 1.0)
-            
-            if progress >= 1.0:
-                self.menu_reveal_complete = True
-                break
-                
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-            
-            target_volume = self.target_volume * self.smooth_step(progress)
-            self.update_music_volume(target_volume, rate=0.025)
-            
-            fade_surface = pygame.Surface((self.screen_width, self.screen_height))
-            fade_surface.fill((0, 0, 0))
-            
-            ease_progress = self.smooth_step(progress)
-            fade_surface.set_alpha(int(255 * (1 - ease_progress)))
-            
+        if progress >= 1.0:
+            self.menu_reveal_complete = True
             self.screen.blit(self.menu_background, (0, 0))
-            self.screen.blit(fade_surface, (0, 0))
-            
-            pygame.display.flip()
-            self.clock.tick(144)
+            return False
         
-        return True
-
-    def cross_fade(self, duration=0.8):
-        start_time = time.time()
-        temp = pygame.Surface((self.screen_width, self.screen_height))
-        temp.fill(self.background)
+        target_volume = self.target_volume * self.smooth_step(progress)
+        self.update_music_volume(target_volume, rate=0.025)
         
-        while time.time() - start_time < duration:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-            
-            progress = (time.time() - start_time) / duration
-            alpha = int(255 * self.smooth_step(progress))
-            temp.set_alpha(alpha)
-            self.screen.blit(temp, (0, 0))
-            pygame.display.flip()
-            self.clock.tick(144)
+        fade_surface = pygame.Surface((self.screen_width, self.screen_height))
+        fade_surface.fill((0, 0, 0))
+        
+        ease_progress = self.smooth_step(progress)
+        fade_surface.set_alpha(int(255 * (1 - ease_progress)))
         
+        self.screen.blit(self.menu_background, (0, 0))
+        self.screen.blit(fade_surface, (0, 0))
         return True
 
-    def splash_sequence(self):
-        if not self.cross_fade(0.8):
-            return False
-        if not self.display_logo(self.pygame_logo_orig):
-            return False
-        if not self.cross_fade(0.8):
+    def cross_fade(self, current_time, duration=0.8):
+        """Draw one frame of the screen fading to the background colour; False once it is done"""
+        if current_time >= duration:
             return False
-        if not self.display_logo(self.dev_logo_orig, True):
-            return False
-        if not self.cross_fade(0.8):
-            return False
-        if not self.reveal_menu():
-            return False
-        self.state = 'menu'
+        
+        progress = current_time / duration
+        alpha = int(255 * self.smooth_step(progress))
+        self.cross_fade_surface.set_alpha(alpha)
+        self.screen.blit(self.cross_fade_surface, (0, 0))
         return True
 
+    def start_splash_step(self, index):
+        self.splash_step = index
+        self.step_start = time.time()
+        self.last_scale = 0.01
+        self.last_rotation = 0
+
+    def splash_state(self):
+        # Each step draws frames until it reports it is finished, then the next one starts
+        step, *args = self.splash_steps[self.splash_step]
+        if not step(time.time() - self.step_start, *args):
+            if self.splash_step + 1 < len(self.splash_steps):
+                self.start_splash_step(self.splash_step + 1)
+            else:
+                self.state = 'menu'
+
     def menu_state(self):
-        if not self.menu_reveal_complete:
-            return self.reveal_menu()
-            
         mouse_pos = pygame.mouse.get_pos()
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if self.marker_rect.collidepoint(mouse_pos) and not self.transitioning:
-                    self.click_sound.play()  # Play click sound when marker area is clicked
-                    self.transitioning = True
-                    self.click_played = True
 
         if self.transitioning:
             # Only start fading music after click sound has had a chance to play
@@ -302,37 +261,49 @@ class GameLauncher:
         else:
             pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
 
-        pygame.display.flip()
-        return True
-
     def game_state(self):
         # Stop the menu music completely
         if self.music_started:
             self.music.stop()
             self.music_started = False
         
-        # Initialize and run the opening sequence
-        sequence = OpeningSequence()
-        sequence.run()
-        
-        # The game will exit after the sequence ends
-        return False
+        # Hand over to the opening sequence
+        self.manager.replace('intramuros_story')
+
+    def enter(self):
+        self.start_splash_step(0)
+
+    def handle_event(self, event):
+        if self.state == 'splash':
+            # Space skips the logo being shown
+            step = self.splash_steps[self.splash_step][0]
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and step == self.display_logo:
+                self.start_splash_step(self.splash_step + 1)
+        elif self.state == 'menu' and self.menu_reveal_complete:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.marker_rect.collidepoint(pygame.mouse.get_pos()) and not self.transitioning:
+                    self.click_sound.play()  # Play click sound when marker area is clicked
+                    self.transitioning = True
+                    self.click_played = True
+
+    def draw(self, screen):
+        if self.state == 'splash':
+            self.splash_state()
+        elif self.state == 'menu':
+            self.menu_state()
+        elif self.state == 'game':
+            self.game_state()
 
     def run(self):
-        running = True
-        while running:
-            self.clock.tick(144)
-            
-            if self.state == 'splash':
-                running = self.splash_sequence()
-            elif self.state == 'menu':
-                running = self.menu_state()
-            elif self.state == 'game':
-                running = self.game_state()
-        
-        pygame.quit()
+        SceneManager(self.runtime).run(self)
+        self.runtime.shutdown()
         sys.exit()
 
-if __name__ == "__main__":  
+register('launcher', GameLauncher)
+
+def main():
     game = GameLauncher()
-    game.run()
\ No newline at end of file
+    game.run()
+
+if __name__ == "__main__":
+    profiling.run('launcher', main)
@@ -5,6 +5,10 @@ from pathlib import Path
 import time
 import math
 import pygame.mixer
+from scene_manager import BaseScene, SceneManager, register
+from runtime import get_runtime
+from asset_manager import assets
+import profiling
 
 class SceneState(Enum):
     FADE_IN = auto()
@@ -16,8 +20,7 @@ class Scene:
                  sound_path: str = None, is_first_scene: bool = False, 
                  is_final_scene: bool = False):
         # Visual elements
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(self.image, (1280, 720))
+        self.image = assets.scaled_image(image_path, (1280, 720))
         self.text = text
         self.font = font
         
@@ -55,7 +58,7 @@ class Scene:
         self.sound = None
         if sound_path:
             try:
-                self.sound = pygame.mixer.Sound(sound_path)
+                self.sound = assets.sound(sound_path)
                 self.sound.set_volume(0.0)
             except Exception as e:
                 print(f"Warning: Could not load sound {sound_path}: {e}")
@@ -66,7 +69,7 @@ class Scene:
         #Typewriter properties/sound
         self.typewriter_sound = None
         try:
-            self.typewriter_sound = pygame.mixer.Sound("audio/typewriter.wav")
+            self.typewriter_sound = assets.sound("audio/typewriter.wav")
             self.typewriter_sound.set_volume(0.5)  # Lower volume for typing sound
         except Exception as e:
             print(f"Warning: Could not load typewriter sound: {e}")
@@ -221,22 +224,19 @@ class Scene:
         if self.typewriter_sound and self.typewriter_sound.get_num_channels() > 0:
             self.typewriter_sound.stop()
 
-class OpeningSequence:
-   def __init__(self):
-       pygame.init()
-       pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-       
-       self.screen = pygame.display.set_mode((1280, 720))
-       pygame.display.set_caption("ISLA")
+class OpeningSequence(BaseScene):
+   def __init__(self, runtime=None):
+       self.runtime = runtime or get_runtime()
+       self.screen = self.runtime.screen
+       self.runtime.set_caption("ISLA")
        
        font_path = Path("font/pixel_font.ttf")
-       self.font = pygame.font.Font(font_path, 14)
+       self.font = assets.font(font_path, 14)
        pygame.display.set_icon(pygame.image.load("assets/first_cebu.png"))
        
        self.scenes = self._initialize_scenes()
        
        self.current_scene = 0
-       self.clock = pygame.time.Clock()
        self.transitioning = False
        self.last_space_time = 0
        self.space_cooldown = 15
@@ -266,78 +266,61 @@ class OpeningSequence:
                 is_final_scene=True)
         ]
 
-   def run(self):
-       running = True
+   def enter(self):
        self.scenes[0].start_sound()
-       
-       while running:
-           current_time = pygame.time.get_ticks()
-           
-           for event in pygame.event.get():
-               if event.type == pygame.QUIT:
-                   self.fade_out()
-                   running = False
-               elif event.type == pygame.KEYDOWN:
-                   if event.key == pygame.K_SPACE:
-                       if current_time - self.last_space_time >= self.space_cooldown:
-                           current_scene = self.scenes[self.current_scene]
-                           current_scene.space_pressed = True
-                           current_scene._fade_out_typewriter()  # Fade out typewriter sound immediately
-                           if not self.transitioning:
-                               if current_scene.is_final_scene and not current_scene.final_text_shown:
-                                   current_scene.state = SceneState.FADE_OUT
-                               elif not current_scene.is_final_scene and self.current_scene < len(self.scenes) - 1:
-                                   self.transitioning = True
-                                   current_scene.state = SceneState.FADE_OUT
-                           self.last_space_time = current_time
-                   elif event.key == pygame.K_ESCAPE:
-                       self.fade_out()
-                       running = False
-           
-           self.screen.fill((0, 0, 0))
-           
-           current_scene = self.scenes[self.current_scene]
-           current_scene.update()
-           
-           if self.transitioning and current_scene.alpha <= 0:
-               if not self.scenes[self.current_scene].is_final_scene:
-                   current_scene.stop_sound()
-               self.current_scene += 1
-               if not self.scenes[self.current_scene - 1].is_final_scene:
-                   self.scenes[self.current_scene].start_sound()
-               self.transitioning = False
-               
-           current_scene.render(self.screen)
-           
-           pygame.display.flip()
-           self.clock.tick(60)
-      
+
+   def exit(self):
        for scene in self.scenes:
           if scene.sound and not scene.is_final_scene:
               scene.stop_sound()
           if scene.typewriter_sound: 
               scene.typewriter_sound.stop()
-      
-       pygame.quit()
-       sys.exit()
 
-   def fade_out(self):
-       alpha = 0
-       fade_surface = pygame.Surface((1280, 720))
-       fade_surface.fill((0, 0, 0))
+   def handle_event(self, event):
+       if event.type != pygame.KEYDOWN:
+           return
+       current_time = pygame.time.get_ticks()
+       if event.key == pygame.K_SPACE:
+           if current_time - self.last_space_time >= self.space_cooldown:
+               current_scene = self.scenes[self.current_scene]
+               current_scene.space_pressed = True
+               current_scene._fade_out_typewriter()  # Fade out typewriter sound immediately
+               if not self.transitioning:
+                   if current_scene.is_final_scene and not current_scene.final_text_shown:
+                       current_scene.state = SceneState.FADE_OUT
+                   elif not current_scene.is_final_scene and self.current_scene < len(self.scenes) - 1:
+                       self.transitioning = True
+                       current_scene.state = SceneState.FADE_OUT
+               self.last_space_time = current_time
+       elif event.key == pygame.K_ESCAPE:
+           self.manager.fade_out(self.manager.quit)
+
+   def update(self, dt):
+       current_scene = self.scenes[self.current_scene]
+       current_scene.update()
        
-       while alpha < 255:
-           self.screen.fill((0, 0, 0))
-           self.scenes[self.current_scene].render(self.screen)
-           fade_surface.set_alpha(alpha)
-           self.screen.blit(fade_surface, (0, 0))
-           pygame.display.flip()
-           alpha += 5
-           self.clock.tick(60)
+       if self.transitioning and current_scene.alpha <= 0:
+           if not self.scenes[self.current_scene].is_final_scene:
+               current_scene.stop_sound()
+           self.current_scene += 1
+           if not self.scenes[self.current_scene - 1].is_final_scene:
+               self.scenes[self.current_scene].start_sound()
+           self.transitioning = False
+
+   def draw(self, screen):
+       self.screen.fill((0, 0, 0))
+       self.scenes[self.current_scene].render(self.screen)
+
+   def run(self):
+       SceneManager(self.runtime).run(self)
+       self.runtime.shutdown()
+       sys.exit()
+
+register('cebu_story', OpeningSequence)
 
 def main():
   sequence = OpeningSequence()
   sequence.run()
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  profiling.run('cebu_story', main)
\ No newline at end of file
@@ -0,0 +1,290 @@
+import io
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+
+import pygame
+
+ASSET_BUDGET_ENV = 'ISLA_ASSET_BUDGET_MB'  # Overrides the cache budget, in megabytes
+ASSET_BUDGET = 256 * 1024 * 1024  # Bytes kept resident before unreferenced assets are evicted
+SHARED = 'shared'  # Owner charged for loads made outside any scene
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def decode_sound(path):
+    return pygame.mixer.Sound(path).get_raw()
+
+def decode_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# What each kind needs from its file, made without touching the display, so the prefetch thread can do it
+DECODERS = {
+    'image': pygame.image.load,
+    'scaled_image': pygame.image.load,
+    'spritesheet': pygame.image.load,
+    'scale2x_spritesheet': pygame.image.load,
+    'sound': decode_sound,
+    'font': read_file,
+    'json': decode_json,
+}
+
+def load_image(manager, path):
+    image = manager.source('image', path)
+    if image.get_flags() & pygame.SRCALPHA and pygame.display.get_surface() is not None:
+        image = image.convert_alpha()
+    # Opaque images keep their file format; SDL copies small ones faster from it than from the window's own
+    return image
+
+def load_source(manager, path):
+    """The full-size image a scaled copy is made from, not cached unless something else holds it"""
+    image = manager.find('image', path)
+    return load_image(manager, path) if image is None else image
+
+def load_scaled_image(manager, path, size):
+    image = load_source(manager, path)
+    if size == image.get_size():
+        return image
+    return pygame.transform.scale(image, size)
+
+def cut_frames(manager, path, num_frames):
+    """Equal frames cut from a horizontal strip"""
+    sheet = load_source(manager, path)
+    frame_width = sheet.get_width() // num_frames
+    frame_height = sheet.get_height()
+    frames = []
+    for i in range(num_frames):
+        surface = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+        surface.blit(sheet, (0, 0), (i * frame_width, 0, frame_width, frame_height))
+        frames.append(surface)
+    return frames
+
+def load_spritesheet(manager, path, num_frames, scale):
+    """Right- and left-facing frames cut from a horizontal strip and scaled"""
+    frames = [pygame.transform.scale(frame, (int(frame.get_width() * scale), int(frame.get_height() * scale)))
+              for frame in cut_frames(manager, path, num_frames)]
+    return frames, [pygame.transform.flip(frame, True, False) for frame in frames]
+
+def load_scale2x_spritesheet(manager, path, num_frames):
+    """Frames doubled with scale2x, which smooths diagonal edges where a plain scale leaves steps"""
+    frames = [pygame.transform.scale2x(frame) for frame in cut_frames(manager, path, num_frames)]
+    return frames, [pygame.transform.flip(frame, True, False) for frame in frames]
+
+def load_sound(manager, path):
+    # Decoded samples; every caller gets its own Sound made from them, so volumes and fades aren't shared
+    return manager.source('sound', path)
+
+def load_font(manager, path, size):
+    return pygame.font.Font(io.BytesIO(manager.source('font', path)), size)
+
+def load_json(manager, path):
+    return manager.source('json', path)
+
+LOADERS = {
+    'image': load_image,
+    'scaled_image': load_scaled_image,
+    'spritesheet': load_spritesheet,
+    'scale2x_spritesheet': load_scale2x_spritesheet,
+    'sound': load_sound,
+    'font': load_font,
+    'json': load_json,
+}
+
+def asset_key(kind, path, *args):
+    """Entries are keyed by loader, absolute path and parameters, however the path was spelled"""
+    return (kind, os.path.abspath(path)) + tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+
+def asset_bytes(kind, asset, path):
+    """Roughly what a loaded asset keeps in memory"""
+    if kind in ('image', 'scaled_image'):
+        return asset.get_pitch() * asset.get_height()
+    if kind in ('spritesheet', 'scale2x_spritesheet'):
+        return sum(frame.get_pitch() * frame.get_height() for frames in asset for frame in frames)
+    if kind == 'sound':
+        return len(asset)
+    return os.path.getsize(path)
+
+class AssetManager:
+    """One cache for every scene's images, sounds, fonts and data.
+
+    acquire() loads an asset once per loader, path and parameters, and
+    counts a reference for the owner, normally the running scene's name.
+    release(owner) drops the owner's references, which the SceneManager
+    does when a scene leaves the stack. Unreferenced assets stay cached
+    until the total goes over the byte budget, then the least recently
+    used go first; referenced ones are never evicted. report() gives the
+    resident bytes per owner.
+    """
+    def __init__(self, budget=None):
+        if budget is None:
+            budget = int(float(os.environ.get(ASSET_BUDGET_ENV) or 0) * 1024 * 1024) or ASSET_BUDGET
+        self.budget = budget
+        self.lock = threading.RLock()  # The prefetch thread loads through the same cache
+        self.entries = OrderedDict()  # Key -> [asset, bytes, references], least recently used first
+        self.owners = {}  # Owner -> Counter of key -> references
+        self.bytes = 0
+        self.owner = SHARED  # Charged when acquire() isn't given an owner
+        self.cleared = []  # Called after clear(), by modules keeping assets of their own
+        self.decoded = {}  # (decoder, absolute path) -> file decoded ahead of its loads, until drop_decoded()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decode(self, kind, path):
+        """An asset's file read and decoded, without caching it or touching the display; safe on any thread"""
+        return DECODERS[kind](path)
+
+    def hold_decoded(self, kind, path, data):
+        """Keep decode()'s result for loads of that file, which then only have to convert it"""
+        with self.lock:
+            self.decoded[(DECODERS[kind], os.path.abspath(path))] = data
+
+    def drop_decoded(self):
+        with self.lock:
+            self.decoded.clear()
+
+    def source(self, kind, path):
+        """The decoded file for a loader, held from decode() if it was, otherwise read now"""
+        decoder = DECODERS[kind]
+        with self.lock:
+            data = self.decoded.get((decoder, os.path.abspath(path)))
+        return decoder(path) if data is None else data
+
+    def find(self, kind, path, *args):
+        """The cached asset, or None if it isn't loaded"""
+        with self.lock:
+            entry = self.entries.get(asset_key(kind, path, *args))
+            return None if entry is None else entry[0]
+
+    def get(self, kind, path, *args):
+        """The cached asset, loading it if needed, without taking a reference"""
+        return self.fetch(kind, path, args, None)
+
+    def acquire(self, kind, path, *args, owner=None):
+        """The asset, with a reference counted for owner until it is released"""
+        return self.fetch(kind, path, args, owner or self.owner)
+
+    def fetch(self, kind, path, args, owner):
+        key = asset_key(kind, path, *args)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                if owner is not None:
+                    self.take_reference(owner, key, entry)
+                return entry[0]
+
+        # Load outside the lock so the main thread never waits on the prefetch thread's disk reads
+        asset = LOADERS[kind](self, path, *args)
+        size = asset_bytes(kind, asset, path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [asset, size, 0]
+                self.bytes += size
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)  # Another thread loaded it meanwhile
+            if owner is not None:
+                self.take_reference(owner, key, entry)  # Before evicting, so it can't go straight back out
+            self.evict()
+            return entry[0]
+
+    def holds(self, owner, kind, path, *args):
+        """Whether owner still has a reference to the asset"""
+        with self.lock:
+            return self.owners.get(owner, Counter())[asset_key(kind, path, *args)] > 0
+
+    def take_reference(self, owner, key, entry):
+        entry[2] += 1
+        self.owners.setdefault(owner, Counter())[key] += 1
+
+    def release(self, owner, kind=None, path=None, *args):
+        """Drop one of owner's references to an asset, or every reference owner holds"""
+        with self.lock:
+            held = self.owners.get(owner)
+            if not held:
+                return
+            if kind is None:
+                released = dict(held)
+            else:
+                released = {asset_key(kind, path, *args): 1} if held[asset_key(kind, path, *args)] else {}
+            for key, count in released.items():
+                held[key] -= count
+                if held[key] <= 0:
+                    del held[key]
+                entry = self.entries.get(key)
+                if entry is not None:
+                    entry[2] -= count
+            if not held:
+                del self.owners[owner]
+            self.evict()
+
+    def evict(self):
+        """Drop unreferenced assets, least recently used first, until the cache fits its budget"""
+        with self.lock:
+            for key in list(self.entries):
+                if self.bytes <= self.budget:
+                    break
+                asset, size, references = self.entries[key]
+                if not references:
+                    del self.entries[key]
+                    self.bytes -= size
+                    self.evictions += 1
+
+    def resident(self, owner):
+        """Bytes of the assets owner holds references to"""
+        with self.lock:
+            return sum(self.entries[key][1] for key in self.owners.get(owner, ()) if key in self.entries)
+
+    def report(self):
+        """Resident bytes per owner (shared assets count for each holder), unreferenced cache and total"""
+        with self.lock:
+            report = {owner: self.resident(owner) for owner in self.owners}
+            report['unreferenced'] = sum(size for _, size, references in self.entries.values() if not references)
+            report['total'] = self.bytes
+            return report
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.owners.clear()
+            self.decoded.clear()
+            self.bytes = 0
+        for callback in self.cleared:
+            callback()
+
+    def on_clear(self, callback):
+        """Have callback() forget assets kept outside the cache, which clear() leaves invalid"""
+        self.cleared.append(callback)
+
+    # Typed loaders, each taking a reference for the current owner
+    def image(self, path, owner=None):
+        return self.acquire('image', path, owner=owner)
+
+    def scaled_image(self, path, size, owner=None):
+        return self.acquire('scaled_image', path, tuple(size), owner=owner)
+
+    def spritesheet(self, path, num_frames, scale, owner=None):
+        """Right- and left-facing frame lists"""
+        return self.acquire('spritesheet', path, num_frames, scale, owner=owner)
+
+    def scale2x_spritesheet(self, path, num_frames, owner=None):
+        """Right- and left-facing frame lists at twice their size, edge-smoothed"""
+        return self.acquire('scale2x_spritesheet', path, num_frames, owner=owner)
+
+    def sound(self, path, owner=None):
+        """A Sound of its own, made from the cached samples without decoding the file again"""
+        return pygame.mixer.Sound(buffer=self.acquire('sound', path, owner=owner))
+
+    def font(self, path, size, owner=None):
+        return self.acquire('font', path, size, owner=owner)
+
+    def json(self, path, owner=None):
+        return self.acquire('json', path, owner=owner)
+
+assets = AssetManager()
@@ -0,0 +1,91 @@
+"""Import-time budget check for scene modules.
+
+Each module is imported in a fresh process under the SDL dummy drivers,
+after pygame and the shared modules it builds on, so only its own import is
+timed. A module fails if its median import time goes over budget or if
+importing it opens the display or the mixer; assets belong in its cached
+load function, not at module scope. Run from the repository root:
+
+    python -m benchmarks.import_time            # exits 1 if any module fails
+    python -m benchmarks.import_time map --runs 9
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGETS = {'map': 25}  # Module -> milliseconds its own import may take
+PRELOADED = ('pygame', 'pygame.gfxdraw', 'json', 'frame_profiler', 'asset_manager', 'runtime', 'scene_manager',
+             'profiling')
+RUNS = 5
+
+def time_import(module):
+    """Import module in this process and report how long it took and what it initialised"""
+    import importlib
+    import time
+    for name in PRELOADED:
+        importlib.import_module(name)
+    import pygame
+
+    start = time.perf_counter()
+    importlib.import_module(module)
+    milliseconds = (time.perf_counter() - start) * 1000
+    return {'ms': milliseconds,
+            'display': bool(pygame.display.get_init()),
+            'mixer': bool(pygame.mixer.get_init())}
+
+def measure(module, runs):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    samples = []
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, '-m', 'benchmarks.import_time', '--child', module],
+                                 cwd=ROOT, env=env, capture_output=True, text=True)
+        if process.returncode:
+            lines = process.stderr.strip().splitlines()
+            return {'error': lines[-1] if lines else f"exited with {process.returncode}"}
+        samples.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    return {'ms': statistics.median(sample['ms'] for sample in samples),
+            'display': any(sample['display'] for sample in samples),
+            'mixer': any(sample['mixer'] for sample in samples)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for scene modules")
+    parser.add_argument('modules', nargs='*', help=f"modules to check, all by default: {', '.join(BUDGETS)}")
+    parser.add_argument('--runs', type=int, default=RUNS, help="fresh processes per module, the median counts")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = [module for module in args.modules if module not in BUDGETS]
+    if unknown:
+        parser.error(f"no budget for: {', '.join(unknown)}")
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        print(json.dumps(time_import(args.child)))
+        return
+
+    failed = False
+    for module in args.modules or list(BUDGETS):
+        result = measure(module, args.runs)
+        budget = BUDGETS[module]
+        if 'error' in result:
+            problems = [result['error']]
+        else:
+            problems = []
+            if result['ms'] > budget:
+                problems.append(f"over its {budget} ms budget")
+            if result['display']:
+                problems.append("opened the display")
+            if result['mixer']:
+                problems.append("opened the mixer")
+        failed = failed or bool(problems)
+        took = f"{result['ms']:.1f} ms" if 'ms' in result else '-'
+        print(f"{module:<18} {took:>10} / {budget} ms  {'FAIL: ' + ', '.join(problems) if problems else 'ok'}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark for ghost line of sight.
+
+Compares the old 8 px sampling against the occupancy grid DDA as the block
+count grows. Run from the repository root:
+
+    python -m benchmarks.line_of_sight
+"""
+import random
+import time
+
+import pygame
+
+from sprites import OccupancyGrid, sampled_line_of_sight
+from settings import WIDTH, HEIGHT
+
+AREA = pygame.Rect(0, 0, int(WIDTH * 1.5), int(HEIGHT * 1.5))
+BLOCK_COUNTS = (40, 400, 4000)
+RAYS = 2000
+RAY_LENGTH = 200  # Matches Ghost.max_chase_distance
+
+class Collider:
+    def __init__(self, rect):
+        self.rect = rect
+
+def make_colliders(count, rng):
+    return [Collider(pygame.Rect(rng.randint(AREA.left, AREA.right), rng.randint(AREA.top, AREA.bottom),
+                                 rng.randint(32, 80), rng.randint(32, 80)))
+            for _ in range(count)]
+
+def make_rays(count, rng):
+    rays = []
+    for _ in range(count):
+        start = pygame.Vector2(rng.uniform(AREA.left, AREA.right), rng.uniform(AREA.top, AREA.bottom))
+        end = start + pygame.Vector2(RAY_LENGTH, 0).rotate(rng.uniform(0, 360))
+        rays.append((start, end))
+    return rays
+
+def time_rays(check, rays):
+    start = time.perf_counter()
+    for ray_start, ray_end in rays:
+        check(ray_start, ray_end)
+    return (time.perf_counter() - start) / len(rays) * 1e6  # Microseconds per ray
+
+def main():
+    rng = random.Random(0)
+    rays = make_rays(RAYS, rng)
+    print(f"{'blocks':>8} {'sampled us/ray':>16} {'dda us/ray':>12} {'grid build ms':>14}")
+    for count in BLOCK_COUNTS:
+        colliders = make_colliders(count, rng)
+
+        build_start = time.perf_counter()
+        grid = OccupancyGrid(colliders)
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        sampled = time_rays(lambda a, b: sampled_line_of_sight(colliders, a, b), rays)
+        dda = time_rays(grid.line_of_sight, rays)
+        print(f"{count:>8} {sampled:>16.1f} {dda:>12.1f} {build_ms:>14.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,402 @@
+"""Headless frame-rate benchmark for every scene.
+
+Each scene runs in its own process under the SDL dummy video driver with
+silent audio, is driven by scripted input for a fixed number of frames and
+reports frames per second, frame time percentiles, peak RSS and the
+megabytes of assets each scene holds as JSON.
+Clocks don't sleep and hand back the nominal frame time, and the random
+generators are seeded, so every run simulates the same frames and numbers
+from different commits can be compared. Run from the repository root:
+
+    python -m benchmarks.scenes                          # every scene, JSON to stdout
+    python -m benchmarks.scenes map intramuros --frames 1200 --output after.json
+    python -m benchmarks.scenes --compare before.json    # print the change against an earlier run
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRIVIA_DIR = os.path.join(ROOT, 'palawan_game fixed', 'palawan_game')
+DAVAO_DIR = os.path.join(ROOT, 'PLATFORM GAME', 'PLATFORM GAME')
+
+FRAMES = 600
+WARMUP = 60  # Frames left out of the statistics while caches fill
+SEED = 0
+SCENE_TIMEOUT = 300  # Seconds before a scene's process is given up on
+
+class BenchmarkDone(BaseException):
+    """Raised from the display flip once enough frames were drawn, past any `except Exception` in a scene"""
+
+class SilentSound:
+    """Stands in for pygame.mixer.Sound so no audio file is decoded or played"""
+    def __init__(self, *args, **kwargs):
+        self.volume = 1.0
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def fadeout(self, milliseconds):
+        pass
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def get_volume(self):
+        return self.volume
+
+    def get_num_channels(self):
+        return 0
+
+    def get_length(self):
+        return 0.0
+
+    def get_raw(self):
+        return b''
+
+class BenchmarkClock:
+    """pygame.time.Clock that never sleeps and reports the nominal frame time, so dt-driven scenes advance identically"""
+    def __init__(self, clock_type):
+        self.clock = clock_type()
+
+    def tick(self, framerate=0):
+        self.clock.tick()
+        return 1000 / (framerate or 60)
+
+    tick_busy_loop = tick
+
+    def __getattr__(self, name):
+        return getattr(self.clock, name)
+
+class SceneDriver:
+    """Counts and times frames at the display flip and feeds the scene its scripted input"""
+    def __init__(self, frames, warmup):
+        import pygame
+        from frame_profiler import FrameProfiler
+        from recording import KeyState
+
+        self.pygame = pygame
+        self.key_state = KeyState
+        self.frames = frames
+        self.warmup = warmup
+        self.frame = 0
+        self.script = None  # Called with the frame number after every flip
+        self.held = set()
+        self.mouse_pos = (0, 0)
+        self.started = time.perf_counter()
+        self.first_frame = None
+        self.profiler = FrameProfiler('benchmark', window=frames)
+        self.install()
+
+    def install(self):
+        pygame = self.pygame
+        flip = pygame.display.flip
+        clock_type = pygame.time.Clock
+
+        def counted_flip():
+            flip()
+            self.end_frame()
+
+        pygame.display.flip = counted_flip
+        pygame.display.update = lambda *rects: counted_flip()
+        pygame.time.Clock = lambda: BenchmarkClock(clock_type)
+        pygame.key.get_pressed = lambda: self.key_state(self.held)
+        pygame.mouse.get_pos = lambda: self.mouse_pos
+        pygame.mouse.get_pressed = lambda num_buttons=3: (False,) * num_buttons
+        pygame.mixer.Sound = SilentSound
+        pygame.mixer.music.load = lambda *args, **kwargs: None
+        pygame.mixer.music.play = lambda *args, **kwargs: None
+
+    def end_frame(self):
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter()
+        self.profiler.end_frame()
+        self.frame += 1
+        if self.frame == self.warmup:
+            self.profiler.window.clear()
+        if self.frame >= self.warmup + self.frames:
+            raise BenchmarkDone
+        if self.script:
+            self.script(self.frame)
+
+    # Scripted input
+    def hold(self, *keys):
+        self.held = set(keys)
+
+    def post(self, event_type, **attributes):
+        self.pygame.event.post(self.pygame.event.Event(event_type, attributes))
+
+    def press(self, key, unicode=''):
+        self.post(self.pygame.KEYDOWN, key=key, mod=0, unicode=unicode, scancode=0)
+        self.post(self.pygame.KEYUP, key=key, mod=0, unicode=unicode, scancode=0)
+
+    def move_mouse(self, pos, buttons=(0, 0, 0)):
+        rel = (pos[0] - self.mouse_pos[0], pos[1] - self.mouse_pos[1])
+        self.mouse_pos = pos
+        self.post(self.pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=buttons)
+
+    def click(self, pos, button=1):
+        self.mouse_pos = pos
+        self.post(self.pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+        self.post(self.pygame.MOUSEBUTTONUP, pos=pos, button=button)
+
+    def result(self, ended_early):
+        stats = self.profiler.summary() or {'fps': 0, 'p50': 0, 'p95': 0, 'p99': 0}
+        times = [frame_time for frame_time, _ in self.profiler.window]
+        return {'frames': len(times),
+                'ended_early': ended_early,
+                'startup_s': round(self.first_frame - self.started, 3) if self.first_frame else None,
+                'fps': round(stats['fps'], 1),
+                'p50_ms': round(stats['p50'], 3),
+                'p95_ms': round(stats['p95'], 3),
+                'p99_ms': round(stats['p99'], 3),
+                'max_ms': round(max(times) * 1000, 3) if times else 0,
+                'peak_rss_mb': peak_rss_mb(),
+                'asset_mb': asset_mb()}
+
+def asset_mb():
+    """Resident asset megabytes per owning scene, as the shared asset manager counts them"""
+    from asset_manager import assets
+    return {owner: round(size / 2 ** 20, 1) for owner, size in assets.report().items()}
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 2 ** 20, 1)
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10, 1)  # Bytes on macOS, KiB elsewhere
+
+def advance_story(driver, sequence, every=150):
+    """Press space on a timer to move through a narrative, stopping before its last scene hands over to a game"""
+    def script(frame):
+        if frame % every == 0 and sequence.current_scene < len(sequence.scenes) - 1:
+            driver.press(driver.pygame.K_SPACE)
+    driver.script = script
+
+# Scenes: each builds its scene, sets the driver's script and runs it
+def run_launcher(driver):
+    from importlib import import_module
+    launcher = import_module('Game Launcher')
+    launcher.GameLauncher().run()  # The splash plays without input
+
+def run_map(driver):
+    import map
+    keys = driver.pygame
+
+    def script(frame):
+        # Drag the map around in a slow circle, zoom in and out and toggle the overlays
+        phase = frame % 240
+        if phase == 0:
+            driver.post(keys.MOUSEBUTTONDOWN, pos=(60, 660), button=1)
+            driver.mouse_pos = (60, 660)
+        elif phase < 120:
+            driver.move_mouse((60 + phase * 3, 660 - phase * 2), buttons=(1, 0, 0))
+        elif phase == 120:
+            driver.post(keys.MOUSEBUTTONUP, pos=driver.mouse_pos, button=1)
+        elif phase % 30 == 0:
+            driver.post(keys.MOUSEBUTTONDOWN, pos=(640, 360), button=4 if frame % 480 < 240 else 5)
+        if frame % 200 == 0:
+            driver.press(keys.K_SPACE)
+    driver.script = script
+    map.main()
+
+def run_banaue_game(driver):
+    import BANAUE
+    game = BANAUE.Game()
+
+    def script(frame):
+        if frame % 30 == 0:
+            driver.click(game.cards[frame // 30 % len(game.cards)].rect.center)
+    driver.script = script
+    game.run()
+
+def run_banaue_story(driver):
+    import BANAUE
+    sequence = BANAUE.OpeningSequence()
+    advance_story(driver, sequence)
+    sequence.run()
+
+def run_intramuros(driver):
+    import intramuros
+    game = intramuros.Game(seed=SEED)
+    keys = driver.pygame
+    moves = [(keys.K_d,), (keys.K_d, keys.K_s), (keys.K_s,), (keys.K_a, keys.K_LSHIFT), (keys.K_w,), (keys.K_w, keys.K_d)]
+
+    def script(frame):
+        if frame % 45 == 0:
+            driver.hold(*moves[frame // 45 % len(moves)])
+    driver.script = script
+    game.run()
+
+def run_intramuros_story(driver):
+    import storyscreen_intramuros
+    sequence = storyscreen_intramuros.OpeningSequence()
+    advance_story(driver, sequence)
+    sequence.run()
+
+def run_cebu_story(driver):
+    import NarrativeScreen_Cebu
+    sequence = NarrativeScreen_Cebu.OpeningSequence()
+    advance_story(driver, sequence)
+    sequence.run()
+
+def run_trivia(driver):
+    sys.path.insert(0, TRIVIA_DIR)
+    import trivia_game
+    game = trivia_game.TriviaGame()
+    game.load_questions('questions.json')
+    keys = driver.pygame
+
+    def script(frame):
+        # Click around the answer area and type guesses
+        if frame % 40 == 0:
+            driver.click((320 + frame // 40 % 3 * 320, 420))
+        elif frame % 40 == 20:
+            driver.press(keys.K_a, 'a')
+            driver.press(keys.K_RETURN, '\r')
+    driver.script = script
+    game.run()
+
+def run_davao(driver):
+    os.chdir(DAVAO_DIR)  # The climber loads its assets relative to its own folder
+    keys = driver.pygame
+
+    def script(frame):
+        if frame % 40 == 0:
+            driver.hold(keys.K_a if frame // 40 % 2 else keys.K_d)
+    driver.script = script
+    runpy.run_path(os.path.join(DAVAO_DIR, 'DAVAO_GAME'), run_name='__main__')
+
+SCENES = {
+    'launcher': run_launcher,
+    'map': run_map,
+    'banaue_game': run_banaue_game,
+    'banaue_story': run_banaue_story,
+    'intramuros': run_intramuros,
+    'intramuros_story': run_intramuros_story,
+    'cebu_story': run_cebu_story,
+    'trivia': run_trivia,
+    'davao': run_davao,
+}
+
+def run_scene(name, frames, warmup, result_path):
+    """Benchmark one scene in this process and write its result as JSON"""
+    random.seed(SEED)
+    driver = SceneDriver(frames, warmup)
+    import sprites
+    sprites.rng.seed(SEED)
+
+    ended_early = True
+    error = None
+    try:
+        SCENES[name](driver)
+    except BenchmarkDone:
+        ended_early = False
+    except SystemExit:
+        pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    result = driver.result(ended_early)
+    if error:
+        result['error'] = error
+    with open(result_path, 'w') as f:
+        json.dump(result, f)
+
+def benchmark(names, frames, warmup):
+    """Run each scene in a fresh process so display state and peak RSS don't leak between them"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    env.pop('ISLA_FRAME_CSV', None)
+    results = {}
+    for name in names:
+        handle, result_path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        command = [sys.executable, '-m', 'benchmarks.scenes', '--child', name, '--result', result_path,
+                   '--frames', str(frames), '--warmup', str(warmup)]
+        try:
+            process = subprocess.run(command, cwd=ROOT, env=env, timeout=SCENE_TIMEOUT,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            with open(result_path) as f:
+                results[name] = json.load(f)
+        except subprocess.TimeoutExpired:
+            results[name] = {'error': f"timed out after {SCENE_TIMEOUT} s"}
+        except (OSError, ValueError):
+            lines = process.stderr.strip().splitlines()
+            results[name] = {'error': lines[-1] if lines else "scene process exited without a result"}
+        finally:
+            os.remove(result_path)
+        print(f"{name}: {results[name].get('fps', '-')} fps", file=sys.stderr)
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(baseline, report):
+    """Print each scene's fps and p95 against an earlier report"""
+    print(f"{'scene':<18} {'fps':>19} {'change':>8} {'p95 ms':>19}", file=sys.stderr)
+    for name, result in report['scenes'].items():
+        before = baseline['scenes'].get(name)
+        if not before or 'fps' not in before or 'fps' not in result:
+            print(f"{name:<18} {'-':>19}", file=sys.stderr)
+            continue
+        change = (result['fps'] / before['fps'] - 1) * 100 if before['fps'] else 0
+        print(f"{name:<18} {before['fps']:>8.1f} -> {result['fps']:<7.1f} {change:>+7.1f}% "
+              f"{before['p95_ms']:>8.2f} -> {result['p95_ms']:<7.2f}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-rate benchmark for every scene")
+    parser.add_argument('scenes', nargs='*', help=f"scenes to run, all by default: {', '.join(SCENES)}")
+    parser.add_argument('--frames', type=int, default=FRAMES, help="measured frames per scene")
+    parser.add_argument('--warmup', type=int, default=WARMUP, help="frames run before measuring")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', metavar='REPORT', help="earlier JSON report to compare against")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = [name for name in args.scenes if name not in SCENES]
+    if unknown:
+        parser.error(f"unknown scenes: {', '.join(unknown)}")
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        run_scene(args.child, args.frames, args.warmup, args.result)
+        return
+
+    report = {'commit': git_commit(),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'frames': args.frames,
+              'warmup': args.warmup,
+              'scenes': benchmark(args.scenes or list(SCENES), args.frames, args.warmup)}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == '__main__':
+    main()
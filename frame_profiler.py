@@ -0,0 +1,170 @@
+import atexit
+import csv
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+CSV_DIR_ENV = 'ISLA_FRAME_CSV'  # Set to a directory to dump every frame's timings there on exit
+
+class FrameProfiler:
+    """Per-frame timings for a game loop, split into named phases.
+
+    Time is charged to a phase with lap(name), which closes the phase that
+    ran since the previous lap, or with the phase(name) context manager.
+    tick() and flip() wrap clock.tick and display.flip so most loops only
+    swap those two calls:
+
+        profiler = FrameProfiler('map')
+        while running:
+            profiler.tick(clock, 60)         # 'wait'
+            ...handle events...
+            profiler.lap('events')
+            ...update...
+            profiler.lap('update')
+            ...draw...
+            profiler.flip(screen)            # 'draw', the overlay, then 'flip'
+
+    F3 toggles an overlay with the fps, frame time percentiles and the phase
+    breakdown. With ISLA_FRAME_CSV set, per-frame samples are written to
+    <dir>/<name>-<timestamp>.csv when the program exits.
+    """
+    overlay_visible = False  # Shared, so the overlay stays on across scenes
+    toggle_key = pygame.K_F3
+
+    def __init__(self, name, window=300, max_samples=36000, csv_dir=None):
+        self.name = name
+        self.window = deque(maxlen=window)  # Recent (frame seconds, {phase: seconds}) for the overlay
+        self.samples = deque(maxlen=max_samples)  # Frames for the CSV dump, about ten minutes at 60 fps
+        self.phase_names = []  # In the order they were first seen
+        self.started = time.perf_counter()
+        self.frame_start = self.lap_start = self.started
+        self.phases = {}
+        self.frame_count = 0
+        self.toggle_held = False
+
+        # Overlay text is recomputed a few times a second, not every frame
+        self.font = None
+        self.overlay = None
+        self.overlay_updated = 0
+
+        self.csv_dir = csv_dir or os.environ.get(CSV_DIR_ENV)
+        if self.csv_dir:
+            atexit.register(self.save_csv)
+
+    def lap(self, name):
+        """Charge the time since the last lap to phase name"""
+        now = time.perf_counter()
+        if name not in self.phases:
+            self.phases[name] = 0
+            if name not in self.phase_names:
+                self.phase_names.append(name)
+        self.phases[name] += now - self.lap_start
+        self.lap_start = now
+
+    @contextmanager
+    def phase(self, name):
+        """Time the block as phase name; anything since the last lap goes to 'other'"""
+        self.lap('other')
+        try:
+            yield
+        finally:
+            self.lap(name)
+
+    def tick(self, clock, fps=0):
+        """clock.tick(fps), timed as 'wait'"""
+        milliseconds = clock.tick(fps)
+        self.lap('wait')
+        return milliseconds
+
+    def flip(self, screen=None):
+        """Finish the frame: the rest of it is 'draw', then the overlay and the display flip"""
+        self.lap('draw')
+        if screen is not None:
+            self.draw_overlay(screen)
+        pygame.display.flip()
+        self.end_frame('flip')
+
+    def end_frame(self, name=None):
+        """Close the current frame, charging the last stretch to name if given"""
+        if name:
+            self.lap(name)
+        now = time.perf_counter()
+        frame_time = now - self.frame_start
+        self.window.append((frame_time, self.phases))
+        self.samples.append((now - self.started, frame_time, self.phases))
+        self.frame_start = self.lap_start = now
+        self.phases = {}
+        self.frame_count += 1
+
+        # F3 toggles the overlay, watched through the key state so no loop has to forward events
+        held = pygame.display.get_init() and pygame.key.get_pressed()[self.toggle_key]
+        if held and not self.toggle_held:
+            FrameProfiler.overlay_visible = not FrameProfiler.overlay_visible
+        self.toggle_held = held
+
+    def percentile(self, sorted_times, percent):
+        index = min(len(sorted_times) - 1, int(len(sorted_times) * percent / 100))
+        return sorted_times[index]
+
+    def summary(self):
+        """Fps, p50/p95/p99 frame times and mean phase times (ms) over the recent window"""
+        if not self.window:
+            return None
+        times = sorted(frame_time for frame_time, _ in self.window)
+        total = sum(times)
+        phases = {name: sum(phases.get(name, 0) for _, phases in self.window) / len(self.window) * 1000
+                  for name in self.phase_names}
+        return {'fps': len(times) / total if total else 0,
+                'p50': self.percentile(times, 50) * 1000,
+                'p95': self.percentile(times, 95) * 1000,
+                'p99': self.percentile(times, 99) * 1000,
+                'phases': phases}
+
+    def draw_overlay(self, screen):
+        if not FrameProfiler.overlay_visible:
+            return
+        now = time.perf_counter()
+        if now - self.overlay_updated > 0.25:
+            stats = self.summary()
+            if stats:
+                self.overlay_updated = now
+                if self.font is None:
+                    if not pygame.font.get_init():
+                        pygame.font.init()
+                    self.font = pygame.font.Font(None, 20)
+                lines = [f"{self.name}  {stats['fps']:.0f} fps",
+                         f"frame p50 {stats['p50']:.1f}  p95 {stats['p95']:.1f}  p99 {stats['p99']:.1f} ms"]
+                lines += [f"{name} {milliseconds:.2f} ms" for name, milliseconds in stats['phases'].items()]
+                self.overlay = self.render_panel([self.font.render(line, True, (255, 255, 255)) for line in lines])
+        if self.overlay:
+            screen.blit(self.overlay, (screen.get_width() - self.overlay.get_width() - 8, 8))
+
+    def render_panel(self, lines):
+        """Stack text lines on a dark, semi-transparent panel"""
+        panel = pygame.Surface((max(line.get_width() for line in lines) + 12,
+                                sum(line.get_height() for line in lines) + 8))
+        panel.set_alpha(170)
+        y = 4
+        for line in lines:
+            panel.blit(line, (6, y))
+            y += line.get_height()
+        return panel
+
+    def save_csv(self, path=None):
+        """Write one row per recorded frame: time, frame ms and each phase's ms"""
+        if not self.samples:
+            return None
+        if path is None:
+            os.makedirs(self.csv_dir, exist_ok=True)
+            path = os.path.join(self.csv_dir, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.csv")
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time_s', 'frame_ms'] + [f'{name}_ms' for name in self.phase_names])
+            for elapsed, frame_time, phases in self.samples:
+                writer.writerow([f'{elapsed:.4f}', f'{frame_time * 1000:.3f}'] +
+                                [f'{phases.get(name, 0) * 1000:.3f}' for name in self.phase_names])
+        self.samples.clear()  # Written once, even if save_csv runs again at exit
+        return path
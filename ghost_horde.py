@@ -0,0 +1,315 @@
+import numpy as np
+import pygame
+from settings import TILE_SIZE
+from sprites import SpriteSheet, OccupancyGrid
+
+class GhostHorde:
+    """Batched ghost simulation for large ghost counts.
+
+    Mirrors sprites.Ghost (wandering, pausing, line-of-sight chasing, win zone
+    avoidance and block collisions) but keeps every ghost's state in NumPy
+    arrays and updates them all with vectorised operations each tick.
+    """
+    def __init__(self, positions, player, collisions, win_zone_rect=None, flow_field=None, rng=None, seed=None):
+        self.player = player
+        self.win_zone_rect = win_zone_rect
+        self.flow_field = flow_field
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.can_move = False
+
+        # Behaviour parameters (same defaults as sprites.Ghost)
+        self.speed = 200
+        self.min_chase_distance = 0
+        self.max_chase_distance = 200
+        self.pause_chance = 0.1
+        self.min_pause_duration = 1
+        self.max_pause_duration = 3
+        self.wander_speed_factor = 0.4
+        self.animation_speed = 5
+
+        # Shared animation frames, same sheets as a single Ghost
+        self.idle_frames = SpriteSheet.get_frames('img//npcs//idle.png', 1, scale=1)
+        self.moving_frames = SpriteSheet.get_frames('img//npcs//moving.png', 5, scale=1)
+        self.size = np.array(self.idle_frames[0][0].get_size(), dtype=float)
+        self.half_size = self.size / 2
+        self.half_hitbox = np.array([self.size[0] - 20, self.size[1]], dtype=float) / 2
+
+        # Per-ghost state, one row per ghost
+        count = len(positions)
+        self.pos = np.array(positions, dtype=float).reshape(count, 2)
+        self.previous_pos = self.pos.copy()  # For render interpolation
+        self.alive = np.ones(count, dtype=bool)
+        self.wander_direction = self.rng.integers(0, 2, (count, 2)).astype(float)
+        self.wander_timer = np.zeros(count)
+        self.wander_interval = self.rng.integers(2, 4, count).astype(float)
+        self.is_paused = np.zeros(count, dtype=bool)
+        self.pause_timer = np.zeros(count)
+        self.pause_duration = np.zeros(count)
+        self.moving = np.zeros(count, dtype=bool)
+        self.facing_right = np.ones(count, dtype=bool)
+        self.frame_index = np.zeros(count)
+
+        # Static colliders as (left, top, right, bottom) rows
+        rects = [sprite.rect for sprite in collisions]
+        self.colliders = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=float).reshape(-1, 4)
+        self.index_colliders(getattr(getattr(collisions, 'spatial_hash', None), 'cell_size', TILE_SIZE * 2))
+
+        # Occupancy grid for vectorised line of sight
+        grid = getattr(collisions, 'occupancy', None) or OccupancyGrid(collisions)
+        self.grid_cell_size = grid.cell_size
+        self.grid_origin = np.array([grid.origin_x, grid.origin_y])
+        self.grid_cells = np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(grid.rows, grid.cols).astype(bool)
+
+        self.flow_target = None
+        self.flow_directions = None
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def start_moving(self):
+        self.can_move = True
+
+    def stop_moving(self):
+        self.can_move = False
+
+    def clear(self):
+        self.alive[:] = False
+
+    def store_previous_positions(self):
+        self.previous_pos = self.pos.copy()
+
+    def index_colliders(self, cell_size):
+        """Bucket colliders by the cells their rects overlap, like SpatialHash, in blocks of cells a hitbox fits in
+
+        Row k of self.buckets lists the colliders overlapping the block of
+        bucket_block x bucket_block cells whose top-left cell has key k, padded
+        with the index of a collider that nothing can overlap.
+        """
+        self.bucket_size = cell_size
+        self.bucket_block = block = int(2 * self.half_hitbox.max() // cell_size) + 2
+        first = np.floor_divide(self.colliders[:, :2], cell_size).astype(int)
+        last = np.floor_divide(self.colliders[:, 2:] - 1, cell_size).astype(int)
+        # Blocks may start up to block - 1 cells before the first collider and still reach it
+        self.bucket_origin = (first.min(axis=0) if len(first) else np.zeros(2, dtype=int)) - (block - 1)
+        self.bucket_cols, self.bucket_rows = (last.max(axis=0) - self.bucket_origin + 1) if len(last) else (0, 0)
+        buckets = [set() for _ in range(self.bucket_cols * self.bucket_rows + 1)]  # The last stays empty, for off-grid blocks
+        for index, ((x0, y0), (x1, y1)) in enumerate(zip(first - self.bucket_origin, last - self.bucket_origin)):
+            for y in range(y0 - block + 1, y1 + 1):
+                for x in range(x0 - block + 1, x1 + 1):
+                    buckets[y * self.bucket_cols + x].add(index)
+        self.buckets = np.full((len(buckets), max(1, *map(len, buckets))), len(self.colliders), dtype=int)
+        for key, bucket in enumerate(buckets):
+            self.buckets[key, :len(bucket)] = sorted(bucket)
+        # Left, top, right and bottom rows, the padding collider last
+        self.collider_edges = np.vstack((self.colliders, (np.inf, np.inf, -np.inf, -np.inf))).T.copy()
+
+    def nearby_colliders(self, boxes):
+        """Indices of the colliders in the cells each box touches, one row per box, padding and repeats included"""
+        first = np.floor_divide(boxes[:, :2], self.bucket_size).astype(int) - self.bucket_origin
+        last = np.floor_divide(boxes[:, 2:], self.bucket_size).astype(int) - self.bucket_origin
+        # One block per box unless a box is bigger than a hitbox
+        blocks = np.arange(0, int((last - first).max(initial=0)) + 1, self.bucket_block)
+        x = (first[:, 0, None] + blocks)[:, None, :]  # Box, block row, block column
+        y = (first[:, 1, None] + blocks)[:, :, None]
+        valid = ((x <= last[:, 0, None, None]) & (y <= last[:, 1, None, None]) &
+                 (x >= 0) & (x < self.bucket_cols) & (y >= 0) & (y < self.bucket_rows))
+        keys = np.where(valid, y * self.bucket_cols + x, len(self.buckets) - 1)
+        return self.buckets[keys].reshape(len(boxes), -1)
+
+    def line_of_sight(self, starts, end):
+        """OccupancyGrid.line_of_sight's DDA for every ray at once: the cells between edge crossings, in t order"""
+        if not len(starts) or not self.grid_cells.any():
+            return np.ones(len(starts), dtype=bool)  # Nothing to block a ray (and no cells to look up)
+        size = self.grid_cell_size
+        x, y = starts[:, 0], starts[:, 1]
+        dx, dy = end[0] - x, end[1] - y
+        cell_x, cell_y = (x // size).astype(int), (y // size).astype(int)
+        end_x, end_y = int(end[0] // size), int(end[1] // size)
+        step_x, step_y = np.where(dx > 0, 1, -1), np.where(dy > 0, 1, -1)
+        # Ray parameter t (0 at start, 1 at end) of each vertical and horizontal cell edge crossed, summed one
+        # edge after another like the scalar walk so ties between them come out the same
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_x = np.where(dx != 0, (np.where(dx > 0, cell_x + 1, cell_x) * size - x) / dx, np.inf)
+            t_y = np.where(dy != 0, (np.where(dy > 0, cell_y + 1, cell_y) * size - y) / dy, np.inf)
+            t_delta_x = np.where(dx != 0, np.abs(size / dx), np.inf)
+            t_delta_y = np.where(dy != 0, np.abs(size / dy), np.inf)
+        crossings_x = int(np.abs(dx).max() // size) + 2
+        crossings_y = int(np.abs(dy).max() // size) + 2
+        t_x = np.cumsum(np.column_stack([t_x] + [t_delta_x] * (crossings_x - 1)), axis=1)
+        t_y = np.cumsum(np.column_stack([t_y] + [t_delta_y] * (crossings_y - 1)), axis=1)
+
+        # Merge the crossings, a horizontal edge first on ties, and follow the cells they lead into
+        t = np.concatenate((t_y, t_x), axis=1)
+        order = np.argsort(t, axis=1, kind='stable')
+        along_x = order >= crossings_y
+        path_x = np.column_stack((cell_x, cell_x[:, None] + step_x[:, None] * np.cumsum(along_x, axis=1)))
+        path_y = np.column_stack((cell_y, cell_y[:, None] + step_y[:, None] * np.cumsum(~along_x, axis=1)))
+        walked = np.column_stack((np.ones(len(starts), dtype=bool), np.take_along_axis(t, order, axis=1) <= 1))
+        at_end = (path_x == end_x) & (path_y == end_y)
+        walked &= np.cumsum(at_end, axis=1) - at_end == 0  # The walk stops at the end cell
+
+        rows, cols = self.grid_cells.shape
+        col, row = path_x - self.grid_origin[0], path_y - self.grid_origin[1]
+        walked &= (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        blocked = self.grid_cells[np.clip(row, 0, rows - 1), np.clip(col, 0, cols - 1)]
+        return ~(blocked & walked).any(axis=1)
+
+    def flow_directions_at(self, positions):
+        """Directions from the shared flow field, NaN where it has none"""
+        field = self.flow_field
+        field.refresh()
+        if field.target_cell != self.flow_target:
+            self.flow_target = field.target_cell
+            self.flow_directions = np.array([d if d is not None else (np.nan, np.nan) for d in field.all_directions()],
+                                            dtype=float).reshape(-1, 2)
+        cols = np.clip(((positions[:, 0] - field.area.left) // field.cell_size).astype(int), 0, field.cols - 1)
+        rows = np.clip(((positions[:, 1] - field.area.top) // field.cell_size).astype(int), 0, field.rows - 1)
+        return self.flow_directions[rows * field.cols + cols]
+
+    def wander(self, mask, dt):
+        """Advance wander and pause timers for the ghosts in mask, return their wander velocity"""
+        # Paused ghosts wait out their pause
+        paused = mask & self.is_paused
+        self.pause_timer[paused] += dt
+        resumed = paused & (self.pause_timer >= self.pause_duration)
+        self.is_paused[resumed] = False
+        self.wander_timer[resumed] = 0
+
+        # Everyone else may pause or pick a new heading when their interval runs out
+        active = mask & ~paused
+        self.wander_timer[active] += dt
+        due = np.flatnonzero(active & (self.wander_timer >= self.wander_interval))
+        pausing = self.rng.random(len(due)) < self.pause_chance
+        pause_now = due[pausing]
+        self.is_paused[pause_now] = True
+        self.pause_timer[pause_now] = 0
+        self.pause_duration[pause_now] = self.rng.uniform(self.min_pause_duration, self.max_pause_duration,
+                                                          len(pause_now))
+        turn = due[~pausing]
+        angles = self.rng.uniform(0, 2 * np.pi, len(turn))
+        self.wander_direction[turn] = np.column_stack((np.cos(angles), np.sin(angles)))
+        self.wander_timer[turn] = 0
+        self.wander_interval[turn] = self.rng.integers(2, 4, len(turn))
+
+        walking = active.copy()
+        walking[pause_now] = False
+        velocity = np.zeros_like(self.pos)
+        velocity[walking] = self.wander_direction[walking] * self.speed * self.wander_speed_factor
+        return velocity
+
+    def resolve_collisions(self, centres, old_centres, axis, nearby):
+        """Push hitboxes out of the nearby colliders along one axis, like Ghost.collision
+
+        centres are the hitbox centres, whole pixels like a Ghost's hitbox_rect;
+        a ghost whose hitbox touched a collider has its position set to its
+        hitbox centre afterwards, as Ghost.collision does.
+        """
+        other = 1 - axis
+        half, other_half = self.half_hitbox[axis], self.half_hitbox[other]
+        lo, other_lo, hi, other_hi = self.collider_edges[(axis, other, axis + 2, other + 2), :][:, nearby]
+
+        centre = centres[:, axis:axis + 1]
+        other_centre = centres[:, other:other + 1]
+        old_centre = old_centres[:, axis:axis + 1]
+        overlap = ((centre + half > lo) & (centre - half < hi) &
+                   (other_centre + other_half > other_lo) & (other_centre - other_half < other_hi))
+        if not overlap.any():
+            return
+
+        # Came from below the collider on this axis: stop at its near edge, and the reverse
+        from_low = overlap & (old_centre + half <= lo)
+        from_high = overlap & (old_centre - half >= hi)
+        low_limit = np.where(from_low, lo - half, np.inf).min(axis=1)
+        high_limit = np.where(from_high, hi + half, -np.inf).max(axis=1)
+        centres[:, axis] = np.maximum(np.minimum(centres[:, axis], low_limit), high_limit)
+        touched = overlap.any(axis=1)
+        self.pos[touched, axis] = centres[touched, axis]
+
+    def avoid_win_zone(self, velocity, dt):
+        """Zero the velocity of ghosts whose next hitbox would enter the win zone"""
+        if not self.win_zone_rect:
+            return velocity
+        zone = self.win_zone_rect
+        test = self.pos + velocity * dt
+        enters = ((test[:, 0] + self.half_hitbox[0] > zone.left) & (test[:, 0] - self.half_hitbox[0] < zone.right) &
+                  (test[:, 1] + self.half_hitbox[1] > zone.top) & (test[:, 1] - self.half_hitbox[1] < zone.bottom))
+        velocity[enters] = 0
+        return velocity
+
+    def update(self, dt):
+        alive = self.alive
+        if not self.can_move:
+            self.moving[:] = False
+            return
+
+        player_pos = np.array(self.player.rect.center, dtype=float)
+        velocity = np.zeros_like(self.pos)
+        chasing = np.zeros(len(self.pos), dtype=bool)
+
+        # Chase ghosts within range that can see the player, unless the player is safe
+        if not (self.win_zone_rect and self.win_zone_rect.colliderect(self.player.rect)):
+            offsets = player_pos - self.pos
+            distance = np.linalg.norm(offsets, axis=1)
+            in_range = alive & (distance >= self.min_chase_distance) & (distance <= self.max_chase_distance)
+            candidates = np.flatnonzero(in_range)
+            chasing[candidates[self.line_of_sight(self.pos[candidates], player_pos)]] = True
+
+            directions = offsets[chasing]
+            if self.flow_field is not None:
+                flow = self.flow_directions_at(self.pos[chasing])
+                has_flow = ~np.isnan(flow[:, 0])
+                directions[has_flow] = flow[has_flow]
+            lengths = np.linalg.norm(directions, axis=1, keepdims=True)
+            directions = np.divide(directions, lengths, out=np.zeros_like(directions), where=lengths > 0)
+            velocity[chasing] = directions * self.speed
+            self.is_paused[chasing] = False
+
+        velocity += self.wander(alive & ~chasing, dt)
+        velocity = self.avoid_win_zone(velocity, dt)
+
+        # Move one axis at a time so collisions slide along block edges
+        # Positions stay fractional; only the hitboxes tested against blocks are rounded, as for a Ghost
+        old_centres = np.round(self.pos)
+        self.pos += velocity * dt
+        new_centres = np.round(self.pos)
+        # Collisions only pull a ghost back towards where it was, so both passes stay between the two positions
+        nearby = self.nearby_colliders(np.hstack((np.minimum(old_centres, new_centres) - self.half_hitbox,
+                                                  np.maximum(old_centres, new_centres) + self.half_hitbox)))
+        centres = old_centres.copy()
+        centres[:, 0] = new_centres[:, 0]
+        self.resolve_collisions(centres, old_centres, 0, nearby)
+        centres[:, 1] = np.round(self.pos[:, 1])
+        self.resolve_collisions(centres, old_centres, 1, nearby)
+
+        # Animation state
+        self.moving = alive & ~self.is_paused
+        turning = velocity[:, 0] != 0
+        self.facing_right[turning] = velocity[turning, 0] > 0
+        self.frame_index = (self.frame_index + self.animation_speed * dt) % len(self.moving_frames[0])
+
+    def collide_rect(self, rect):
+        """Indices of living ghosts whose sprite rect overlaps rect"""
+        left = self.pos[:, 0] - self.half_size[0]
+        top = self.pos[:, 1] - self.half_size[1]
+        hits = (self.alive & (left < rect.right) & (left + self.size[0] > rect.left) &
+                (top < rect.bottom) & (top + self.size[1] > rect.top))
+        return np.flatnonzero(hits)
+
+    def kill(self, indices):
+        self.alive[indices] = False
+
+    def draw(self, surface, offset, alpha=1.0):
+        """Blit every on-screen ghost with the shared animation frames, interpolated by alpha"""
+        view = pygame.Rect(-offset[0], -offset[1], surface.get_width(), surface.get_height())
+        visible = np.flatnonzero(self.alive & (self.pos[:, 0] + self.half_size[0] > view.left) &
+                                 (self.pos[:, 0] - self.half_size[0] < view.right) &
+                                 (self.pos[:, 1] + self.half_size[1] > view.top) &
+                                 (self.pos[:, 1] - self.half_size[1] < view.bottom))
+        drawn_pos = self.previous_pos[visible] + (self.pos[visible] - self.previous_pos[visible]) * min(alpha, 1)
+        screen_pos = drawn_pos - self.half_size + (offset[0], offset[1])
+        blits = []
+        for index, (x, y) in zip(visible, screen_pos):
+            right, left = self.moving_frames if self.moving[index] else self.idle_frames
+            frames = right if self.facing_right[index] else left
+            blits.append((frames[int(self.frame_index[index]) % len(frames)], (x, y)))
+        surface.blits(blits, doreturn=False)
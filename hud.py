@@ -0,0 +1,60 @@
+import pygame
+from collections import OrderedDict
+from asset_manager import assets
+
+class HUD:
+    """Screen text and panels, with fonts created once and rendered text cached.
+
+    Rendered surfaces are keyed by (font, text, color), so a label is only
+    re-rendered when its text changes; old entries fall out LRU first.
+    """
+    def __init__(self, screen, font_path='font/pixel_font.ttf', max_cached=128):
+        self.screen = screen
+        self.font_path = font_path
+        self.fonts = {}  # name -> pygame Font
+        self.text_cache = OrderedDict()  # (font name, text, color) -> surface, oldest first
+        self.max_cached = max_cached
+        self.panels = {}  # (size, color, alpha) -> surface
+
+    def add_font(self, name, size, fallback='helvetica', fallback_size=None):
+        """Create a named font once, falling back to a system font if the file can't be loaded"""
+        try:
+            self.fonts[name] = assets.font(self.font_path, size)
+        except OSError:
+            self.fonts[name] = pygame.font.SysFont(fallback, fallback_size or size)
+        return self.fonts[name]
+
+    def render(self, font_name, text, color):
+        """Return the rendered text surface, rendering it only the first time it is asked for"""
+        key = (font_name, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.fonts[font_name].render(text, True, color)
+            self.text_cache[key] = surface
+            if len(self.text_cache) > self.max_cached:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
+    def draw_text(self, font_name, text, color, **position):
+        """Blit cached text placed by rect keywords such as topleft or center"""
+        surface = self.render(font_name, text, color)
+        rect = surface.get_rect(**position)
+        self.screen.blit(surface, rect)
+        return rect
+
+    def panel(self, size, color, alpha):
+        """Return a reusable filled, semi-transparent surface"""
+        key = (size, color, alpha)
+        surface = self.panels.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            self.panels[key] = surface
+        return surface
+
+    def clear(self):
+        self.text_cache.clear()
+        self.panels.clear()
@@ -1,19 +1,304 @@
 import pygame
-from random import randint
+import argparse
+import math
+import time
+from random import Random
 from sprites import *
+from hud import HUD
+from frame_profiler import FrameProfiler
+from scene_manager import BaseScene, SceneManager, preload_scene, register
+from runtime import get_runtime
+from asset_manager import assets
+import profiling
+from recording import KeyState, InputRecorder, InputReplay
 from PIL import Image, ImageSequence
 import os
+import struct
 import subprocess
 import sys
+import threading
+
+try:
+    from ghost_horde import GhostHorde
+except ImportError:  # NumPy is only needed for horde mode
+    GhostHorde = None
+
+HORDE_GHOSTS = 300  # Ghost count for horde mode
+SIMULATION_RATE = 120  # Fixed simulation steps per second
+FRAME_CAP = 60  # Rendered frames per second (0 for uncapped)
+FRAME_CACHE_DIR = 'cache'  # Decoded GIF frames, safe to delete
+FLOW_FIELD_RANGE = 320  # Pursuit search radius in pixels, with room for detours past the chase distance
+RECORDING_DIR = 'recordings'  # Input recordings made with --record
+SLOW_FRAME_TIME = 1 / 30  # Frames longer than this are flagged in recordings
+CITY_SCALE = 4.5  # Walled city mode is this many times wider and taller, about 20x the area
+CITY_CHUNK_SIZE = 512  # Streaming chunk size in pixels for the walled city
+
+# Images, sounds and fonts a round needs, prefetched from the map while the Intramuros story plays
+GAME_ASSETS = [
+    ('image', 'img//env//agimat.png'), ('image', 'img//env//bgdark.png'), ('image', 'img//env//bglight.png'),
+    ('image', 'img//player//idle.png'), ('image', 'img//player//run.png'),
+    ('image', 'img//npcs//idle.png'), ('image', 'img//npcs//moving.png'),
+    ('image', 'img//env//shard1.png'), ('image', 'img//env//shard2.png'),
+] + [('image', f'img//env//stone{i}.png') for i in range(1, 6)] + [
+    ('sound', 'audio//jumpscare.wav'), ('sound', 'audio//win.wav'),
+    ('sound', 'audio//collectall.wav'), ('sound', 'audio//pickup.wav'),
+    ('font', 'font/pixel_font.ttf', 16), ('font', 'font/pixel_font.ttf', 20), ('font', 'font/pixel_font.ttf', 64),
+]
+
+class SilentAudio:
+    """Stands in for pygame.mixer.music and Sound objects when running without a mixer"""
+    def load(self, *args):
+        pass
+
+    def play(self, *args):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+# The eight headings the movement keys give, as unit vectors
+HEADINGS = [(dx / math.hypot(dx, dy), dy / math.hypot(dx, dy))
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+class ShardBot:
+    """Scripted player for headless rounds.
+
+    Heads for the nearest shard, then for the win zone to craft the Agimat,
+    following its own flow field around blocks. Once ghosts are within
+    danger_distance (a little past the range they start chasing from) it
+    takes whichever of the eight headings best trades progress along the
+    field against closing in on them, avoiding blocks, and sprints
+    when one is within flee_distance. It wiggles free when it gets stuck.
+    It plays like a cautious player who knows where every ghost is, so its
+    results compare ghost settings rather than predict human win rates.
+    """
+    def __init__(self, game, danger_distance=260, flee_distance=160, probe_distance=8, stuck_ticks=30):
+        self.game = game
+        self.danger_distance = danger_distance
+        self.flee_distance = flee_distance
+        self.probe_distance = probe_distance  # How far ahead a heading is checked for blocks
+        self.stuck_ticks = stuck_ticks
+        self.field = game.flow_field.copy()  # Same walkable cells as the ghosts, unbounded search
+        self.keys = KeyState()
+        self.rng = Random(game.round_seed)  # Own RNG, so the round's shared one sees the same draws on replay
+        self.target = None  # Position of the shard being collected, kept until a shard is picked up
+        self.target_score = None
+        self.last_pos = None
+        self.still_ticks = 0
+        self.wiggle_ticks = 0
+        self.wiggle = (0, 0)
+        self.heading = None  # Last heading evade() picked
+
+    def __call__(self):
+        return self.keys
+
+    def goal(self):
+        if self.game.score < self.game.total_artifacts:
+            if self.target_score != self.game.score:
+                player_pos = self.game.player.hitbox_rect.center
+                shards = self.game.shard_positions()
+                self.target = min(shards, key=lambda pos: math.dist(pos, player_pos)) if shards else None
+                self.target_score = self.game.score
+            if self.target:
+                return self.target
+        return self.game.win_zone.rect.center
+
+    def threats(self):
+        """(offset, distance) from the player to every ghost within danger_distance"""
+        player_x, player_y = self.game.player.hitbox_rect.center
+        positions = [ghost.rect.center for ghost in self.game.ghost_sprites]
+        horde = self.game.ghost_horde
+        if horde and len(horde):
+            alive = horde.pos[horde.alive]
+            near = ((alive - (player_x, player_y)) ** 2).sum(axis=1) < self.danger_distance ** 2
+            positions.extend(map(tuple, alive[near]))
+        threats = []
+        for x, y in positions:
+            distance = math.hypot(x - player_x, y - player_y)
+            if distance < self.danger_distance:
+                threats.append(((x - player_x, y - player_y), distance))
+        return threats
+
+    def evade(self, direction, threats):
+        """The heading that best follows direction while keeping away from threats, skipping ones into a block"""
+        length = math.hypot(*direction) or 1
+        goal_x, goal_y = direction[0] / length, direction[1] / length
+        player = self.game.player
+        best, best_score = None, -math.inf
+        for heading_x, heading_y in HEADINGS:
+            probe = player.hitbox_rect.move(round(heading_x * self.probe_distance), round(heading_y * self.probe_distance))
+            if any(sprite.rect.colliderect(probe) for sprite in collision_candidates(player.collision_sprites, probe)):
+                continue
+            score = heading_x * goal_x + heading_y * goal_y
+            for (ghost_x, ghost_y), distance in threats:
+                # Closing in on a ghost costs more the nearer it is
+                towards = (heading_x * ghost_x + heading_y * ghost_y) / (distance or 1)
+                score -= 3 * (1 - distance / self.danger_distance) * (towards + 1)
+            if (heading_x, heading_y) == self.heading:
+                score += 0.5  # Keep going rather than dither between two near-equal headings
+            if score > best_score:
+                best, best_score = (heading_x, heading_y), score
+        self.heading = best
+        return best or (goal_x, goal_y)
+
+    def step(self):
+        """Choose this tick's keys"""
+        player = self.game.player
+        pressed = set()
+        if self.game.in_win_zone and self.game.score >= self.game.total_artifacts:
+            pressed.add(pygame.K_f)
+
+        # Follow the field towards the goal, or the straight line once in its cell
+        if self.field.links is not self.game.flow_field.links:
+            self.field = self.game.flow_field.copy()  # The world streamed and the field was rebuilt
+        goal = self.goal()
+        self.field.update(goal)
+        direction = self.field.direction_at(player.hitbox_rect.center)
+        if direction is None:
+            direction = (goal[0] - player.hitbox_rect.centerx, goal[1] - player.hitbox_rect.centery)
+        dx, dy = direction
+
+        # Steer around nearby ghosts, sprinting from close ones
+        threats = self.threats()
+        if threats:
+            dx, dy = self.evade((dx, dy), threats)
+            if min(distance for _, distance in threats) < self.flee_distance:
+                pressed.add(pygame.K_LSHIFT)
+
+        # Pick a random heading for a while when blocked
+        if player.hitbox_rect.center == self.last_pos:
+            self.still_ticks += 1
+        else:
+            self.still_ticks = 0
+        self.last_pos = player.hitbox_rect.center
+        if self.still_ticks >= self.stuck_ticks:
+            self.still_ticks = 0
+            self.wiggle_ticks = self.stuck_ticks
+            self.wiggle = (self.rng.choice((-1, 1)), self.rng.choice((-1, 1)))
+        if self.wiggle_ticks:
+            self.wiggle_ticks -= 1
+            dx, dy = self.wiggle
+
+        # Keys for whichever axes carry a real share of the direction
+        length = math.hypot(dx, dy) or 1
+        if dx / length > 0.38:
+            pressed.add(pygame.K_d)
+        elif dx / length < -0.38:
+            pressed.add(pygame.K_a)
+        if dy / length > 0.38:
+            pressed.add(pygame.K_s)
+        elif dy / length < -0.38:
+            pressed.add(pygame.K_w)
+        self.keys = KeyState(pressed)
+
+class GifFrames:
+    """Decodes a GIF's frames on a worker thread, backed by a raw RGBA cache on disk.
+
+    The cache file is keyed by the GIF's mtime and the scale, so it is rebuilt
+    whenever either changes. Later launches load it with a single read.
+    """
+    MAGIC = b'GIFRGBA1'
+    HEADER = struct.Struct('<8sIII')  # Magic, width, height, frame count
+
+    def __init__(self, gif_path, scale=1):
+        self.gif_path = gif_path
+        self.scale = scale
+        self.size = None
+        self.raw_frames = None
+        self.error = None
+        self.surfaces = None
+        self.thread = threading.Thread(target=self.decode, daemon=True)
+        self.thread.start()
+
+    def cache_path(self):
+        name = os.path.splitext(os.path.basename(self.gif_path))[0]
+        mtime = os.stat(self.gif_path).st_mtime_ns
+        return os.path.join(FRAME_CACHE_DIR, f"{name}-{mtime}-{self.scale}.rgba")
+
+    def decode(self):
+        try:
+            cache_path = self.cache_path()
+            if not self.read_cache(cache_path):
+                self.decode_gif()
+                self.write_cache(cache_path)
+        except Exception as e:  # Reported on the main thread by frames()
+            self.error = e
+
+    def read_cache(self, cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+        magic, width, height, count = self.HEADER.unpack_from(data)
+        frame_bytes = width * height * 4
+        if magic != self.MAGIC or len(data) != self.HEADER.size + frame_bytes * count:
+            return False
+        view = memoryview(data)
+        self.size = (width, height)
+        self.raw_frames = [view[self.HEADER.size + i * frame_bytes:self.HEADER.size + (i + 1) * frame_bytes]
+                           for i in range(count)]
+        return True
+
+    def decode_gif(self):
+        frames = []
+        with Image.open(self.gif_path) as gif:
+            for frame in ImageSequence.Iterator(gif):
+                frame_rgba = frame.convert("RGBA")
+                size = frame_rgba.size
+                new_size = (int(size[0] * self.scale), int(size[1] * self.scale))
+                frame_rgba = frame_rgba.resize(new_size, Image.LANCZOS)
+                frames.append(frame_rgba.tobytes())
+        self.size = new_size
+        self.raw_frames = frames
+
+    def write_cache(self, cache_path):
+        try:
+            os.makedirs(FRAME_CACHE_DIR, exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.size[0], self.size[1], len(self.raw_frames)))
+                for frame in self.raw_frames:
+                    f.write(frame)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write frame cache {cache_path}: {e}")
+
+    def ready(self):
+        return not self.thread.is_alive()
+
+    def frames(self):
+        """Return the frames as surfaces, waiting for the worker if it hasn't finished"""
+        if self.surfaces is None:
+            self.thread.join()
+            if self.error:
+                raise self.error
+            self.surfaces = [pygame.image.frombuffer(frame, self.size, "RGBA").convert_alpha()
+                             for frame in self.raw_frames]
+            self.raw_frames = None
+        return self.surfaces
 
 # Game Class
-class Game:
-    def __init__(self):
-        # Setup
-        pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Intramuros")
-        self.clock = pygame.time.Clock()
+class Game(BaseScene):
+    def __init__(self, horde=False, fps_cap=FRAME_CAP, vsync=False, seed=None, headless=False, record=False,
+                 city=False, runtime=None):
+        # Setup: the shared window, or a dummy one with no audio when headless
+        self.headless = headless
+        self.runtime = runtime or get_runtime(size=(WIDTH, HEIGHT), vsync=vsync, headless=headless)
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("Intramuros")
+        self.profiler = FrameProfiler('intramuros')  # F3 overlay, CSV dump with ISLA_FRAME_CSV
+
+        # Fixed-step timing
+        self.fps_cap = 0 if self.runtime.vsync else fps_cap  # Vsync already paces the frames
+        self.fps = self.fps_cap
+        self.frame_time = 0
+        self.fixed_dt = 1 / SIMULATION_RATE
+        self.max_frame_time = 0.25
+        self.accumulator = 0
         self.running = True
         self.score = 0
         self.game_over = False
@@ -25,6 +310,31 @@ class Game:
         self.restart_prompt_timer = 0
         self.restart_prompt_interval = 1.0  # Blink interval in seconds
         self.transitioning_to_map = False
+
+        # Horde mode swaps the ghost sprites for a batched NumPy simulation
+        if horde and GhostHorde is None:
+            print("Warning: horde mode needs NumPy, falling back to normal ghosts")
+        if horde and city:
+            print("Warning: horde mode can't stream with the walled city, using normal ghosts")
+        self.horde_mode = horde and GhostHorde is not None and not city
+        self.ghost_horde = None
+
+        # The walled city streams its chunks around the camera instead of keeping the whole map live
+        self.city = city
+        self.world = None
+
+        # Every random choice in a round comes from one seed, so a round replays exactly from its inputs
+        self.seed = seed  # None picks a fresh seed each round
+        self.round_seed = None
+        self.round_number = 0
+        area_scale = CITY_SCALE ** 2 if city else 1  # Same density of blocks and ghosts at any size
+        self.num_blocks = round(40 * area_scale)
+        self.num_ghosts = round(5 * area_scale)
+        self.ghost_params = {}
+
+        # Input recording, one file per round
+        self.record = record
+        self.recorder = None
         
         # Add fade in effect variables
         self.fade_alpha = 255  # Start fully black
@@ -33,77 +343,90 @@ class Game:
 
         # Sprite groups
         self.all_sprites = AllSprites(self)
-        self.collision_sprites = pygame.sprite.Group()
+        self.all_sprites.animate = not headless  # Nothing is drawn headless
+        self.collision_sprites = CollisionGroup()  # Spatially indexed for collision queries
         self.collectible_sprites = pygame.sprite.Group()
         self.ghost_sprites = pygame.sprite.Group()
         self.win_zone_sprites = pygame.sprite.Group()
 
-        # Game initialization
+        # One-time asset setup, then the first round
+        self.load_assets()
         self.initialize_game()
 
-        # Load fonts
-        try:
-            self.font = pygame.font.Font('font/pixel_font.ttf', 16)
-            self.popup_font = pygame.font.Font('font/pixel_font.ttf', 20)
-        except:
-            self.main_font = pygame.font.SysFont('helvetica', 36)
-            self.popup_font = pygame.font.SysFont('helvetica', 48)
-
-        # Load sounds
-        pygame.mixer.init()
-        self.catch_sound = pygame.mixer.Sound("audio//jumpscare.wav")
-        self.win_sound = pygame.mixer.Sound("audio//win.wav")
-        self.win_sound.set_volume(0.5)
-        self.collectall_sound = pygame.mixer.Sound("audio//collectall.wav")
-        self.collectall_sound.set_volume(0.3)
-        self.pickup_sound = pygame.mixer.Sound("audio//pickup.wav")
-        self.pickup_sound.set_volume(0.1)
+        # Jumpscare timming
+        self.jumpscare_duration = 1  # Duration in seconds
+        self.jumpscare_timer = 0
+        self.jumpscare_active = False
+        self.game_over_screen_active = False
+
+    def load_assets(self):
+        """Load fonts, sounds, images and jumpscare frames once per Game"""
+        # Load fonts, text is drawn through the HUD's render cache
+        self.hud = HUD(self.screen)
+        self.font = self.hud.add_font('main', 16, fallback_size=36)
+        self.popup_font = self.hud.add_font('popup', 20, fallback_size=48)
+        self.hud.add_font('title', 64)
+
+        # Load sounds, silent when there is no audio device
+        if self.headless or not self.runtime.audio:
+            self.load_silence()
+        else:
+            self.load_sounds()
         self.background_music = "audio//bg.mp3"
         self.game_over_music = "audio//game over.mp3"
         self.victory_music = "audio//purity.mp3"
-        pygame.mixer.music.load(self.background_music)
-        pygame.mixer.music.set_volume(0.1)
+        self.loaded_music = None
 
         # Load images
-        self.win_img_load = pygame.image.load('img//env//agimat.png')
-        self.win_img = pygame.transform.scale(self.win_img_load, (69, 69))
-        self.background = pygame.image.load('img//env//bgdark.png').convert()
-        self.background_win = pygame.image.load('img//env//bglight.png').convert()
+        self.win_img = assets.scaled_image('img//env//agimat.png', (69, 69))
+        self.background = assets.image('img//env//bgdark.png').convert()
+        self.background_win = assets.image('img//env//bglight.png').convert()
         self.background_current = self.background
 
-        # Load gif frames for jumpscare
-        self.caught_frames = self.load_gif_frames("img//misc//jumpscare.gif", scale=1)
-        self.caught_animation = AnimatedSprite(self.caught_frames, 0, 0, scale=1)
+        # Decode gif frames for jumpscare in the background, the simulation never shows them
+        self.caught_frames_loader = None if self.headless else GifFrames("img//misc//jumpscare.gif", scale=1)
+        self.caught_animation = None
 
-        # Jumpscare timming
-        self.jumpscare_duration = 1  # Duration in seconds
-        self.jumpscare_timer = 0
-        self.jumpscare_active = False
-        self.game_over_screen_active = False
+    def load_sounds(self):
+        self.music = pygame.mixer.music
+        self.catch_sound = assets.sound("audio//jumpscare.wav")
+        self.win_sound = assets.sound("audio//win.wav")
+        self.win_sound.set_volume(0.5)
+        self.collectall_sound = assets.sound("audio//collectall.wav")
+        self.collectall_sound.set_volume(0.3)
+        self.pickup_sound = assets.sound("audio//pickup.wav")
+        self.pickup_sound.set_volume(0.1)
+
+    def load_silence(self):
+        self.music = SilentAudio()
+        self.catch_sound = self.win_sound = self.collectall_sound = self.pickup_sound = SilentAudio()
 
     def initialize_game(self):
+        """Reset per-round state and respawn entities, reusing the loaded assets"""
+        self.finish_recording()  # Restarting ends the previous round's recording
+
         # Clear existing sprites
         self.all_sprites.empty()
         self.collision_sprites.empty()
         self.collectible_sprites.empty()
         self.ghost_sprites.empty()
         self.win_zone_sprites.empty()
+        self.ghost_horde = None
+        image_cache.release()  # The new round takes its own references
 
         # Reset background music
-        self.background_music = "audio//bg.mp3"
-        pygame.mixer.music.stop()
-        pygame.mixer.music.load(self.background_music)
-        pygame.mixer.music.set_volume(0.1)
+        self.music.stop()
+        self.load_music(self.background_music)
+        self.music.set_volume(0.1)
 
         # Reset jumpscare state
         self.jumpscare_active = False
         self.jumpscare_timer = 0
         self.game_over_screen_active = False
-        self.caught_frames = self.load_gif_frames("img//misc//jumpscare.gif", scale=1)
-        self.caught_animation = AnimatedSprite(self.caught_frames, 0, 0, scale=1)
+        if self.caught_animation:
+            self.caught_animation.reset()
 
         # Reset game state
-        self.background = pygame.image.load('img//env//bgdark.png').convert()
         self.background_current = self.background
         self.score = 0
         self.game_over = False
@@ -113,18 +436,23 @@ class Game:
         self.restart_prompt_visible = False
         self.restart_prompt_timer = 0
         self.bg_music_playing = False
+        self.accumulator = 0
         
         # Reset fade in effect
         self.fade_alpha = 255
         self.fading_in = True
 
         # Define and create game boundary
+        scale = CITY_SCALE if self.city else 1
         self.game_area = {
             'left': 0,
-            'right': int(WIDTH * 1.5),  # Make play area wider than screen
+            'right': int(WIDTH * 1.5 * scale),  # Make play area wider than screen
             'top': 0,
-            'bottom': int(HEIGHT * 1.5)  # Make play area taller than screen
+            'bottom': int(HEIGHT * 1.5 * scale)  # Make play area taller than screen
         }
+        self.world = None
+        if self.city:
+            self.create_world()
         self.create_bounds()
         self.all_sprites.set_boundaries(self.game_area) # For camera
 
@@ -137,9 +465,23 @@ class Game:
                              self.collectible_sprites)
         self.player.can_move = False
 
+        # Seed the shared round RNG before anything random is spawned
+        self.round_number += 1
+        self.round_seed = self.seed if self.seed is not None else Random().randrange(2 ** 32)
+        rng.seed(self.round_seed)
+        self.rng = rng
+        if self.record:
+            self.recorder = InputRecorder(seed=self.round_seed, horde=self.horde_mode, city=self.city,
+                                          tick_rate=SIMULATION_RATE, start_timer=self.start_timer)
+            self.player.controller = self.recorder
+
         # Spawn game elements
         self.total_artifacts = 15
         self.spawn_blocks()
+        if self.world:
+            self.world.stream(self.camera_view())  # Only the chunks around the start come to life
+        self.collision_sprites.build_index()  # Walls and blocks are static from here on, until chunks stream
+        self.flow_field = FlowField(self.flow_area(), self.collision_sprites, max_distance=FLOW_FIELD_RANGE)
         self.spawn_collectibles()
         self.collectall_sound_played = False
 
@@ -149,12 +491,60 @@ class Game:
 
         # Spawn ghost
         self.min_ghost_spawn_distance = 300
-        self.spawn_ghosts(num_ghosts=5)
+        if self.horde_mode:
+            self.spawn_horde(HORDE_GHOSTS)
+        else:
+            self.spawn_ghosts(num_ghosts=self.num_ghosts)
 
         # Win zone state
         self.in_win_zone = False
         self.showing_win_hint = False
 
+        # Pre-render the background, walls, blocks and win zone into one layer
+        if self.headless:
+            for sprite in self.all_sprites.dynamic_sprites:
+                if hasattr(sprite, 'animation'):
+                    sprite.animation.frozen = True  # Nothing is drawn headless
+        elif self.world:
+            self.all_sprites.set_static_layer(self.world)  # Composed chunk by chunk as they stream in
+        else:
+            self.all_sprites.bake(self.background_current)
+
+    def create_world(self):
+        """Set up the chunk store for the walled city and how each kind of sprite is brought back"""
+        self.world = ChunkedWorld(pygame.Rect(0, 0, self.game_area['right'], self.game_area['bottom']),
+                                  self.background_current, chunk_size=CITY_CHUNK_SIZE)
+        self.world.add_kind('wall', lambda d: Boundary(d.rect.topleft, d.rect.size, (self.collision_sprites,)),
+                            solid=True)
+        self.world.add_kind('block', lambda d: Blocks(d.rect.center, d.rect.size, (self.collision_sprites,),
+                                                      d.image_path), solid=True)
+        self.world.add_kind('shard', lambda d: Collectibles(d.rect.center, (self.all_sprites, self.collectible_sprites),
+                                                            d.image_path))
+        self.world.add_kind('ghost', lambda d: self.create_ghost(d.rect.center), mobile=True)
+
+    def camera_view(self):
+        """World rect the camera shows while following the player"""
+        offset = self.all_sprites.calculate_camera(self.player.rect.center)
+        return pygame.Rect(-offset.x, -offset.y, WIDTH, HEIGHT)
+
+    def flow_area(self):
+        """Area the pursuit field covers, the loaded chunks in the walled city"""
+        if self.world:
+            return self.world.loaded_area()
+        return pygame.Rect(0, 0, self.game_area['right'], self.game_area['bottom'])
+
+    def stream_world(self):
+        """Load the chunks around the camera and drop far ones, rebuilding what depends on the colliders"""
+        if self.world.stream(self.camera_view()):
+            self.collision_sprites.build_index()
+            self.flow_field.build(self.flow_area(), self.collision_sprites)
+
+    def shard_positions(self):
+        """Centres of the shards still to collect, streamed out or not"""
+        if self.world:
+            return self.world.positions('shard')
+        return [sprite.rect.center for sprite in self.collectible_sprites]
+
     def create_bounds(self):
         wall_thickness = 64  # Thickness of boundary walls
 
@@ -174,70 +564,86 @@ class Game:
              self.game_area['right'] - self.game_area['left'] + wall_thickness * 2, wall_thickness)
         ]
 
-        # Create each boundary wall
+        # Create each boundary wall, cut into one piece per chunk in the walled city
         for boundary in boundaries:
+            if self.world:
+                wall = pygame.Rect(boundary)
+                for key in self.world.chunks_in(wall):
+                    piece = wall.clip(self.world.chunk_rect(key))
+                    self.world.add('wall', piece.center, piece.size)
+                continue
             Boundary((boundary[0], boundary[1]),
                      (boundary[2], boundary[3]),
                      (self.all_sprites, self.collision_sprites))
 
-    def get_safe_ghost_spawn(self):
-        """Generate a spawn position that's far enough from the player and within bounds"""
-        while True:
-            # Generate random position
-            spawn_x = randint(self.game_area['left'], self.game_area['right'])
-            spawn_y = randint(self.game_area['top'], self.game_area['bottom'])
-
-            # Calculate distance to player
-            player_pos = pygame.math.Vector2(self.player.rect.center)
-            spawn_pos = pygame.math.Vector2(spawn_x, spawn_y)
-            distance = (spawn_pos - player_pos).length()
+    def get_safe_ghost_spawns(self, num_ghosts):
+        """Generate spawn positions that are far enough from the player, within bounds and clear of walls"""
+        player_x, player_y = self.player.rect.center
+        placer = Placer(pygame.Rect(self.game_area['left'], self.game_area['top'],
+                                    self.game_area['right'] - self.game_area['left'],
+                                    self.game_area['bottom'] - self.game_area['top']),
+                        num_ghosts, self.rng, self.world or self.collision_sprites)
 
-            # Check if position is far enough from player
-            if distance >= self.min_ghost_spawn_distance:
-                # Optional: Check if spawn point is not inside a wall
-                test_rect = pygame.Rect(spawn_x - 15, spawn_y - 15, 30, 30)
-                collision = any(sprite.rect.colliderect(test_rect)
-                                for sprite in self.collision_sprites)
+        def far_from_player(rect):
+            return math.hypot(rect.centerx - player_x, rect.centery - player_y) >= self.min_ghost_spawn_distance
 
-                if not collision:
-                    return spawn_x, spawn_y
+        positions = []
+        for _ in range(num_ghosts):
+            spawn = placer.place((30, 30), accept=far_from_player)
+            if spawn is None:
+                print(f"Warning: Only found safe spawns for {len(positions)} of {num_ghosts} ghosts")
+                break
+            positions.append(spawn)
+        return positions
 
     def spawn_ghosts(self, num_ghosts=1):
         """Spawn multiple ghosts in safe locations"""
-        for _ in range(num_ghosts):
-            spawn_x, spawn_y = self.get_safe_ghost_spawn()
-            ghost = Ghost((spawn_x, spawn_y),
-                          (self.all_sprites, self.ghost_sprites),
-                          self.player,
-                          self.collision_sprites)
-            ghost.set_win_zone(self.win_zone)
+        for spawn_x, spawn_y in self.get_safe_ghost_spawns(num_ghosts):
+            if self.world:
+                self.world.add('ghost', (spawn_x, spawn_y), (30, 30))  # Wakes up when its chunk loads
+            else:
+                self.create_ghost((spawn_x, spawn_y))
+
+    def create_ghost(self, pos):
+        ghost = Ghost(pos,
+                      (self.all_sprites, self.ghost_sprites),
+                      self.player,
+                      self.collision_sprites)
+        ghost.set_win_zone(self.win_zone)
+        ghost.set_flow_field(self.flow_field)
+        if self.world:
+            # Streamed in mid-round, so catch up with the round's state
+            for name, value in self.ghost_params.items():
+                setattr(ghost, name, value)
+            if self.game_started:
+                ghost.start_moving()
+            ghost.animation.frozen = self.headless
+        return ghost
+
+    def spawn_horde(self, num_ghosts):
+        """Spawn a batched horde of ghosts in safe locations"""
+        positions = self.get_safe_ghost_spawns(num_ghosts)
+        self.ghost_horde = GhostHorde(positions, self.player, self.collision_sprites,
+                                      win_zone_rect=self.win_zone.rect, flow_field=self.flow_field,
+                                      seed=self.rng.getrandbits(64))
 
     def spawn_collectibles(self):
-        """Spawn collectibles within game boundaries and not on top of blocks"""
-        attempts_per_collectible = 5  # Maximum attempts to find a valid spot
-
-        for _ in range(self.total_artifacts):
-            placed = False
-            attempts = 0
-
-            while not placed and attempts < attempts_per_collectible:
-                # Generate random position
-                x = randint(self.game_area['left'] + 32, self.game_area['right'] - 32)
-                y = randint(self.game_area['top'] + 32, self.game_area['bottom'] - 32)
-
-                # Create a test rect for collision checking
-                test_rect = pygame.Rect(x - 10, y - 10, 20, 20)  # Size matches collectible
-
-                # Check if this position collides with any blocks
-                collision = any(sprite.rect.colliderect(test_rect)
-                                for sprite in self.collision_sprites)
-                if not collision:
-                    # If no collision, place the collectible
-                    Collectibles((x, y), (self.all_sprites, self.collectible_sprites))
-                    placed = True
-                attempts += 1
-            if not placed:
-                print(f"Warning: Could not place collectible after {attempts_per_collectible} attempts")
+        """Spawn collectibles within game boundaries, spread out and not on top of blocks"""
+        placer = Placer(pygame.Rect(self.game_area['left'] + 22, self.game_area['top'] + 22,
+                                    self.game_area['right'] - self.game_area['left'] - 44,
+                                    self.game_area['bottom'] - self.game_area['top'] - 44),
+                        self.total_artifacts, self.rng, self.world or self.collision_sprites)
+
+        for placed in range(self.total_artifacts):
+            position = placer.place((20, 20), reserve=True)  # Size matches collectible
+            if position is None:
+                print(f"Warning: Could only place {placed} of {self.total_artifacts} collectibles")
+                self.total_artifacts = placed  # Keep the round winnable
+                break
+            if self.world:
+                self.world.add('shard', position, (20, 20), self.rng.choice(list(Collectibles.collectible_images.values())))
+            else:
+                Collectibles(position, (self.all_sprites, self.collectible_sprites))
 
     def spawn_blocks(self):
         """Spawn blocks within game boundaries but not in win zone"""
@@ -248,184 +654,250 @@ class Game:
             200,  # width (matching win zone size)
             200   # height (matching win zone size)
         )
-        
-        for _ in range(40):
-            valid_position = False
-            while not valid_position:
-                x = randint(self.game_area['left'] + 64, self.game_area['right'] - 64)
-                y = randint(self.game_area['top'] + 64, self.game_area['bottom'] - 64)
-                w, h = randint(32, 80), randint(32, 80)
-                
-                # Create test rect for the potential block
-                test_rect = pygame.Rect(x - w//2, y - h//2, w, h)
-                
-                # Check if block would overlap with win zone area
-                if not win_zone_rect.colliderect(test_rect):
-                    valid_position = True
-                    Blocks((x, y), (w, h), (self.all_sprites, self.collision_sprites))
+
+        # Blocks may overlap each other, but one per grid cell keeps them spread out
+        placer = Placer(pygame.Rect(self.game_area['left'] + 32, self.game_area['top'] + 32,
+                                    self.game_area['right'] - self.game_area['left'] - 64,
+                                    self.game_area['bottom'] - self.game_area['top'] - 64),
+                        self.num_blocks, self.rng)
+        placer.reserve(win_zone_rect)
+
+        for placed in range(self.num_blocks):
+            w, h = self.rng.randint(32, 80), self.rng.randint(32, 80)
+            position = placer.place((w, h))
+            if position is None:
+                print(f"Warning: Could only place {placed} of {self.num_blocks} blocks")
+                break
+            if self.world:
+                self.world.add('block', position, (w, h), self.rng.choice(list(Blocks.block_images.values())))
+            else:
+                Blocks(position, (w, h), (self.all_sprites, self.collision_sprites))
+
+    def load_music(self, path):
+        """Load a music track unless it is already the loaded one"""
+        if self.loaded_music != path:
+            self.music.load(path)
+            self.loaded_music = path
 
     def load_gif_frames(self, gif_path, scale=1):
-        frames = []
-        with Image.open(gif_path) as gif:
-            for frame in ImageSequence.Iterator(gif):
-                frame_rgba = frame.convert("RGBA")
-                size = frame_rgba.size
-                new_size = (int(size[0] * scale), int(size[1] * scale))
-                frame_rgba = frame_rgba.resize(new_size, Image.LANCZOS)
-                pygame_image = pygame.image.fromstring(
-                    frame_rgba.tobytes(), frame_rgba.size, "RGBA"
-                ).convert_alpha()
-                frames.append(pygame_image)
-        return frames
+        return GifFrames(gif_path, scale).frames()
+
+    def get_caught_animation(self):
+        """Build the jumpscare animation, waiting for its frames if they are still decoding"""
+        if self.caught_animation is None:
+            self.caught_frames = self.caught_frames_loader.frames()
+            self.caught_animation = AnimatedSprite(self.caught_frames, 0, 0, scale=1)
+        return self.caught_animation
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE and self.player_won:
+                self.transition_to_map()
+
+    def update(self, dt):
+        # Real time since the last frame, capped so a long stall can't queue up endless steps
+        self.frame_time = min(dt, self.max_frame_time)
+
+        # Pick up the jumpscare frames once the worker has decoded them
+        if self.caught_animation is None and self.caught_frames_loader and self.caught_frames_loader.ready():
+            self.get_caught_animation()
+
+        if not self.bg_music_playing:
+            self.music.play(-1)
+            self.music.set_volume(0.1)
+            self.bg_music_playing = True
+
+        if not self.game_over:
+            # Advance the simulation in fixed steps, then draw between the last two states
+            self.accumulator += self.frame_time
+            while self.accumulator >= self.fixed_dt and not self.game_over:
+                self.simulate(self.fixed_dt)
+                self.accumulator -= self.fixed_dt
+
+    def draw(self, screen):
+        if self.game_over:
+            self.all_sprites.draw(self.player.rect.center)
+            self.handle_game_over(self.frame_time)
+            self.restart_key()
+        else:
+            self.render(self.frame_time, self.accumulator / self.fixed_dt)
+            if self.recorder is not None and self.frame_time > SLOW_FRAME_TIME:
+                self.recorder.mark_slow()
+
+        # Handle fade in effect
+        if self.fading_in:
+            fade_surface = pygame.Surface((WIDTH, HEIGHT))
+            fade_surface.fill((0, 0, 0))
+            fade_surface.set_alpha(self.fade_alpha)
+            self.screen.blit(fade_surface, (0, 0))
+            
+            self.fade_alpha = max(0, self.fade_alpha - self.fade_speed)
+            if self.fade_alpha <= 0:
+                self.fading_in = False
 
-    def run(self):
-        while self.running:
-            # Delta time
-            dt = self.clock.tick() / 1000
-
-            # Event Handler
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.player_won:
-                        self.transition_to_map()
-
-            if not self.bg_music_playing:
-                pygame.mixer.music.play(-1)
-                pygame.mixer.music.set_volume(0.1)
-                self.bg_music_playing = True
-
-            if self.game_over:
-                self.all_sprites.draw(self.player.rect.center)
-                self.handle_game_over(dt)
-                self.restart_key()
-            elif self.player_won:
-                # Draw purified bg
-                victory_pos = self.all_sprites.offset
-                self.screen.blit(self.background_current, victory_pos)
-
-                # Keep assets updating
-                self.all_sprites.update(dt)
-                self.all_sprites.draw(self.player.rect.center)
-
-                self.handle_win_transition()
-                self.win_text = self.font.render("You have purified the museum!", True, WHITE)
-                self.screen.blit(self.win_text, (WIDTH // 4 + 100, HEIGHT // 2 - 150))
-                self.screen.blit(self.win_img, (WIDTH // 4 + 300, HEIGHT // 4 - 100))
-                
-                # Update the prompt blink timer
-                self.restart_prompt_timer += dt
-                if self.restart_prompt_timer >= self.restart_prompt_interval:
-                    self.restart_prompt_timer = 0
-                    self.restart_prompt_visible = not self.restart_prompt_visible
-
-                # Draw blinking map transition prompt
-                if self.restart_prompt_visible:
-                    transition_text = self.font.render("Press SPACE to Access the Map", True, WHITE)
-                    transition_rect = transition_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
-                    self.screen.blit(transition_text, transition_rect)
+    def exit(self):
+        self.running = False
+        self.finish_recording()
+        image_cache.release()  # Before the scene's own references go, so none are left stale
+        Collectibles.clear_frames()
 
-            else:
-                # Game completion loop
-                if not self.game_started:
-                    self.start_timer += dt
-                    if self.start_timer >= self.start_delay:
-                        self.game_started = True
-                        self.player.can_move = True
-                        for ghost in self.ghost_sprites:
-                            ghost.start_moving()
-
-                # Update game
-                self.all_sprites.update(dt)
-                self.all_sprites.draw(self.player.rect.center)
-                self.player.update(dt)
-                collected = self.player.collectible()
-                self.score += collected
-                if collected > 0:
-                    self.pickup_sound.play()
-
-                # Check for player progress
-                self.check_win_zone()
-                self.win_input()
-                self.check_game_over()
-
-                # Draw UI elements
-                self.score_text = self.font.render(f"Artifacts Obtained: {self.score}/{self.total_artifacts}", True, WHITE)
-                self.screen.blit(self.score_text, (10, 10))
-                self.player.draw_stamina_bar(self.screen)
-                self.draw_win_hint()
-
-                if self.score == self.total_artifacts and not self.collectall_sound_played:
-                    self.collectall_sound.play()
-                    self.collectall_sound_played = True
-
-                # Draw countdown timer
-                if not self.game_started:
-                    time_left = max(0, self.start_delay - self.start_timer)
-                    countdown_text = self.font.render(f"Starts in {time_left:.1f}", True, WHITE)
-                    text_rect = countdown_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
-                    self.screen.blit(countdown_text, text_rect)
-
-            # Handle fade in effect
-            if self.fading_in:
-                fade_surface = pygame.Surface((WIDTH, HEIGHT))
-                fade_surface.fill((0, 0, 0))
-                fade_surface.set_alpha(self.fade_alpha)
-                self.screen.blit(fade_surface, (0, 0))
-                
-                self.fade_alpha = max(0, self.fade_alpha - self.fade_speed)
-                if self.fade_alpha <= 0:
-                    self.fading_in = False
-
-            pygame.display.flip()
-
-        pygame.quit()
+    def run(self):
+        SceneManager(self.runtime).run(self)
+        self.runtime.shutdown()
+
+    def tune_ghosts(self, **params):
+        """Override ghost behaviour parameters such as speed, max_chase_distance or pause_chance"""
+        for ghost in list(self.ghost_sprites) + ([self.ghost_horde] if self.ghost_horde else []):
+            for name, value in params.items():
+                if not hasattr(ghost, name):
+                    raise AttributeError(f"Ghosts have no parameter {name!r}")
+                setattr(ghost, name, value)
+        self.ghost_params.update(params)
+
+    def play_headless(self, controller=None, max_time=180, max_ticks=None, skip_countdown=True):
+        """Step the current round at the fixed dt without drawing until it is won, lost or times out"""
+        controller = controller or ShardBot(self)
+        if skip_countdown:
+            self.start_timer = self.start_delay
+        if self.recorder is not None:
+            # Record whatever the controller presses
+            self.recorder.source = controller
+            self.recorder.header['start_timer'] = self.start_timer
+            controller = self.recorder
+        self.player.controller = controller
+        if max_ticks is None:
+            max_ticks = int(max_time / self.fixed_dt)
+        ticks = 0
+        start = time.perf_counter()
+        while not (self.game_over or self.player_won) and ticks < max_ticks:
+            self.simulate(self.fixed_dt)
+            ticks += 1
+        elapsed = time.perf_counter() - start
+
+        return {'outcome': self.outcome(), 'time': ticks * self.fixed_dt, 'ticks': ticks,
+                'shards': self.score, 'total_shards': self.total_artifacts, 'wall_time': elapsed}
+
+    def outcome(self):
+        if self.game_over:
+            return 'caught'
+        if self.player_won:
+            return 'won'
+        return 'timeout'
+
+    def finish_recording(self):
+        """Save the current round's input recording, if one is being made"""
+        if self.recorder is None or not len(self.recorder):
+            self.recorder = None
+            return None
+        os.makedirs(RECORDING_DIR, exist_ok=True)
+        path = os.path.join(RECORDING_DIR, f"intramuros-{time.strftime('%Y%m%d-%H%M%S')}"
+                                           f"-{self.round_number}-seed{self.round_seed}.rec")
+        self.recorder.header['ghost_params'] = self.ghost_params
+        self.recorder.save(path, outcome=self.outcome(), shards=self.score)
+        self.recorder = None
+        print(f"Recorded round to {path}")
+        return path
+
+    def simulate(self, dt):
+        """Advance the game by one fixed step of dt seconds"""
+        # Input for this tick, sampled once per step so the same ticks see the same keys on replay
+        if hasattr(self.player.controller, 'step'):
+            self.player.controller.step()
+
+        if not self.headless:
+            self.all_sprites.store_previous_positions()
+            if self.ghost_horde:
+                self.ghost_horde.store_previous_positions()
+
+        if self.player_won:
+            # Keep assets updating
+            self.all_sprites.update(dt)
+            return
+
+        # Game completion loop
+        if not self.game_started:
+            self.start_timer += dt
+            if self.start_timer >= self.start_delay:
+                self.game_started = True
+                self.player.can_move = True
+                for ghost in self.ghost_sprites:
+                    ghost.start_moving()
+                if self.ghost_horde:
+                    self.ghost_horde.start_moving()
+
+        # Update game
+        if self.world:
+            self.stream_world()
+        self.flow_field.update(self.player.hitbox_rect.center)  # Searched lazily when a chaser asks
+        self.all_sprites.update(dt)
+        if self.ghost_horde:
+            self.ghost_horde.update(dt)
+        self.player.update(dt)
+        collected = self.player.collectible()
+        self.score += collected
+        if collected > 0:
+            self.pickup_sound.play()
+
+        # Check for player progress
+        self.check_win_zone()
+        self.win_input()
+        self.check_game_over()
+
+        if self.score == self.total_artifacts and not self.collectall_sound_played:
+            self.collectall_sound.play()
+            self.collectall_sound_played = True
+
+    def render(self, dt, alpha):
+        """Draw the current state, with moving sprites interpolated alpha of the way into the next step"""
+        camera_target = self.all_sprites.interpolated_rect(self.player, alpha).center
+
+        if self.player_won:
+            # Draw purified bg
+            victory_pos = self.all_sprites.offset
+            self.screen.blit(self.background_current, victory_pos)
+            self.all_sprites.draw(camera_target, alpha=alpha)
+
+            self.handle_win_transition()
+            self.hud.draw_text('main', "You have purified the museum!", WHITE, topleft=(WIDTH // 4 + 100, HEIGHT // 2 - 150))
+            self.screen.blit(self.win_img, (WIDTH // 4 + 300, HEIGHT // 4 - 100))
+            
+            # Update the prompt blink timer
+            self.restart_prompt_timer += dt
+            if self.restart_prompt_timer >= self.restart_prompt_interval:
+                self.restart_prompt_timer = 0
+                self.restart_prompt_visible = not self.restart_prompt_visible
+
+            # Draw blinking map transition prompt
+            if self.restart_prompt_visible:
+                self.hud.draw_text('main', "Press SPACE to Access the Map", WHITE, center=(WIDTH // 2, HEIGHT // 2 - 100))
+            return
+
+        self.all_sprites.draw(camera_target, alpha=alpha)
+        if self.ghost_horde:
+            self.ghost_horde.draw(self.screen, self.all_sprites.offset, alpha=alpha)
+
+        # Draw UI elements
+        self.hud.draw_text('main', f"Artifacts Obtained: {self.score}/{self.total_artifacts}", WHITE, topleft=(10, 10))
+        self.player.draw_stamina_bar(self.screen)
+        self.draw_win_hint()
+
+        # Draw countdown timer
+        if not self.game_started:
+            time_left = max(0, self.start_delay - self.start_timer)
+            self.hud.draw_text('main', f"Starts in {time_left:.1f}", WHITE, center=(WIDTH // 2, HEIGHT // 4))
 
     def transition_to_map(self):
-        # Create fade out effect
-        fade_surface = pygame.Surface((WIDTH, HEIGHT))
-        fade_surface.fill((0, 0, 0))
-        fade_alpha = 0
-        fade_speed = 5
-
-        # Fade out loop
-        while fade_alpha < 255:
-            # Handle any quit events during transition
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-            # Draw current game state
-            if self.player_won:
-                victory_pos = self.all_sprites.offset
-                self.screen.blit(self.background_current, victory_pos)
-                self.all_sprites.draw(self.player.rect.center)
-                self.win_text = self.font.render("You have purified the museum!", True, WHITE)
-                self.screen.blit(self.win_text, (WIDTH // 4 + 100, HEIGHT // 2 - 150))
-                self.screen.blit(self.win_img, (WIDTH // 4 + 300, HEIGHT // 4 - 100))
-
-            # Draw fade overlay
-            fade_surface.set_alpha(fade_alpha)
-            self.screen.blit(fade_surface, (0, 0))
-            pygame.display.flip()
-            
-            fade_alpha += fade_speed
-            self.clock.tick(60)
+        # Fade out over the victory screen, then return to the map
+        if not self.transitioning_to_map:
+            self.transitioning_to_map = True
+            self.manager.fade_out(self.leave_to_map)
 
+    def leave_to_map(self):
         # Stop all sounds
-        pygame.mixer.music.stop()
+        self.music.stop()
         pygame.mixer.stop()
-
-        # Import and start map
-        import map
-        try:
-            self.running = False
-            map.main()
-        except Exception as e:
-            print(f"Error transitioning to map: {e}")
-            self.running = False
+        self.finish_recording()
+        self.manager.back_to('map')
 
     def check_win_zone(self):
         # Check if player is in win zone
@@ -441,9 +913,7 @@ class Game:
     def draw_win_hint(self):
         if self.showing_win_hint:
             # Create semi-transparent background for popup
-            popup_surface = pygame.Surface((900, 80))
-            popup_surface.fill((0, 0, 0))
-            popup_surface.set_alpha(64)
+            popup_surface = self.hud.panel((900, 80), (0, 0, 0), 64)
 
             # Position popup in center of screen
             popup_rect = popup_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 150))
@@ -455,37 +925,45 @@ class Game:
             else:
                 prompt_text = f"Collect all Agimat shards first! ({self.score}/{self.total_artifacts})"
 
-            text_surface = self.popup_font.render(prompt_text, True, WHITE)
-            text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 150))
-            self.screen.blit(text_surface, text_rect)
+            self.hud.draw_text('popup', prompt_text, WHITE, center=(WIDTH // 2, HEIGHT // 2 + 150))
 
     def win_input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.player.get_keys()
         if self.in_win_zone and keys[pygame.K_f] and self.score >= self.total_artifacts:
             self.trigger_win()
             self.showing_win_hint = False
 
     def trigger_win(self):
         self.win_sound.play()
-        pygame.mixer.music.stop()
+        self.music.stop()
         self.bg_music_playing = False
-        pygame.mixer.music.load(self.victory_music)
-        pygame.mixer.music.play(-1)
-        pygame.mixer.music.set_volume(1)
+        self.load_music(self.victory_music)
+        self.music.play(-1)
+        self.music.set_volume(1)
         self.player_won = True
         self.background_current = self.background_win
         for ghost in self.ghost_sprites:
             ghost.kill()
         self.ghost_sprites.empty()
+        if self.ghost_horde:
+            self.ghost_horde.clear()
+        if not self.headless:
+            preload_scene('map', self.runtime)  # Load the map while the victory screen is up
 
     def check_game_over(self):
         if not self.in_win_zone:
-            if pygame.sprite.spritecollide(self.player, self.ghost_sprites, True):
+            caught = pygame.sprite.spritecollide(self.player, self.ghost_sprites, True)
+            if self.ghost_horde:
+                catchers = self.ghost_horde.collide_rect(self.player.rect)
+                self.ghost_horde.kill(catchers)
+                caught = caught or len(catchers)
+            if caught:
                 self.game_over = True
-                pygame.mixer.music.stop()
+                self.music.stop()
                 self.bg_music_playing = False
                 self.catch_sound.play()
-                self.caught_animation.start_animation()
+                if self.caught_frames_loader:
+                    self.get_caught_animation().start_animation()
                 self.player.can_move = False
                 self.jumpscare_active = True
                 self.game_over_screen_active = False
@@ -504,9 +982,9 @@ class Game:
                 self.jumpscare_active = False
                 self.game_over_screen_active = True
                 # Start game over music
-                pygame.mixer.music.load(self.game_over_music)
-                pygame.mixer.music.play(-1)
-                pygame.mixer.music.set_volume(0.1)
+                self.load_music(self.game_over_music)
+                self.music.play(-1)
+                self.music.set_volume(0.1)
 
         elif self.game_over_screen_active:
             self.screen.fill(BLACK)
@@ -520,21 +998,14 @@ class Game:
             self.restart_prompt_visible = not self.restart_prompt_visible
 
         # Draw game over text
-        game_over_font = pygame.font.Font('font/pixel_font.ttf', 64)
-        game_over_text = game_over_font.render("GAME OVER", True, (255, 0, 0))
-        game_over_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
-        self.screen.blit(game_over_text, game_over_rect)
+        self.hud.draw_text('title', "GAME OVER", RED, center=(WIDTH // 2, HEIGHT // 2 - 50))
 
         # Draw score
-        score_text = self.font.render(f"Final Score: {self.score}/{self.total_artifacts}", True, WHITE)
-        score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 20))
-        self.screen.blit(score_text, score_rect)
+        self.hud.draw_text('main', f"Final Score: {self.score}/{self.total_artifacts}", WHITE, center=(WIDTH // 2, HEIGHT // 2 + 20))
 
         # Draw blinking restart prompt
         if self.restart_prompt_visible:
-            restart_text = self.font.render("Press ENTER to Restart", True, WHITE)
-            restart_rect = restart_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 70))
-            self.screen.blit(restart_text, restart_rect)
+            self.hud.draw_text('main', "Press ENTER to Restart", WHITE, center=(WIDTH // 2, HEIGHT // 2 + 70))
 
     def restart_key(self):
         keys = pygame.key.get_pressed()
@@ -545,6 +1016,81 @@ class Game:
     def handle_win_transition(self):
         pass 
 
+register('intramuros', Game, assets=GAME_ASSETS)
+
+def run_headless(rounds=100, seed=0, horde=False, max_time=180, record=False, city=False, **ghost_params):
+    """Play rounds with the bot and no window or audio, returning one outcome per round"""
+    game = Game(horde=horde, seed=seed, headless=True, record=record, city=city)
+    results = []
+    for round_index in range(rounds):
+        if round_index:
+            game.seed = seed + round_index
+            game.initialize_game()
+        game.tune_ghosts(**ghost_params)
+        result = game.play_headless(max_time=max_time)
+        result['seed'] = game.round_seed
+        results.append(result)
+    game.finish_recording()
+    return results
+
+def replay_round(path, headless=False):
+    """Re-run a recorded round from its seed and inputs, drawn or headless"""
+    replay = InputReplay(path)
+    header = replay.header
+    if header.get('tick_rate', SIMULATION_RATE) != SIMULATION_RATE:
+        print(f"Warning: {path} was recorded at {header['tick_rate']} ticks/s, replaying at {SIMULATION_RATE}")
+    game = Game(horde=header.get('horde', False), seed=header['seed'], headless=headless,
+                city=header.get('city', False))
+    game.tune_ghosts(**header.get('ghost_params', {}))
+    game.start_timer = header.get('start_timer', 0)
+    game.player.controller = replay
+    if headless:
+        return game.play_headless(replay, max_ticks=len(replay), skip_countdown=False)
+    game.run()
+    return None
+
+def parse_ghost_param(text):
+    name, _, value = text.partition('=')
+    return name, float(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Intramuros chase game")
+    parser.add_argument('--horde', action='store_true', help="Batched NumPy ghosts, for large ghost counts")
+    parser.add_argument('--vsync', action='store_true', help="Pace frames with vsync instead of the frame cap")
+    parser.add_argument('--seed', type=int, help="Spawn layout seed")
+    parser.add_argument('--city', action='store_true',
+                        help=f"Whole walled city, {CITY_SCALE}x wider and taller, streamed in chunks")
+    parser.add_argument('--headless', action='store_true', help="Simulate bot rounds with no window or audio")
+    parser.add_argument('--rounds', type=int, default=100, help="Rounds to simulate in headless mode")
+    parser.add_argument('--max-time', type=float, default=180, help="Simulated seconds before a round times out")
+    parser.add_argument('--ghost', type=parse_ghost_param, action='append', default=[], metavar='NAME=VALUE',
+                        help="Override a ghost parameter in headless mode, e.g. speed=180")
+    parser.add_argument('--record', action='store_true', help=f"Save each round's seed and inputs under {RECORDING_DIR}/")
+    parser.add_argument('--replay', metavar='FILE', help="Re-run a recorded round, add --headless to skip drawing")
+    args = parser.parse_args()
+
+    if args.replay:
+        result = replay_round(args.replay, headless=args.headless)
+        if result:
+            recorded = InputReplay(args.replay).header
+            print(f"replayed {result['outcome']} after {result['ticks']} ticks with {result['shards']} shards, "
+                  f"recorded {recorded['outcome']} after {recorded['ticks']} ticks with {recorded['shards']} shards")
+    elif args.headless:
+        start = time.perf_counter()
+        results = run_headless(args.rounds, args.seed or 0, args.horde, args.max_time, args.record, args.city,
+                               **dict(args.ghost))
+        elapsed = time.perf_counter() - start
+        for result in results:
+            print(f"seed {result['seed']}: {result['outcome']} after {result['time']:.1f}s "
+                  f"with {result['shards']}/{result['total_shards']} shards")
+        ticks = sum(result['ticks'] for result in results)
+        stepping = sum(result['wall_time'] for result in results)
+        outcomes = [result['outcome'] for result in results]
+        print(f"won {outcomes.count('won')}, caught {outcomes.count('caught')}, timed out {outcomes.count('timeout')} "
+              f"| {ticks} ticks at {ticks / stepping:.0f} ticks/s, {elapsed:.1f}s including round setup")
+    else:
+        game = Game(horde=args.horde, vsync=args.vsync, seed=args.seed, record=args.record, city=args.city)
+        game.run()
+
 if __name__ == '__main__':
-    game = Game()
-    game.run()
\ No newline at end of file
+    profiling.run('intramuros', main)
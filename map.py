@@ -4,16 +4,20 @@ from pygame.math import Vector2
 import random
 import math
 import pygame.gfxdraw
-import json
+from frame_profiler import FrameProfiler
+from scene_manager import BaseScene, SceneManager, register
+from runtime import SCREEN_SIZE, get_runtime
+from prefetch import prefetcher
+from asset_manager import assets
+import profiling
 
-# Initialize Pygame and mixer
-pygame.init()
-pygame.mixer.init()
+screen_width, screen_height = SCREEN_SIZE
 
-# Set up the display
-screen_width, screen_height = 1280, 720
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Philippine Map")
+# Location -> story scenes its "Play Mini-Game" button starts, the first one pushed over the map
+STORY_SCENES = {
+    'manila': ('intramuros_story', 'intramuros'),
+    'ifugao': ('banaue',),
+}
 
 # Colors
 SEA_COLOR = (53, 180, 186, 255)
@@ -26,38 +30,60 @@ GREEN = (0, 255, 0)
 SHADOW_COLOR = (100, 100, 100, 128)
 BUBBLE_COLOR = (255, 255, 255, 200)
 
-# Load and scale images
-original_map = pygame.image.load("assets/pixel_philippines_map.png").convert_alpha()
-star_img = pygame.image.load("assets/star.png").convert_alpha()
+# Images, sounds, location data and fonts, set by load_assets() so importing this module loads nothing
+original_map = star_img = None
+click_sound = ambient_sound = None
+locations = None
+main_font = small_font = title_font = instruction_font = None
+assets_loaded = False
+
+def load_assets(runtime=None):
+    """Load everything the map draws and plays, once; later calls are free.
+
+    Call it ahead of time, e.g. while a mini-game's victory screen is up,
+    so switching back to the map doesn't stall on disk.
+    """
+    global original_map, star_img, click_sound, ambient_sound, locations
+    global main_font, small_font, title_font, instruction_font, assets_loaded
+    if assets_loaded:
+        return
+    runtime = runtime or get_runtime()  # Images are converted for the shared window
+    # Held as the map's even when loaded from another scene, since these globals outlive it
+
+    # Load and scale images
+    original_map = assets.image("assets/pixel_philippines_map.png", owner='map')
+    star_img = assets.image("assets/star.png", owner='map')
 
-# Load sounds
-click_sound = pygame.mixer.Sound("audio/click.wav")
-ambient_sound = pygame.mixer.Sound("audio/islamapost.mp3")
-ambient_sound.play(-1)  # Loop ambient sound
+    # Load sounds
+    click_sound = assets.sound("audio/click.wav", owner='map')
+    ambient_sound = assets.sound("audio/islamapost.mp3", owner='map')
 
-# Load location data
-try:
-    with open("philippines_data.json", "r") as f:
-        locations = json.load(f)
+    # Load location data; without it there is no map, so errors go to whoever asked for it
+    locations = assets.json("philippines_data.json", owner='map')
     print("Loaded locations:", locations)
     if not locations:
-        raise ValueError("Empty JSON data")
-except (json.JSONDecodeError, ValueError, FileNotFoundError) as e:
-    print(f"Error loading locations: {e}")
-    sys.exit(1)
-
-# Fonts
-try:
-    main_font = pygame.font.Font("font/pixel_font.ttf", 18)
-    small_font = pygame.font.Font("font/pixel_font.ttf", 14)
-    title_font = pygame.font.Font("font/pixel_font.ttf", 24)
-    instruction_font = pygame.font.Font("font/pixel_font.ttf", 8)
-except:
-    print("Custom font not found. Using default font.")
-    main_font = pygame.font.Font(None, 18)
-    small_font = pygame.font.Font(None, 14)
-    title_font = pygame.font.Font(None, 24)
-    instruction_font = pygame.font.Font(None, 14)
+        raise ValueError("Empty JSON data in philippines_data.json")
+
+    # Fonts
+    try:
+        main_font = assets.font("font/pixel_font.ttf", 18, owner='map')
+        small_font = assets.font("font/pixel_font.ttf", 14, owner='map')
+        title_font = assets.font("font/pixel_font.ttf", 24, owner='map')
+        instruction_font = assets.font("font/pixel_font.ttf", 8, owner='map')
+    except (OSError, pygame.error):
+        print("Custom font not found. Using default font.")
+        main_font = pygame.font.Font(None, 18)
+        small_font = pygame.font.Font(None, 14)
+        title_font = pygame.font.Font(None, 24)
+        instruction_font = pygame.font.Font(None, 14)
+    assets_loaded = True
+
+def forget_assets():
+    """Load again next time, the asset manager having dropped everything (on Runtime.shutdown())"""
+    global assets_loaded
+    assets_loaded = False
+
+assets.on_clear(forget_assets)
 
 class Particle:
     def __init__(self, pos, color):
@@ -183,7 +209,7 @@ class MapClass:
         self.fade_speed = 5
         self.button_hover = False
         self.button_rect = None
-        self.restart_sound = False
+        self.manager = None  # Set by MapScene, starts the mini-games
 
     def get_darkness(self):
         if 6 <= self.time < 18:
@@ -209,10 +235,6 @@ class MapClass:
             self.fade_alpha = min(255, self.fade_alpha + self.fade_speed)
             if self.fade_alpha >= 255:
                 self.start_mini_game(self.selected_location)
-        
-        if self.restart_sound:
-            ambient_sound.play(-1)
-            self.restart_sound = False
 
     def draw(self, screen):
         screen_size = Vector2(screen.get_size())
@@ -276,18 +298,12 @@ class MapClass:
         return map_pos, map_size
 
     def start_mini_game(self, location):
-        ambient_sound.stop()
-        
-        if location.lower() == 'manila':
-            from storyscreen_intramuros import OpeningSequence
-            sequence = OpeningSequence()
-            sequence.run()
-            self.restart_sound = True
-        elif location.lower() == 'ifugao':
-            import BANAUE
-            BANAUE.main()
-            self.restart_sound = True
+        # Story mini-games cover the map and pop back to it when they finish
+        scenes = STORY_SCENES.get(location.lower())
+        if scenes:
+            self.manager.push(scenes[0])
         else:
+            ambient_sound.stop()
             self.mini_game = MiniGame(location, self.locations[location])
         
         self.current_state = 'MAP'
@@ -414,6 +430,7 @@ class MapClass:
                 if clicked_location:
                     click_sound.play()
                     self.selected_location = clicked_location
+                    self.prefetch(clicked_location)
                     for _ in range(20):
                         self.particles.append(Particle(event.pos, RED))
             elif event.button == 4:
@@ -437,6 +454,14 @@ class MapClass:
             elif event.key == pygame.K_SPACE:
                 self.show_all_names = not self.show_all_names
 
+    def prefetch(self, location):
+        # The info bubble is up, so load the scene its button would start; other locations free it
+        scenes = STORY_SCENES.get(location.lower())
+        if scenes:
+            prefetcher.prefetch(scenes)
+        else:
+            prefetcher.cancel()
+
     def check_click(self, pos, map_pos, map_size):
         for name, data in self.locations.items():
             pixel_pos = map_pos + Vector2(data['x'] * map_size.x, data['y'] * map_size.y)
@@ -444,44 +469,71 @@ class MapClass:
                 return name
         return None
 
-def main():
-    if not locations:
-        print("No valid location data. Exiting.")
-        return
+class MapScene(BaseScene):
+    """The map as a scene: story mini-games are pushed on top and the map resumes when they pop"""
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        load_assets(self.runtime)
+        self.map = MapClass(original_map, locations)
+        self.profiler = FrameProfiler('map')
+        self.map_pos = self.map_size = None
+
+    def enter(self):
+        self.map.manager = self.manager
+        self.runtime.set_caption("Philippine Map")
+        if not ambient_sound.get_num_channels():
+            ambient_sound.play(-1)  # Loop ambient sound
+
+    def pause(self):
+        ambient_sound.stop()
 
-    clock = pygame.time.Clock()
-    map_instance = MapClass(original_map, locations)
+    def resume(self):
+        # Back from a mini-game, fade the map in again
+        self.map.fading_out = False
+        self.map.fading_in = True
+        self.map.fade_alpha = 255
+        self.runtime.set_caption("Philippine Map")
+        prefetcher.cancel()  # Free whatever the mini-game didn't use
+        ambient_sound.play(-1)
 
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
-        
+    def exit(self):
+        ambient_sound.stop()
+        self.map.manager = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.manager.quit()
+        elif self.map.mini_game:
+            if self.map.mini_game.handle_event(event):
+                self.map.mini_game = None
+                ambient_sound.play(-1)  # Restart ambient sound when returning to map
+        elif self.map_pos is not None:
+            self.map.handle_event(event, self.map_pos, self.map_size)
+
+    def update(self, dt):
+        prefetcher.update()
+        if not self.map.mini_game:
+            self.map.update(dt)
+
+    def draw(self, screen):
         screen.fill(SEA_COLOR)
-        
-        if map_instance.mini_game:
-            map_instance.mini_game.draw(screen)
+        if self.map.mini_game:
+            self.map.mini_game.draw(screen)
         else:
-            map_instance.update(dt)
-            map_pos, map_size = map_instance.draw(screen)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                ambient_sound.stop()
-                running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                ambient_sound.stop()
-                running = False
-            elif map_instance.mini_game:
-                if map_instance.mini_game.handle_event(event):
-                    map_instance.mini_game = None
-                    ambient_sound.play(-1)  # Restart ambient sound when returning to map
-            else:
-                map_instance.handle_event(event, map_pos, map_size)
+            self.map_pos, self.map_size = self.map.draw(screen)
 
-        pygame.display.flip()
+register('map', MapScene, preload=load_assets)
+
+def main():
+    runtime = get_runtime(caption="Philippine Map")
+    load_assets(runtime)
+    if not locations:
+        print("No valid location data. Exiting.")
+        return
 
-    pygame.quit()
+    SceneManager(runtime).run(MapScene(runtime))
+    runtime.shutdown()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiling.run('map', main)
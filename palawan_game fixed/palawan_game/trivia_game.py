@@ -16,16 +16,18 @@
 
 import pygame
 import random
-import json
 import os
+import sys
 import textwrap
 
 # Initialize paths
 GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(GAME_DIR, '..', '..'))  # Repo root, for the shared frame profiler and runtime
 
-# Initialize Pygame and its mixer
-pygame.init()
-pygame.mixer.init()
+from frame_profiler import FrameProfiler
+from runtime import get_runtime
+from asset_manager import assets
+import profiling
 
 # Game constants
 WINDOW_WIDTH = 1280
@@ -79,7 +81,7 @@ class GameAudio:
                     continue
                     
                 try:
-                    sound = pygame.mixer.Sound(full_path)
+                    sound = assets.sound(full_path)
                     if audio_type == 'background':
                         self.background_music = sound
                         sound.set_volume(0.3)
@@ -181,18 +183,21 @@ class TextBox:
             screen.blit(text_surface, text_rect)
 
 class TriviaGame:
-    def __init__(self):
-        pygame.display.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Palawan Trivia Game")
-        self.clock = pygame.time.Clock()
+    def __init__(self, runtime=None):
+        # Shared window, clock and mixer
+        self.runtime = runtime or get_runtime(size=(WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("Palawan Trivia Game")
+        self.clock = self.runtime.clock
+        self.profiler = FrameProfiler('trivia')
+        assets.owner = 'trivia'  # Runs its own loop, so nothing else sets it
 
         # Load fonts
         try:
             font_path = os.path.join(GAME_DIR, 'assets/fonts/pixel_font.ttf')
-            self.font = pygame.font.Font(font_path, 28)
-            self.score_font = pygame.font.Font(font_path, 22)
-            self.instructions_font = pygame.font.Font(font_path, 18)
+            self.font = assets.font(font_path, 28)
+            self.score_font = assets.font(font_path, 22)
+            self.instructions_font = assets.font(font_path, 18)
             self.instructions_text_box = TextBox(self.instructions_font, 600)
         except pygame.error as e:
             print(f"Error loading font: {e}")
@@ -208,7 +213,7 @@ class TriviaGame:
         self.total_score = 0
         self.answered_questions = 0
         self.click_positions = []
-        self.image_cache = {}
+        self.image_cache = {}  # Path -> surface at the size it is drawn, held in the asset manager
         self.game_over = False
         self.audio = GameAudio()
         self.last_background = None
@@ -220,8 +225,7 @@ class TriviaGame:
             if not os.path.exists(json_path):
                 raise FileNotFoundError(f"Questions file not found: {json_path}")
                 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = assets.json(json_path)
                 
             for q_data in data['ordered_questions']:
                 alt = random.choice(q_data['alternatives'])
@@ -271,14 +275,9 @@ class TriviaGame:
                 print(f"Image not found: {full_path}")
                 return None
 
-            image = pygame.image.load(full_path).convert_alpha()  # Use convert_alpha for all images
             if size:
-                try:
-                    image = pygame.transform.scale(image, size)
-                except pygame.error as e:
-                    print(f"Error scaling image: {e}")
-                    return None
-            return image
+                return assets.scaled_image(full_path, size)
+            return assets.image(full_path)
         except pygame.error as e:
             print(f"Error loading image {path}: {e}")
             return None
@@ -476,6 +475,7 @@ class TriviaGame:
                     if event.type == pygame.QUIT:
                         running = False
                         break
+                self.profiler.lap('events')
 
                 self.screen.fill(WHITE)
 
@@ -502,8 +502,8 @@ class TriviaGame:
                             running = False
                             break
 
-                    pygame.display.flip()
-                    self.clock.tick(FPS)
+                    self.profiler.flip(self.screen)
+                    self.profiler.tick(self.clock, FPS)
                     continue
 
                 # Main game loop
@@ -536,8 +536,8 @@ class TriviaGame:
                     self.instructions_text_box = TextBox(self.instructions_font, 600)
                     self.draw_text(instruction_text, (WINDOW_WIDTH // 2, WINDOW_HEIGHT - 20), True, is_instruction=True)
 
-                pygame.display.flip()
-                self.clock.tick(FPS)
+                self.profiler.flip(self.screen)
+                self.profiler.tick(self.clock, FPS)
 
             except pygame.error or Exception as e:
                 print(f"Error in game loop: {e}")
@@ -549,7 +549,7 @@ class TriviaGame:
         """Clean up resources before exiting."""
         try:
             self.audio.stop_background()
-            pygame.quit()
+            self.runtime.shutdown()
         except Exception as e:
             print(f"Error during cleanup: {e}")
 
@@ -563,4 +563,4 @@ def main():
         pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiling.run('trivia', main)
\ No newline at end of file
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import pygame
+import scene_manager
+from asset_manager import assets, asset_key
+
+PREFETCH_BUDGET = 96 * 1024 * 1024  # Bytes of assets held for a scene that hasn't started yet
+PREFETCH_OWNER = 'prefetch'  # References the prefetcher holds in the asset manager
+PREFETCH_FRAME_TIME = 0.004  # Seconds per frame update() may spend converting what the thread decoded
+
+def decoded_bytes(data, path):
+    if isinstance(data, pygame.Surface):
+        return data.get_pitch() * data.get_height()
+    if isinstance(data, bytes):
+        return len(data)
+    return os.path.getsize(path)
+
+class Prefetcher:
+    """Loads the assets of the scene the player will probably start next, reading them on a background thread.
+
+    prefetch(names) looks up the manifests those scenes registered with
+    scene_manager.register(..., assets=...), importing their modules on the
+    calling thread, then starts a thread that only reads and decodes the
+    files. update(), called every frame by the scene that asked, loads what
+    has been decoded into the shared asset manager on the main thread, where
+    images are converted for the display, holding a reference to each under
+    the 'prefetch' owner. Asking for another target cancels the current one
+    and releases its references, so only one target's assets are pinned, and
+    never more than max_bytes of them; the rest are left for the scene to
+    load itself. Scenes just acquire their assets as usual and find them
+    already cached, or at least already decoded.
+    """
+    def __init__(self, max_bytes=PREFETCH_BUDGET):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.target = None
+        self.generation = 0  # Bumped on cancel, so a running load knows its results are unwanted
+        self.thread = None
+        self.ready = []  # Manifest entries decoded by the thread, waiting for update() to load them
+        self.total = 0
+        self.processed = 0
+
+    def prefetch(self, names):
+        """Start loading the assets of the named scenes, unless they are already the target"""
+        names = tuple(names)
+        if names == self.target:
+            return
+        self.cancel()
+        self.target = names
+        try:
+            manifest = [tuple(entry) for name in names for entry in scene_manager.scene_asset_list(name)]
+        except Exception as e:
+            print(f"Warning: Could not prefetch {', '.join(names)}: {e}")
+            return
+        manifest = list({asset_key(*entry): entry for entry in manifest}.values())
+        self.total = len(manifest)
+        self.thread = threading.Thread(target=self.decode_all, args=(self.generation, manifest),
+                                       name='prefetch', daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """Stop loading and release everything prefetched so far; it stays cached until evicted"""
+        with self.lock:
+            self.generation += 1
+            self.total = self.processed = 0
+            self.ready.clear()
+            assets.drop_decoded()
+            assets.release(PREFETCH_OWNER)
+        self.target = None
+        self.thread = None
+
+    @property
+    def done(self):
+        return (self.thread is None or not self.thread.is_alive()) and not self.ready
+
+    @property
+    def bytes(self):
+        return assets.resident(PREFETCH_OWNER)
+
+    def progress(self):
+        """Fraction of the current target's manifest that has been dealt with"""
+        with self.lock:
+            if self.total:
+                return self.processed / self.total
+        return 1.0 if self.done else 0.0
+
+    def decode_all(self, generation, manifest):
+        decoded = 0
+        for entry in manifest:
+            if generation != self.generation:
+                return  # Cancelled: the player picked another marker
+            kind, path, *args = entry
+            data = None
+            wanted = assets.find(kind, path, *args) is not None  # Cached already: update() only takes a reference
+            if not wanted and decoded < self.max_bytes:
+                try:
+                    data = assets.decode(kind, path)
+                    decoded += decoded_bytes(data, path)
+                    wanted = True
+                except (pygame.error, OSError, ValueError):
+                    pass  # Missing or unreadable: the scene reports it when it loads it itself
+            with self.lock:
+                if generation != self.generation:
+                    return
+                if data is not None:
+                    assets.hold_decoded(kind, path, data)
+                self.ready.append((entry, wanted))
+
+    def update(self):
+        """Load what the thread has decoded, for a few milliseconds at most; call once a frame"""
+        deadline = time.perf_counter() + PREFETCH_FRAME_TIME
+        while self.ready and time.perf_counter() < deadline:
+            with self.lock:
+                (kind, path, *args), wanted = self.ready.pop(0)
+            if wanted and self.bytes < self.max_bytes:
+                try:
+                    assets.acquire(kind, path, *args, owner=PREFETCH_OWNER)
+                except (pygame.error, OSError, ValueError):
+                    pass
+            self.processed += 1
+        if self.target is not None and self.done:
+            assets.drop_decoded()  # Every entry made from them is loaded
+
+prefetcher = Prefetcher()
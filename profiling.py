@@ -0,0 +1,88 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_ENV = 'ISLA_PROFILE'  # 'cprofile' or 'sample' to profile an entry point
+PROFILE_DIR_ENV = 'ISLA_PROFILE_DIR'  # Where profiles go, profiles/ in the repo root by default
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+
+class StackSampler:
+    """Low-overhead sampling profiler for one thread.
+
+    A daemon thread grabs the target thread's stack every interval and counts
+    it as a collapsed stack ('file:function:line;...' outermost first), the
+    format flamegraph.pl and speedscope read.
+    """
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+def profile_path(scene, extension):
+    folder = os.environ.get(PROFILE_DIR_ENV) or PROFILE_DIR
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{scene}-{time.strftime('%Y%m%d-%H%M%S')}{extension}")
+
+def run(scene, main, *args, **kwargs):
+    """Call main(*args, **kwargs), under the profiler named by ISLA_PROFILE if it is set.
+
+    The profile is written when main returns or the scene exits, to
+    <scene>-<timestamp>.prof for cprofile (open with pstats or snakeviz) or
+    <scene>-<timestamp>.collapsed for sample.
+    """
+    mode = os.environ.get(PROFILE_ENV, '').strip().lower()
+    if not mode:
+        return main(*args, **kwargs)
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return main(*args, **kwargs)
+        finally:
+            profiler.disable()
+            path = profile_path(scene, '.prof')
+            profiler.dump_stats(path)
+            print(f"cProfile output written to {path}")
+    elif mode == 'sample':
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            return main(*args, **kwargs)
+        finally:
+            sampler.stop()
+            path = profile_path(scene, '.collapsed')
+            sampler.save(path)
+            print(f"{sum(sampler.stacks.values())} stack samples written to {path}")
+    else:
+        print(f"Unknown {PROFILE_ENV}={mode!r}, expected 'cprofile' or 'sample'; running without profiling")
+        return main(*args, **kwargs)
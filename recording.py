@@ -0,0 +1,93 @@
+import json
+import zlib
+import pygame
+
+# Keys a round reacts to, one bit each in a recorded tick
+RECORDED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_LSHIFT, pygame.K_f)
+MAGIC = b'ISLAREC1\n'
+
+class KeyState(dict):
+    """Indexable pressed-key state, like pygame.key.get_pressed(), for scripted input"""
+    def __init__(self, pressed=()):
+        super().__init__(dict.fromkeys(RECORDED_KEYS, False))  # Known keys resolve without __missing__
+        self.update(dict.fromkeys(pressed, True))
+
+    def __missing__(self, key):
+        return False
+
+# One shared, read-only KeyState per possible bitmask
+MASK_STATES = [KeyState(key for bit, key in enumerate(RECORDED_KEYS) if mask >> bit & 1)
+               for mask in range(1 << len(RECORDED_KEYS))]
+
+def keys_to_mask(keys):
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+class InputRecorder:
+    """Player controller that passes another input source through and records one key bitmask per tick.
+
+    With no source it reads the keyboard. The game sees exactly the recorded
+    keys, so a replay of the same seed reproduces the round.
+    """
+    def __init__(self, source=None, **header):
+        self.source = source
+        self.header = header  # Seed and game options needed to rebuild the round
+        self.masks = bytearray()
+        self.slow_ticks = []
+        self.keys = MASK_STATES[0]
+
+    def __len__(self):
+        return len(self.masks)
+
+    def __call__(self):
+        return self.keys
+
+    def step(self):
+        """Sample the source for the next tick"""
+        if hasattr(self.source, 'step'):
+            self.source.step()
+        keys = self.source() if self.source else pygame.key.get_pressed()
+        mask = keys_to_mask(keys)
+        self.masks.append(mask)
+        self.keys = MASK_STATES[mask]
+
+    def mark_slow(self):
+        """Note that the frame around the current tick ran long"""
+        self.slow_ticks.append(len(self.masks))
+
+    def save(self, path, **result):
+        """Write the header, the outcome and the zlib-packed bitmasks"""
+        header = dict(self.header, ticks=len(self.masks), slow_ticks=self.slow_ticks, **result)
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode() + b'\n')
+            f.write(zlib.compress(bytes(self.masks), 9))
+
+class InputReplay:
+    """Player controller that plays back a recording made by InputRecorder"""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{path} is not an input recording")
+            self.header = json.loads(f.readline())
+            self.masks = zlib.decompress(f.read())
+        self.tick = 0
+        self.keys = MASK_STATES[0]
+
+    def __len__(self):
+        return len(self.masks)
+
+    def __call__(self):
+        return self.keys
+
+    def finished(self):
+        return self.tick >= len(self.masks)
+
+    def step(self):
+        """Advance to the next recorded tick, releasing every key once the recording runs out"""
+        mask = self.masks[self.tick] if self.tick < len(self.masks) else 0
+        self.tick += 1
+        self.keys = MASK_STATES[mask]
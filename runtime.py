@@ -0,0 +1,63 @@
+import os
+import pygame
+from asset_manager import assets
+
+SCREEN_SIZE = (1280, 720)
+# One mixer configuration for every scene, pygame's own defaults with the buffer spelled out
+MIXER_SETTINGS = {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 512}
+
+class Runtime:
+    """The one window, clock and audio device every scene draws and plays through.
+
+    Scenes take a runtime instead of calling pygame.init(), mixer.init() or
+    display.set_mode() themselves, so switching scenes never re-creates the
+    window or reopens the audio device.
+    """
+    def __init__(self, size=SCREEN_SIZE, caption="ISLA", vsync=False, headless=False, audio=True):
+        self.headless = headless
+        if headless:
+            # No window, no audio: only what the simulation needs
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            audio = False
+        pygame.display.init()
+        pygame.font.init()
+
+        self.audio = False
+        if audio:
+            try:
+                pygame.mixer.init(**MIXER_SETTINGS)
+                self.audio = True
+            except pygame.error as e:
+                print(f"Couldn't open the audio device: {e}")
+
+        if vsync and not headless:
+            # Vsync needs a renderer-backed window
+            self.screen = pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode(size)
+        self.vsync = vsync and not headless
+        self.set_caption(caption)
+        self.clock = pygame.time.Clock()
+
+    @property
+    def size(self):
+        return self.screen.get_size()
+
+    def set_caption(self, caption):
+        pygame.display.set_caption(caption)
+
+    def shutdown(self):
+        global current
+        assets.clear()  # Surfaces, sounds and fonts are invalid once pygame quits
+        pygame.quit()
+        if current is self:
+            current = None
+
+current = None  # The shared runtime once something has asked for it
+
+def get_runtime(**kwargs):
+    """The shared runtime, created with kwargs the first time it is asked for"""
+    global current
+    if current is None:
+        current = Runtime(**kwargs)
+    return current
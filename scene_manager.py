@@ -0,0 +1,229 @@
+import importlib
+import pygame
+from asset_manager import assets, SHARED
+from frame_profiler import FrameProfiler
+from runtime import get_runtime
+
+# Scene name -> module that registers it, imported the first time the scene is asked for
+SCENE_MODULES = {
+    'launcher': 'Game Launcher',
+    'map': 'map',
+    'banaue': 'BANAUE',
+    'banaue_story': 'BANAUE',
+    'banaue_game': 'BANAUE',
+    'intramuros_story': 'storyscreen_intramuros',
+    'intramuros': 'intramuros',
+    'cebu_story': 'NarrativeScreen_Cebu',
+}
+
+scene_factories = {}  # Scene name -> callable that builds it
+scene_preloaders = {}  # Scene name -> callable(runtime) that loads its assets ahead of time
+scene_assets = {}  # Scene name -> [(kind, path, *args)] the scene loads, for prefetch
+
+def register(name, factory, preload=None, assets=None):
+    """Make a scene reachable by name, so scenes can switch to each other without importing each other"""
+    scene_factories[name] = factory
+    if preload is not None:
+        scene_preloaders[name] = preload
+    if assets is not None:
+        scene_assets[name] = assets
+    if isinstance(factory, type) and factory.name is None:
+        factory.name = name  # Instances created directly are still found by back_to
+    return factory
+
+def import_scene(name):
+    if name not in scene_factories:
+        if name not in SCENE_MODULES:
+            raise KeyError(f"No scene registered as {name!r}")
+        importlib.import_module(SCENE_MODULES[name])
+
+def preload_scene(name, runtime=None):
+    """Load a scene's assets now, so switching to it later doesn't stall; does nothing for scenes without a preloader"""
+    import_scene(name)
+    preload = scene_preloaders.get(name)
+    if preload is not None:
+        preload(runtime or get_runtime())
+
+def scene_asset_list(name):
+    """The images, sounds and fonts a scene declared, importing its module if needed"""
+    import_scene(name)
+    return list(scene_assets.get(name, ()))
+
+def create_scene(name, *args, **kwargs):
+    import_scene(name)
+    scene = scene_factories[name](*args, **kwargs)
+    scene.name = name
+    return scene
+
+class BaseScene:
+    """One screen of the game, run by a SceneManager.
+
+    The manager calls enter() when the scene becomes active, then every frame
+    handle_event() for each event, update(dt) and draw(screen). pause() and
+    resume() bracket the time another scene is pushed on top of it, and
+    exit() runs once when it leaves the stack.
+    """
+    name = None
+    fps = 60  # Frame cap while this scene is on top
+    runtime = None  # Window, clock and mixer shared with every other scene
+    manager = None
+    profiler = None  # Uses the manager's when a scene has none of its own
+
+    def __new__(cls, *args, **kwargs):
+        # What the constructor loads belongs to this scene, however it was created
+        assets.owner = cls.name or SHARED
+        return super().__new__(cls)
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, screen):
+        pass
+
+    def run(self):
+        """Run this scene, and whatever it switches to, in a manager of its own"""
+        SceneManager(self.runtime).run(self)
+
+class SceneManager:
+    """Single main loop over a stack of scenes.
+
+    push() covers the current scene with a new one, pop() returns to the one
+    below, replace() swaps the top scene. Transitions are queued and applied
+    between frames, so a scene never leaves in the middle of its own update.
+    Scenes can be passed as objects or as registered names; scenes created
+    by name are given the manager's runtime. Assets a scene acquires are
+    charged to its name in the shared asset manager and released when it
+    leaves the stack.
+    """
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.clock = self.runtime.clock
+        self.profiler = FrameProfiler('scenes')
+        self.stack = []
+        self.pending = []
+        self.fade = None  # [alpha, speed, callback] while fading out to black
+
+    @property
+    def current(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene, *args, **kwargs):
+        self.pending.append(('push', scene, args, kwargs))
+
+    def pop(self):
+        self.pending.append(('pop', None, (), {}))
+
+    def replace(self, scene, *args, **kwargs):
+        self.pending.append(('replace', scene, args, kwargs))
+
+    def back_to(self, name, *args, **kwargs):
+        """Pop down to the scene registered as name, or replace the current scene with a new one"""
+        self.pending.append(('back_to', name, args, kwargs))
+
+    def quit(self):
+        self.pending.append(('quit', None, (), {}))
+
+    def fade_out(self, callback, speed=5):
+        """Draw the current scene under a darkening overlay, without input or updates, then call callback"""
+        self.fade = [0, speed, callback]
+
+    def activate(self, scene, args, kwargs):
+        if isinstance(scene, str):
+            assets.owner = scene  # What the constructor loads belongs to the new scene
+            scene = create_scene(scene, *args, runtime=self.runtime, **kwargs)
+        scene.manager = self
+        self.stack.append(scene)
+        assets.owner = scene.name or SHARED
+        scene.enter()
+
+    def leave(self):
+        scene = self.stack.pop()
+        scene.exit()
+        scene.manager = None
+        if scene.name is not None and all(below.name != scene.name for below in self.stack):
+            assets.release(scene.name)
+        assets.owner = (self.current.name or SHARED) if self.stack else SHARED
+
+    def apply_transitions(self):
+        while self.pending:
+            action, scene, args, kwargs = self.pending.pop(0)
+            self.fade = None
+            if action == 'push':
+                if self.stack:
+                    self.current.pause()
+                self.activate(scene, args, kwargs)
+            elif action == 'pop':
+                self.leave()
+                if self.stack:
+                    self.current.resume()
+            elif action == 'replace':
+                if self.stack:
+                    self.leave()
+                self.activate(scene, args, kwargs)
+            elif action == 'back_to':
+                if any(below.name == scene for below in self.stack[:-1]):
+                    while self.current.name != scene:
+                        self.leave()
+                    self.current.resume()
+                else:
+                    if self.stack:
+                        self.leave()
+                    self.activate(scene, args, kwargs)
+            elif action == 'quit':
+                while self.stack:
+                    self.leave()
+                self.pending.clear()
+
+    def draw_fade(self):
+        alpha, speed, callback = self.fade
+        overlay = pygame.Surface(self.screen.get_size())
+        overlay.set_alpha(alpha)
+        self.screen.blit(overlay, (0, 0))
+        self.fade[0] += speed
+        if self.fade[0] >= 255:
+            self.fade = None
+            callback()
+
+    def run(self, scene=None, *args, **kwargs):
+        """Run until the stack is empty"""
+        if scene is not None:
+            self.push(scene, *args, **kwargs)
+        self.apply_transitions()
+        while self.stack:
+            scene = self.current
+            assets.owner = scene.name or SHARED
+            profiler = scene.profiler or self.profiler
+            dt = profiler.tick(self.clock, scene.fps) / 1000
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                elif self.fade is None:
+                    scene.handle_event(event)
+            profiler.lap('events')
+
+            if self.fade is None:
+                scene.update(dt)
+            profiler.lap('update')
+
+            scene.draw(self.screen)
+            if self.fade is not None:
+                self.draw_fade()
+            profiler.flip(self.screen)
+            self.apply_transitions()
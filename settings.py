@@ -11,4 +11,12 @@ BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
-BRATGREEN = (138, 206, 0)
\ No newline at end of file
+BRATGREEN = (138, 206, 0)
+
+# Draw layers (lowest first)
+LAYERS = {
+    'ground': 0,
+    'collectibles': 1,
+    'actors': 2,
+    'overlay': 3
+}
\ No newline at end of file
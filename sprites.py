@@ -1,9 +1,56 @@
 import pygame.draw
 import random
 import math
+import copy
 from settings import *
+from asset_manager import assets
+
+# Shared random source for everything in a round, reseeded per round by the Game so rounds replay exactly
+rng = random.Random()
+
+class ImageCache:
+    """Sprite images and sheets in the shared asset manager, one reference each however many sprites use them.
+
+    Scaled variants take no reference, so the manager's LRU evicts them like
+    any other unused entry; release() gives the references back when a round
+    is torn down. A reference the owner's scene already gave back is taken
+    again on the next use.
+    """
+    def __init__(self):
+        self.held = {}  # (kind, path, *args) -> owner holding its one reference
+
+    def hold(self, kind, path, *args):
+        key = (kind, path) + args
+        owner = self.held.get(key)
+        asset = assets.find(kind, path, *args) if owner is not None and assets.holds(owner, kind, path, *args) else None
+        if asset is None:
+            asset = assets.acquire(kind, path, *args)
+            self.held[key] = assets.owner
+        return asset
+
+    def load(self, path):
+        """Load and convert an image once per path"""
+        return self.hold('image', path)
+
+    def load_scaled(self, path, size):
+        """Return the image at path scaled to size, reusing earlier scales"""
+        self.load(path)  # Every variant is scaled from the cached source
+        return assets.get('scaled_image', path, tuple(size))
+
+    def frames(self, path, num_frames, scale):
+        """Right- and left-facing frames of a sprite sheet"""
+        return self.hold('spritesheet', path, num_frames, scale)
+
+    def release(self):
+        for (kind, path, *args), owner in self.held.items():
+            assets.release(owner, kind, path, *args)
+        self.held.clear()
+
+image_cache = ImageCache()
 
 class Player(pygame.sprite.Sprite):
+    draw_layer = LAYERS['actors']
+
     def __init__(self, pos, groups, collisions, collectibles):
         super().__init__(groups)
         # Draw player sprites
@@ -37,7 +84,13 @@ class Player(pygame.sprite.Sprite):
         self.collision_sprites = collisions
         self.collectible_sprites = collectibles
 
+        # Key state source, the keyboard unless a bot or replay is driving
+        self.controller = None
+
     def update_animation_state(self):
+        if self.animation.frozen:
+            return
+
         # Determine which animation to play based on movement
         if self.direction.magnitude() == 0:
             self.animation.set_animation('idle', 5)
@@ -50,9 +103,15 @@ class Player(pygame.sprite.Sprite):
         elif self.direction.x < 0:
             self.animation.facing_right = False
 
+    def get_keys(self):
+        """Pressed-key state from the controller if one is set, else the keyboard"""
+        if self.controller is not None:
+            return self.controller()
+        return pygame.key.get_pressed()
+
     # Movement input
     def input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.get_keys()
         self.direction.x = int(keys[pygame.K_d]) - int(keys[pygame.K_a])
         self.direction.y = int(keys[pygame.K_s]) - int(keys[pygame.K_w])
         self.direction = self.direction.normalize() if self.direction else self.direction
@@ -62,21 +121,26 @@ class Player(pygame.sprite.Sprite):
         # Calculate the movement
         movement = self.direction * self.speed * dt
 
+        # One index query covering both axis steps
+        moved = self.hitbox_rect.copy()
+        moved.center = (round(self.pos.x + movement.x), round(self.pos.y + movement.y))
+        candidates = collision_candidates(self.collision_sprites, moved.union(self.hitbox_rect))
+
         # Move horizontally
         self.pos.x += movement.x
         self.hitbox_rect.centerx = round(self.pos.x)
-        self.collision('horizontal')
+        self.collision('horizontal', candidates)
 
         # Move vertically
         self.pos.y += movement.y
         self.hitbox_rect.centery = round(self.pos.y)
-        self.collision('vertical')
+        self.collision('vertical', candidates)
 
         # Update the main rect to follow the hitbox
         self.rect.center = self.hitbox_rect.center
 
     def sprint(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.get_keys()
 
         # Check for sprint input and sufficient stamina
         if keys[pygame.K_LSHIFT] and self.current_stamina > 0:
@@ -96,8 +160,10 @@ class Player(pygame.sprite.Sprite):
                     self.current_stamina = min(self.stamina, self.current_stamina + self.stamina_regen_rate * dt)
 
     # Player collision detection
-    def collision(self, direction):
-        for sprite in self.collision_sprites:
+    def collision(self, direction, candidates=None):
+        if candidates is None:
+            candidates = collision_candidates(self.collision_sprites, self.hitbox_rect)
+        for sprite in candidates:
             if sprite.rect.colliderect(self.hitbox_rect):
                 if direction == 'horizontal':
                     if self.direction.x > 0:  # Moving right
@@ -145,6 +211,8 @@ class Player(pygame.sprite.Sprite):
         return self.hitbox_rect.center
 
 class Ghost(pygame.sprite.Sprite):
+    draw_layer = LAYERS['actors']
+
     def __init__(self, pos, groups, player, collisions):
         super().__init__(groups)
         # Draw ghost sprite
@@ -163,6 +231,7 @@ class Ghost(pygame.sprite.Sprite):
         self.collision_sprites = collisions
         self.can_see_player = False
         self.win_zone_rect = None
+        self.flow_field = None  # Shared pursuit field, set by the Game
 
         # Add movement permission flag
         self.can_move = False
@@ -173,12 +242,12 @@ class Ghost(pygame.sprite.Sprite):
         self.max_chase_distance = 200
 
         # Wandering behavior
-        self.wander_direction = pygame.math.Vector2(random.randint(0,1), random.randint(0,1))
+        self.wander_direction = pygame.math.Vector2(rng.randint(0,1), rng.randint(0,1))
         self.wander_timer = 0
-        self.wander_interval = random.randint(2, 3)
+        self.wander_interval = rng.randint(2, 3)
         self.is_paused = False
         self.pause_timer = 0
-        self.pause_duration = random.randint(0, 2)
+        self.pause_duration = rng.randint(0, 2)
         self.pause_chance = 0.1
         self.min_pause_duration = 1  # Minimum pause duration in seconds
         self.max_pause_duration = 3  # Maximum pause duration in seconds
@@ -189,43 +258,33 @@ class Ghost(pygame.sprite.Sprite):
     def stop_moving(self):
         self.can_move = False
 
-    def check_line_of_sight(self):
+    def check_line_of_sight(self, distance=None):
         # Get the start (ghost) and end (player) positions
-        start = pygame.math.Vector2(self.pos)
-        end = pygame.math.Vector2(self.player.rect.center)
-
-        # Calculate distance to player
-        distance = (end - start).length()
+        start = self.pos
+        end = self.player.rect.center
 
         # Only check line of sight if within max chase distance
+        if distance is None:
+            distance = self.get_distance_to_player()
         if distance > self.max_chase_distance:
             self.can_see_player = False
             return False
 
-        ray_dir = (end - start).normalize()
-
-        # Check fewer points along the line (step size of 8 instead of 1)
-        for i in range(0, int(distance), 8):
-            check_pos = start + ray_dir * i
-            check_rect = pygame.Rect(check_pos.x - 1, check_pos.y - 1, 2, 2)
-
-            # Use any() with generator expression instead of list comprehension
-            if any(sprite.rect.colliderect(check_rect) for sprite in self.collision_sprites):
-                self.can_see_player = False
-                return False
-
-        self.can_see_player = True
-        return True
+        if isinstance(self.collision_sprites, CollisionGroup):
+            # Exact grid traversal, cost depends on distance only
+            self.can_see_player = self.collision_sprites.line_of_sight(start, end)
+        else:
+            self.can_see_player = sampled_line_of_sight(self.collision_sprites, start, end)
+        return self.can_see_player
 
     def get_distance_to_player(self):
-        ghost_pos = pygame.math.Vector2(self.pos)
-        player_pos = pygame.math.Vector2(self.player.rect.center)
-        return (player_pos - ghost_pos).length()
+        player_x, player_y = self.player.rect.center
+        return math.hypot(player_x - self.pos.x, player_y - self.pos.y)
 
     def start_pause(self):
         self.is_paused = True
         self.pause_timer = 0
-        self.pause_duration = random.uniform(self.min_pause_duration, self.max_pause_duration)
+        self.pause_duration = rng.uniform(self.min_pause_duration, self.max_pause_duration)
 
     def update_pause(self, dt):
         if self.is_paused:
@@ -244,27 +303,29 @@ class Ghost(pygame.sprite.Sprite):
         self.wander_timer += dt
         if self.wander_timer >= self.wander_interval:
             # Chance to pause when changing direction
-            if random.random() < self.pause_chance:
+            if rng.random() < self.pause_chance:
                 self.start_pause()
                 return
 
             # Change to a random direction
-            angle = random.uniform(0, 2 * math.pi)
+            angle = rng.uniform(0, 2 * math.pi)
             self.wander_direction = pygame.math.Vector2(math.cos(angle), math.sin(angle))
             self.wander_timer = 0
-            self.wander_interval = random.randint(2, 3)  # Randomize next interval
+            self.wander_interval = rng.randint(2, 3)  # Randomize next interval
 
         # Test if next wandering position would enter win zone
-        test_pos = self.pos + self.wander_direction * (self.speed * 0.4) * dt
+        test_pos = self.pos + self.wander_direction * (self.speed * 0.4 * dt)
         test_rect = self.hitbox_rect.copy()
         test_rect.center = test_pos
 
         # Only move if wouldn't enter win zone
         if not (self.win_zone_rect and self.win_zone_rect.colliderect(test_rect)):
-            self.pos += self.wander_direction * (self.speed * 0.4) * dt
+            self.pos = test_pos
 
-    def collision(self, direction):
-        for sprite in self.collision_sprites:
+    def collision(self, direction, candidates=None):
+        if candidates is None:
+            candidates = collision_candidates(self.collision_sprites, self.hitbox_rect)
+        for sprite in candidates:
             if sprite.rect.colliderect(self.hitbox_rect):
                 if direction == 'horizontal':
                     if self.hitbox_rect.right > sprite.rect.left and self.old_hitbox.right <= sprite.rect.left:
@@ -283,8 +344,23 @@ class Ghost(pygame.sprite.Sprite):
         # Method to set the win zone reference
         self.win_zone_rect = win_zone.rect
 
+    def set_flow_field(self, flow_field):
+        self.flow_field = flow_field
+
+    def get_chase_direction(self):
+        """Direction towards the player, following the shared flow field around blocks"""
+        if self.flow_field:
+            flow = self.flow_field.direction_at(self.pos)
+            if flow is not None:
+                return pygame.math.Vector2(flow)
+        # No field, or already in the player's cell: head straight for them
+        return pygame.math.Vector2(self.player.rect.center) - self.pos
+
     def update_animation_state(self, direction=None):
         """Update the ghost's animation based on its state and direction"""
+        if self.animation.frozen:
+            return
+
         # If we're not moving (during pause or at start), use idle
         if self.is_paused or not self.can_move:
             self.animation.set_animation('idle', 5)
@@ -304,9 +380,6 @@ class Ghost(pygame.sprite.Sprite):
         # Store the old position
         self.old_hitbox = self.hitbox_rect.copy()
 
-        # Movement direction for animation
-        movement_direction = pygame.math.Vector2(0, 0)
-
         # Update animation
         self.animation.animate(dt)
 
@@ -315,15 +388,15 @@ class Ghost(pygame.sprite.Sprite):
             self.update_animation_state(self.wander_direction)
         else:
             # Check if we can see the player
-            can_see = self.check_line_of_sight()
             distance = self.get_distance_to_player()
+            can_see = self.check_line_of_sight(distance)
 
             if can_see and self.min_chase_distance <= distance <= self.max_chase_distance:
                 # Reset pause state when chasing
                 self.is_paused = False
 
                 # Chase the player
-                direction = pygame.math.Vector2(self.player.rect.center) - self.pos
+                direction = self.get_chase_direction()
                 if direction.length() > 0:
                     direction = direction.normalize()
                     # Test if next position would be in win zone
@@ -333,60 +406,69 @@ class Ghost(pygame.sprite.Sprite):
                     
                     # Only move if wouldn't enter win zone
                     if not (self.win_zone_rect and self.win_zone_rect.colliderect(test_rect)):
-                        self.pos += direction * self.speed * dt
-                        movement_direction = direction
-                        self.update_animation_state(movement_direction)
+                        self.pos = test_pos
+                        self.update_animation_state(direction)
 
             else:
                 # Wander around if can't see player
                 self.wander(dt)
                 self.update_animation_state(self.wander_direction)
 
-        # Update positions and check collisions
+        # Update positions and check collisions, with one index query covering both axis steps
+        moved = self.hitbox_rect.copy()
+        moved.center = (round(self.pos.x), round(self.pos.y))
+        candidates = collision_candidates(self.collision_sprites, moved.union(self.old_hitbox))
         self.hitbox_rect.centerx = round(self.pos.x)
-        self.collision('horizontal')
+        self.collision('horizontal', candidates)
         self.hitbox_rect.centery = round(self.pos.y)
-        self.collision('vertical')
+        self.collision('vertical', candidates)
         self.rect.center = self.hitbox_rect.center
 
 class Blocks(pygame.sprite.Sprite):
-    def __init__(self, pos, size, groups):
+    draw_layer = LAYERS['ground']
+    static = True  # Never moves once placed
+    bakeable = True  # Image never changes either, so it can be baked into the world layer
+    block_images = {
+        'stone1': "img//env//stone1.png",
+        'stone2': "img//env//stone2.png",
+        'stone3': "img//env//stone3.png",
+        'stone4': "img//env//stone4.png",
+        'stone5': "img//env//stone5.png"
+    }
+
+    def __init__(self, pos, size, groups, image_path=None):
         super().__init__(groups)
-        self.block_images = {
-            'stone1': "img//env//stone1.png",
-            'stone2': "img//env//stone2.png",
-            'stone3': "img//env//stone3.png",
-            'stone4': "img//env//stone4.png",
-            'stone5': "img//env//stone5.png"
-        }
-        selected_image = random.choice(list(self.block_images.values()))
-        self.image = pygame.image.load(selected_image).convert_alpha()
-        if size != (self.image.get_width(), self.image.get_height()):
-            self.image = pygame.transform.scale(self.image, size)
+        selected_image = image_path or rng.choice(list(self.block_images.values()))
+        self.image = image_cache.load_scaled(selected_image, size)
         self.rect = self.image.get_rect(center = pos)
         self.hitbox_rect = self.rect.inflate(-10, -10)
         self.hitbox_rect.center = self.rect.center
 
 class Collectibles(pygame.sprite.Sprite):
-    def __init__(self, pos, groups):
+    draw_layer = LAYERS['collectibles']
+    static = True
+    cosmetic = True  # Update only animates the glow
+
+    # Glow animation frames shared by every collectible, dropped with the round's images by clear_frames()
+    glow_cache = {}  # (surface size, glow_radius, alpha) -> radial glow surface
+    frame_cache = {}  # (image path, alpha) -> glow with the shard drawn on top
+    collectible_images = {
+        'shard1': "img//env//shard1.png",
+        'shard2': "img//env//shard2.png",
+    }
+
+    def __init__(self, pos, groups, image_path=None):
         super().__init__(groups)
-        self.collectible_images = {
-            'shard1': "img//env//shard1.png",
-            'shard2': "img//env//shard2.png",
-        }
-        selected_image = random.choice(list(self.collectible_images.values()))
-        self.base_image = pygame.image.load(selected_image).convert_alpha()
+        self.image_path = image_path or rng.choice(list(self.collectible_images.values()))
+        self.base_image = image_cache.load(self.image_path)
         
         # Create a larger surface for the glow effect
         glow_padding = 20  # Padding for glow effect
-        self.image = pygame.Surface((self.base_image.get_width() + glow_padding*2,
-                                   self.base_image.get_height() + glow_padding*2),
-                                   pygame.SRCALPHA)
+        self.frame_size = (self.base_image.get_width() + glow_padding*2,
+                           self.base_image.get_height() + glow_padding*2)
         
         # Create radial gradient for glow
         self.glow_radius = max(self.base_image.get_width(), self.base_image.get_height()) // 2 + glow_padding
-        self.glow_surface = pygame.Surface((self.image.get_width(), self.image.get_height()), 
-                                         pygame.SRCALPHA)
         
         # Animation parameters
         self.alpha = 0
@@ -395,7 +477,39 @@ class Collectibles(pygame.sprite.Sprite):
         self.max_alpha = 60  # Maximum glow intensity
         
         # Position setup
+        self.image = self.get_frame()
         self.rect = self.image.get_rect(center=pos)
+
+    @classmethod
+    def get_glow(cls, size, glow_radius, alpha):
+        """Return the radial glow for one alpha step, drawing it on first use"""
+        key = (size, glow_radius, alpha)
+        if key not in cls.glow_cache:
+            glow_surface = pygame.Surface(size, pygame.SRCALPHA)
+            for radius in range(glow_radius, 0, -1):
+                ring_alpha = int(max(0, alpha * (1 - radius/glow_radius)))
+                pygame.draw.circle(glow_surface, (255, 247, 140, ring_alpha),
+                                   (size[0]//2, size[1]//2), radius)
+            cls.glow_cache[key] = glow_surface
+        return cls.glow_cache[key]
+
+    @classmethod
+    def clear_frames(cls):
+        cls.glow_cache.clear()
+        cls.frame_cache.clear()
+
+    def get_frame(self):
+        """Return the shared frame for this shard image at the current alpha"""
+        key = (self.image_path, self.alpha)
+        frame = self.frame_cache.get(key)
+        if frame is None:
+            frame = pygame.Surface(self.frame_size, pygame.SRCALPHA)
+            frame.blit(self.get_glow(self.frame_size, self.glow_radius, self.alpha), (0, 0))
+            frame.blit(self.base_image,
+                       (self.frame_size[0]//2 - self.base_image.get_width()//2,
+                        self.frame_size[1]//2 - self.base_image.get_height()//2))
+            self.frame_cache[key] = frame
+        return frame
     
     def update(self, dt):
         # Update glow alpha
@@ -405,22 +519,16 @@ class Collectibles(pygame.sprite.Sprite):
         elif self.alpha <= 0:
             self.alpha_direction = 1
         
-        # Clear the surface
-        self.image.fill((0,0,0,0))
-        
-        # Create radial glow
-        for radius in range(self.glow_radius, 0, -1):
-            alpha = int(max(0, self.alpha * (1 - radius/self.glow_radius)))
-            pygame.draw.circle(self.glow_surface, (255, 247, 140, alpha), 
-                             (self.image.get_width()//2, self.image.get_height()//2), radius)
-        
-        # Apply glow and main image
-        self.image.blit(self.glow_surface, (0, 0))
-        self.image.blit(self.base_image, 
-                       (self.image.get_width()//2 - self.base_image.get_width()//2,
-                        self.image.get_height()//2 - self.base_image.get_height()//2))
+        # Pick the pre-rendered frame for this alpha
+        self.image = self.get_frame()
+
+assets.on_clear(Collectibles.clear_frames)
 
 class WinZone(pygame.sprite.Sprite):
+    draw_layer = LAYERS['ground']
+    static = True
+    bakeable = True
+
     def __init__(self, pos, size, groups):
         super().__init__(groups)
         self.image = pygame.Surface(size)
@@ -430,15 +538,691 @@ class WinZone(pygame.sprite.Sprite):
         self.active = True
 
 class Boundary(pygame.sprite.Sprite):
+    draw_layer = LAYERS['ground']
+    static = True
+    bakeable = True
+
     def __init__(self, pos, size, groups):
         super().__init__(groups)
         self.image = pygame.Surface(size)
         self.image.fill((50, 50, 50))  # Dark gray color for boundaries
         self.rect = self.image.get_rect(topleft=pos)
 
+# Spatial indexing
+class SpatialHash:
+    """Uniform grid that buckets sprites by the cells their rect overlaps"""
+    def __init__(self, cell_size=TILE_SIZE * 2):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}  # Sprite -> cells it was inserted into
+
+    def cell_range(self, rect):
+        """Return the (x0, y0, x1, y1) cell coordinates covered by rect"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, sprite):
+        x0, y0, x1, y1 = self.cell_range(sprite.rect)
+        keys = [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+        for key in keys:
+            self.cells.setdefault(key, []).append(sprite)
+        self.sprite_cells[sprite] = keys
+
+    def remove(self, sprite):
+        for key in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[key]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+    def query(self, rect):
+        """Return the sprites whose rect overlaps rect, without duplicates"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        if x0 == x1 and y0 == y1:  # Common case, one bucket can't hold duplicates
+            return [sprite for sprite in self.cells.get((x0, y0), ()) if sprite.rect.colliderect(rect)]
+        found = {}
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for sprite in self.cells.get((x, y), ()):
+                    if sprite not in found and sprite.rect.colliderect(rect):
+                        found[sprite] = None
+        return list(found)
+
+class CollisionGroup(pygame.sprite.Group):
+    """Group for static colliders that keeps a SpatialHash in sync with its members"""
+    def __init__(self, *sprites, cell_size=TILE_SIZE * 2):
+        self.spatial_hash = SpatialHash(cell_size)
+        self.pending = {}  # Sprites join groups before their rect exists, so index them lazily
+        self.occupancy = None  # Rebuilt on demand after membership changes
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+        self.occupancy = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if self.pending.pop(sprite, False) is False:
+            self.spatial_hash.remove(sprite)
+        self.occupancy = None
+
+    def build_index(self):
+        """Insert sprites added since the last query into the spatial hash"""
+        for sprite in self.pending:
+            self.spatial_hash.insert(sprite)
+        self.pending.clear()
+        self.occupancy = OccupancyGrid(self.sprites())
+
+    def query(self, rect):
+        if self.pending:
+            self.build_index()
+        return self.spatial_hash.query(rect)
+
+    def line_of_sight(self, start, end):
+        if self.occupancy is None:
+            self.occupancy = OccupancyGrid(self.sprites())
+        return self.occupancy.line_of_sight(start, end)
+
+class OccupancyGrid:
+    """Fine grid of cells marked as blocked by static colliders, for line-of-sight rays"""
+    def __init__(self, sprites, cell_size=8):
+        self.cell_size = cell_size
+        rects = [sprite.rect for sprite in sprites]
+        bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+
+        # Grid origin and size in cells (boundary walls sit at negative coordinates)
+        self.origin_x = bounds.left // cell_size
+        self.origin_y = bounds.top // cell_size
+        self.cols = max(0, (bounds.right - 1) // cell_size - self.origin_x + 1)
+        self.rows = max(0, (bounds.bottom - 1) // cell_size - self.origin_y + 1)
+        self.cells = bytearray(self.cols * self.rows)
+
+        for rect in rects:
+            x0 = rect.left // cell_size - self.origin_x
+            x1 = (rect.right - 1) // cell_size - self.origin_x
+            y0 = rect.top // cell_size - self.origin_y
+            y1 = (rect.bottom - 1) // cell_size - self.origin_y
+            span = b'\x01' * (x1 - x0 + 1)
+            for row in range(y0, y1 + 1):
+                start = row * self.cols + x0
+                self.cells[start:start + len(span)] = span
+
+    def is_blocked(self, cell_x, cell_y):
+        col = cell_x - self.origin_x
+        row = cell_y - self.origin_y
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.cells[row * self.cols + col] == 1
+        return False
+
+    def line_of_sight(self, start, end):
+        """Walk every cell the segment touches (Amanatides-Woo DDA) and report if none is blocked"""
+        size = self.cell_size
+        x, y = start
+        dx, dy = end[0] - x, end[1] - y
+        cell_x, cell_y = int(x // size), int(y // size)
+        end_x, end_y = int(end[0] // size), int(end[1] // size)
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Ray parameter t (0 at start, 1 at end) of the next vertical and horizontal cell edge
+        if dx:
+            next_edge = (cell_x + 1) * size if dx > 0 else cell_x * size
+            t_max_x, t_delta_x = (next_edge - x) / dx, abs(size / dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy:
+            next_edge = (cell_y + 1) * size if dy > 0 else cell_y * size
+            t_max_y, t_delta_y = (next_edge - y) / dy, abs(size / dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while True:
+            if self.is_blocked(cell_x, cell_y):
+                return False
+            if cell_x == end_x and cell_y == end_y:
+                return True
+            if t_max_x < t_max_y:
+                if t_max_x > 1:
+                    return True
+                cell_x += step_x
+                t_max_x += t_delta_x
+            else:
+                if t_max_y > 1:
+                    return True
+                cell_y += step_y
+                t_max_y += t_delta_y
+
+class FlowField:
+    """Grid of directions leading to a target cell, computed once and sampled by every chaser"""
+    # (dx, dy, unit vector pointing back along the step), orthogonal steps first
+    NEIGHBOURS = [(dx, dy, tuple(pygame.math.Vector2(-dx, -dy).normalize()))
+                  for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))]
+
+    def __init__(self, area, colliders, cell_size=TILE_SIZE // 2, clearance=TILE_SIZE // 2, max_distance=None):
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.max_steps = math.inf if max_distance is None else max_distance // cell_size  # Search radius
+        self.build(area, colliders)
+
+    def build(self, area, colliders):
+        """Cover area with a fresh grid around colliders, keeping the same object for everyone sharing it"""
+        cell_size, clearance = self.cell_size, self.clearance
+        self.area = pygame.Rect(area)
+        self.cols = math.ceil(self.area.width / cell_size)
+        self.rows = math.ceil(self.area.height / cell_size)
+        self.target_cell = None
+        self.stale = False  # Target moved since the last search
+        self.distances = []
+        self.directions = []
+        self.queue = []  # Cells in the order the search reached them
+        self.head = 0  # Next queued cell to expand; the search is over once it reaches the end
+        self.escaped = {}
+
+        # Mark cells touched by a collider, grown by clearance so chasers keep off the edges
+        self.blocked = bytearray(self.cols * self.rows)
+        for sprite in colliders:
+            rect = sprite.rect.inflate(clearance * 2, clearance * 2).clip(self.area)
+            if not rect.width or not rect.height:
+                continue
+            x0, y0 = self.cell_at(rect.topleft)
+            x1, y1 = self.cell_at((rect.right - 1, rect.bottom - 1))
+            for y in range(y0, y1 + 1):
+                for x in range(x0, x1 + 1):
+                    self.blocked[y * self.cols + x] = 1
+
+        # Search edges are worked out per cell the first time a search reaches it, so a rebuild stays cheap
+        self.steps = [(dx, dy, dy * self.cols + dx, back, (-back[0], -back[1])) for dx, dy, back in self.NEIGHBOURS]
+        self.links = [None] * (self.cols * self.rows)  # Per cell: [(open neighbour index, unit vector back to it)]
+        self.escapes = {}  # Blocked cell index -> [(neighbour index, unit vector to it)]
+
+    def neighbours(self, index):
+        """(dx, dy, neighbour index, unit vector back, unit vector away) for each neighbour inside the grid"""
+        col, row = index % self.cols, index // self.cols
+        return [(dx, dy, index + offset, back, away) for dx, dy, offset, back, away in self.steps
+                if 0 <= col + dx < self.cols and 0 <= row + dy < self.rows]
+
+    def link(self, index):
+        """Edges the search can take out of a cell, cached once worked out"""
+        cols, blocked = self.cols, self.blocked
+        links = []
+        for dx, dy, neighbour, back, away in self.neighbours(index):
+            # Diagonals may not cut the corner of a blocked cell
+            if blocked[neighbour] or (dx and dy and (blocked[index + dx] or blocked[index + dy * cols])):
+                continue
+            links.append((neighbour, back))
+        self.links[index] = links
+        return links
+
+    def copy(self, max_distance=None):
+        """A field over the same grid for another target, sharing the cells and their links"""
+        field = copy.copy(self)
+        field.max_steps = math.inf if max_distance is None else max_distance // self.cell_size
+        field.target_cell = None
+        field.stale = False
+        field.distances = []
+        field.directions = []
+        field.queue = []
+        field.head = 0
+        field.escaped = {}
+        return field
+
+    def cell_at(self, pos):
+        """Return the (col, row) containing pos, clamped to the field"""
+        col = int((pos[0] - self.area.left) // self.cell_size)
+        row = int((pos[1] - self.area.top) // self.cell_size)
+        return min(max(col, 0), self.cols - 1), min(max(row, 0), self.rows - 1)
+
+    def is_open(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows and not self.blocked[row * self.cols + col]
+
+    def update(self, target_pos):
+        """Point the field at target_pos; the search runs on the next query, and only if the cell changed"""
+        target = self.cell_at(target_pos)
+        if target == self.target_cell:
+            return False
+        self.target_cell = target
+        self.stale = True
+        return True
+
+    def refresh(self):
+        """Restart the search from the target if it moved; cells are reached as queries need them"""
+        if not self.stale:
+            return
+        self.stale = False
+        target = self.target_cell
+        self.distances = [math.inf] * (self.cols * self.rows)
+        self.directions = [None] * (self.cols * self.rows)
+        start = target[1] * self.cols + target[0]
+        self.distances[start] = 0
+        self.queue = [start]
+        self.head = 0
+        self.escaped = {}  # Blocked cells whose way out has been worked out for this target
+
+    def search(self, index=None, settled=math.inf):
+        """Carry the breadth-first search on until it reaches index, or every cell up to distance settled, or ends
+
+        Cells keep the distance and direction they were reached with, so a
+        search stopped early gives the same answers as one run to the end.
+        """
+        inf, links, distances, directions, queue = math.inf, self.links, self.distances, self.directions, self.queue
+        head, max_steps = self.head, self.max_steps
+        while head < len(queue):  # The queue grows while it is walked
+            current = queue[head]
+            if (index is not None and distances[index] != inf) or distances[current] >= settled:
+                break
+            distance = distances[current] + 1
+            if distance > max_steps:
+                head = len(queue)  # Cells further out keep no direction
+                break
+            head += 1
+            for neighbour, back in links[current] or self.link(current):
+                if distances[neighbour] == inf:
+                    distances[neighbour] = distance
+                    directions[neighbour] = back  # Stepping back along this edge leads to the target
+                    queue.append(neighbour)
+        self.head = head
+
+    def searching(self):
+        return self.head < len(self.queue)
+
+    def escape_direction(self, index):
+        """Chasers pushed into a blocked cell head for the closest open neighbour"""
+        direction = self.escaped.get(index, False)
+        if direction is False:
+            escapes = self.escapes.get(index)
+            if escapes is None:
+                escapes = self.escapes[index] = [(neighbour, away) for _, _, neighbour, _, away in self.neighbours(index)]
+            # Search on until no neighbour still to be reached could be as close as the closest one reached
+            best = min((self.distances[neighbour] for neighbour, _ in escapes), default=math.inf)
+            while best == math.inf and self.searching():
+                self.search(settled=self.distances[self.queue[self.head]] + 1)
+                best = min((self.distances[neighbour] for neighbour, _ in escapes), default=math.inf)
+            self.search(settled=best)
+            direction, best = None, math.inf
+            for neighbour, away in escapes:
+                if self.distances[neighbour] < best:
+                    best = self.distances[neighbour]
+                    direction = away
+            self.escaped[index] = direction
+        return direction
+
+    def all_directions(self):
+        """Directions for every cell, blocked ones included, for chasers sampled in bulk"""
+        self.refresh()
+        self.search()
+        directions = self.directions[:]
+        index = self.blocked.find(1)
+        while index != -1:
+            directions[index] = self.escape_direction(index)
+            index = self.blocked.find(1, index + 1)
+        return directions
+
+    def direction_at(self, pos):
+        """Unit direction to follow from pos, or None outside the field or in the target cell"""
+        self.refresh()
+        if not self.directions:
+            return None
+        col, row = self.cell_at(pos)
+        index = row * self.cols + col
+        if self.blocked[index]:
+            return self.escape_direction(index)
+        if self.distances[index] == math.inf:
+            self.search(index)
+        return self.directions[index]
+
+    def distance_at(self, pos):
+        """Path length in pixels from pos to the target cell (inf if unreachable)"""
+        self.refresh()
+        if not self.distances:
+            return math.inf
+        col, row = self.cell_at(pos)
+        index = row * self.cols + col
+        if self.distances[index] == math.inf:
+            self.search(index)
+        return self.distances[index] * self.cell_size
+
+def sampled_line_of_sight(sprites, start, end, step=8):
+    """Line of sight by testing points every step pixels against every sprite"""
+    start = pygame.math.Vector2(start)
+    offset = pygame.math.Vector2(end) - start
+    distance = offset.length()
+    if distance == 0:
+        return True
+    ray_dir = offset.normalize()
+
+    for i in range(0, int(distance), step):
+        check_pos = start + ray_dir * i
+        check_rect = pygame.Rect(check_pos.x - 1, check_pos.y - 1, 2, 2)
+        if any(sprite.rect.colliderect(check_rect) for sprite in sprites):
+            return False
+    return True
+
+def collision_candidates(group, rect):
+    """Return the sprites in group that can touch rect, using its spatial index if it has one"""
+    if isinstance(group, (CollisionGroup, ChunkedWorld)):
+        return group.query(rect)
+    return group
+
+class Placer:
+    """Scatters rects over an area with one jittered candidate per grid cell.
+
+    Cells are visited in a shuffled order and each is tried at most once per
+    pass, so placement always terminates; overlap tests go through spatial
+    indexes rather than every collider.
+    """
+    def __init__(self, area, count, rng=None, obstacles=(), cells_per_item=4, passes=3):
+        self.area = pygame.Rect(area)
+        self.rng = rng if rng is not None else random.Random()
+        self.obstacles = obstacles
+        self.reserved = SpatialHash()  # Rects placed with reserve=True
+
+        # Size cells so there are a few candidates for every item
+        self.cell_size = max(1, int(math.sqrt(self.area.width * self.area.height / max(1, count * cells_per_item))))
+        cols = max(1, self.area.width // self.cell_size)
+        rows = max(1, self.area.height // self.cell_size)
+        self.cells = [(col, row) for col in range(cols) for row in range(rows)]
+        self.passes_left = passes
+        self.free_cells = []
+
+    def reserve(self, rect):
+        """Keep later placements out of rect"""
+        marker = pygame.sprite.Sprite()
+        marker.rect = pygame.Rect(rect)
+        self.reserved.insert(marker)
+
+    def next_cell(self):
+        """Pop the next cell to try, reshuffling for another pass when one runs out"""
+        if not self.free_cells:
+            if not self.passes_left:
+                return None
+            self.passes_left -= 1
+            self.free_cells = self.cells[:]
+            self.rng.shuffle(self.free_cells)
+        return self.free_cells.pop()
+
+    def blocked(self, rect):
+        if self.reserved.sprite_cells and self.reserved.query(rect):
+            return True
+        return any(sprite.rect.colliderect(rect) for sprite in collision_candidates(self.obstacles, rect))
+
+    def place(self, size, accept=None, reserve=False):
+        """Return the centre of a free spot for a rect of size, or None once every pass is used up"""
+        rect = pygame.Rect((0, 0), size)
+        random_unit = self.rng.random
+        cell = self.next_cell()
+        while cell is not None:
+            rect.center = (self.area.left + int((cell[0] + random_unit()) * self.cell_size),
+                           self.area.top + int((cell[1] + random_unit()) * self.cell_size))
+            rect.clamp_ip(self.area)
+            if (accept and not accept(rect)) or self.blocked(rect):
+                cell = self.next_cell()
+                continue
+            if reserve:
+                self.reserve(rect)
+            return rect.center
+        return None
+
+class StaticLayer:
+    """Background plus static sprites pre-composited into one world surface, or chunks on big maps"""
+    CHUNK_SIZE = 256
+    MAX_SINGLE_SIZE = 4096  # Larger worlds are split into chunks
+
+    def __init__(self, background, sprites):
+        self.background = background
+        sprites = sorted(sprites, key=lambda sprite: sprite.draw_layer)
+        self.bounds = background.get_rect().unionall([sprite.rect for sprite in sprites])
+        self.chunked = max(self.bounds.size) > self.MAX_SINGLE_SIZE
+
+        if self.chunked:
+            self.chunks = {}
+            index = SpatialHash(self.CHUNK_SIZE)
+            for sprite in sprites:
+                index.insert(sprite)
+            for chunk_x, chunk_y in {key for key in index.cells} | self.background_chunks():
+                area = pygame.Rect(chunk_x * self.CHUNK_SIZE, chunk_y * self.CHUNK_SIZE,
+                                   self.CHUNK_SIZE, self.CHUNK_SIZE)
+                chunk_sprites = sorted(index.query(area), key=lambda sprite: sprite.draw_layer)
+                self.chunks[chunk_x, chunk_y] = self.compose(area, chunk_sprites)
+        else:
+            self.surface = self.compose(self.bounds, sprites)
+
+    def background_chunks(self):
+        size = self.CHUNK_SIZE
+        rect = self.background.get_rect()
+        return {(x, y) for x in range(0, (rect.right - 1) // size + 1)
+                for y in range(0, (rect.bottom - 1) // size + 1)}
+
+    def compose(self, area, sprites):
+        """Render the background and sprites that fall in area onto a new surface"""
+        surface = pygame.Surface(area.size)
+        surface.fill(BLACK)
+        surface.blit(self.background, (-area.x, -area.y))
+        for sprite in sprites:
+            surface.blit(sprite.image, (sprite.rect.x - area.x, sprite.rect.y - area.y))
+        return surface
+
+    def draw(self, screen, offset, view_rect):
+        if not self.chunked:
+            screen.blit(self.surface, self.bounds.topleft + offset)
+            return
+
+        size = self.CHUNK_SIZE
+        blits = []
+        for chunk_x in range(view_rect.left // size, (view_rect.right - 1) // size + 1):
+            for chunk_y in range(view_rect.top // size, (view_rect.bottom - 1) // size + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk:
+                    blits.append((chunk, (chunk_x * size + offset.x, chunk_y * size + offset.y)))
+        screen.blits(blits, doreturn=False)
+
+class ChunkDescriptor:
+    """Compact stand-in for a sprite while its chunk is unloaded"""
+    __slots__ = ('kind', 'rect', 'image_path')
+
+    def __init__(self, kind, rect, image_path=None):
+        self.kind = kind
+        self.rect = rect
+        self.image_path = image_path
+
+class ChunkedWorld:
+    """Large map kept as per-chunk descriptors, with live sprites only in the chunks around the view.
+
+    Chunks load when they come within load_margin of the view and unload once
+    they are further than unload_margin away, so live sprites, collision
+    entries and composed surfaces depend on the view size, not the world size.
+    Also takes the place of the baked StaticLayer, composing each loaded chunk's
+    background and bakeable sprites the first time it is drawn.
+    """
+    def __init__(self, area, background, chunk_size=512, load_margin=256, unload_margin=512):
+        self.area = pygame.Rect(area)
+        self.background = background
+        self.chunk_size = chunk_size
+        self.load_margin = load_margin
+        self.unload_margin = unload_margin
+        self.kinds = {}  # kind -> (factory, solid, mobile)
+        self.descriptors = {}  # Unloaded chunk -> [ChunkDescriptor]
+        self.live = {}  # Loaded chunk -> {sprite: ChunkDescriptor}
+        self.movers = {}  # Live sprite of a mobile kind -> chunk it is filed under
+        self.surfaces = {}  # Loaded chunk -> composed background and bakeable sprites
+        self.reach = 0  # Furthest any descriptor sticks out of its chunk
+
+    def add_kind(self, kind, factory, solid=False, mobile=False):
+        """Register how a kind comes to life: factory(descriptor) returns its sprite.
+
+        Solid kinds count as obstacles in query(), mobile ones are refiled under
+        whichever chunk they walk into.
+        """
+        self.kinds[kind] = (factory, solid, mobile)
+
+    def add(self, kind, pos, size, image_path=None):
+        """Describe a sprite centred on pos, creating it straight away if its chunk is loaded"""
+        rect = pygame.Rect((0, 0), size)
+        rect.center = pos
+        self.file(ChunkDescriptor(kind, rect, image_path))
+
+    def file(self, descriptor, sprite=None):
+        """Store a descriptor under the chunk holding its centre, live if that chunk is loaded"""
+        key = self.chunk_at(descriptor.rect.center)
+        chunk = self.chunk_rect(key)
+        self.reach = max(self.reach, chunk.left - descriptor.rect.left, descriptor.rect.right - chunk.right,
+                         chunk.top - descriptor.rect.top, descriptor.rect.bottom - chunk.bottom)
+        if key not in self.live:
+            if sprite:
+                sprite.kill()
+            self.descriptors.setdefault(key, []).append(descriptor)
+            return
+        factory, solid, mobile = self.kinds[descriptor.kind]
+        sprite = sprite or factory(descriptor)
+        self.live[key][sprite] = descriptor
+        if mobile:
+            self.movers[sprite] = key
+
+    def chunk_at(self, pos):
+        return int(pos[0] // self.chunk_size), int(pos[1] // self.chunk_size)
+
+    def chunk_rect(self, key):
+        return pygame.Rect(key[0] * self.chunk_size, key[1] * self.chunk_size, self.chunk_size, self.chunk_size)
+
+    def chunks_in(self, rect):
+        size = self.chunk_size
+        return [(x, y) for y in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for x in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def query(self, rect):
+        """Solid descriptors overlapping rect, loaded or not, for placement checks"""
+        found = []
+        for key in self.chunks_in(rect.inflate(self.reach * 2, self.reach * 2)):
+            descriptors = self.live[key].values() if key in self.live else self.descriptors.get(key, ())
+            found.extend(descriptor for descriptor in descriptors
+                         if self.kinds[descriptor.kind][1] and descriptor.rect.colliderect(rect))
+        return found
+
+    def positions(self, kind):
+        """Centres of every remaining sprite of kind, loaded or not"""
+        found = [sprite.rect.center for live in self.live.values()
+                 for sprite, descriptor in live.items() if descriptor.kind == kind and sprite.alive()]
+        found.extend(descriptor.rect.center for descriptors in self.descriptors.values()
+                     for descriptor in descriptors if descriptor.kind == kind)
+        return found
+
+    def loaded_area(self):
+        """Bounding rect of the loaded chunks, clipped to the world"""
+        rects = [self.chunk_rect(key) for key in self.live]
+        if not rects:
+            return pygame.Rect(self.area.topleft, (0, 0))
+        return rects[0].unionall(rects[1:]).clip(self.area)
+
+    def stream(self, view_rect):
+        """Load chunks near view_rect and unload far ones, returning True if the loaded set changed"""
+        self.refile_movers()
+        kept = set(self.chunks_in(view_rect.inflate(self.unload_margin * 2, self.unload_margin * 2)))
+        far = [key for key in self.live if key not in kept]
+        for key in far:
+            self.unload(key)
+        near = [key for key in self.chunks_in(view_rect.inflate(self.load_margin * 2, self.load_margin * 2))
+                if key not in self.live]
+        for key in near:
+            self.load(key)
+        return bool(far or near)
+
+    def load(self, key):
+        self.live[key] = {}
+        for descriptor in self.descriptors.pop(key, ()):
+            self.file(descriptor)
+
+        # Neighbours were composed without whatever this chunk overhangs into them
+        for x in (-1, 0, 1):
+            for y in (-1, 0, 1):
+                self.surfaces.pop((key[0] + x, key[1] + y), None)
+
+    def unload(self, key):
+        """Turn a chunk's remaining sprites back into descriptors and free its surface"""
+        self.surfaces.pop(key, None)
+        for sprite, descriptor in self.live.pop(key).items():
+            if not sprite.alive():
+                continue  # Collected, gone for good
+            if self.movers.pop(sprite, None) is not None:
+                descriptor.rect.center = sprite.rect.center
+                self.file(descriptor, sprite)  # Sleeps where it stands, or stays live if that chunk is loaded
+            else:
+                sprite.kill()
+                self.descriptors.setdefault(key, []).append(descriptor)
+
+    def refile_movers(self):
+        """Move walking sprites to the chunk they are now in, putting them to sleep if it is unloaded"""
+        for sprite, key in list(self.movers.items()):
+            if not sprite.alive():
+                del self.movers[sprite]
+                continue
+            current = self.chunk_at(sprite.rect.center)
+            if current != key:
+                descriptor = self.live[key].pop(sprite)
+                del self.movers[sprite]
+                descriptor.rect.center = sprite.rect.center
+                self.file(descriptor, sprite)
+
+    def set_background(self, background):
+        self.background = background
+        self.surfaces.clear()
+
+    def compose(self, key):
+        """Render the background tiles and the bakeable sprites overlapping a chunk"""
+        area = self.chunk_rect(key)
+        surface = pygame.Surface(area.size)
+        surface.fill(BLACK)
+
+        # The background repeats across the world
+        width, height = self.background.get_size()
+        inside = area.clip(self.area)
+        if inside.width and inside.height:
+            left = self.area.left + (inside.left - self.area.left) // width * width
+            top = self.area.top + (inside.top - self.area.top) // height * height
+            for x in range(left, inside.right, width):
+                for y in range(top, inside.bottom, height):
+                    surface.blit(self.background, (x - area.x, y - area.y))
+
+        sprites = [sprite for x in (-1, 0, 1) for y in (-1, 0, 1)
+                   for sprite in self.live.get((key[0] + x, key[1] + y), ())
+                   if getattr(sprite, 'bakeable', False) and sprite.rect.colliderect(area)]
+        sprites.sort(key=lambda sprite: sprite.draw_layer)
+        surface.blits([(sprite.image, (sprite.rect.x - area.x, sprite.rect.y - area.y)) for sprite in sprites],
+                      doreturn=False)
+        return surface
+
+    def draw(self, screen, offset, view_rect):
+        size = self.chunk_size
+        blits = []
+        for key in self.chunks_in(view_rect):
+            if key not in self.live:
+                continue
+            surface = self.surfaces.get(key)
+            if surface is None:
+                surface = self.surfaces[key] = self.compose(key)
+            blits.append((surface, (key[0] * size + offset.x, key[1] * size + offset.y)))
+        screen.blits(blits, doreturn=False)
+
 # Sprite grouping
 class AllSprites(pygame.sprite.Group):
-    def __init__(self, game):
+    def __init__(self, game, y_sorted_layers=(LAYERS['actors'],)):
+        # Static sprites are culled through a spatial hash, moving ones are checked directly
+        self.static_index = SpatialHash()
+        self.pending_static = {}
+        self.dynamic_sprites = {}
+        self.updating = {}  # Sprites whose update does something, bakeable ones never change
+        self.cosmetic_sprites = {}  # Sprites whose update only animates their image
+        self.animate = True  # Off when nothing is drawn
+        self.y_sorted_layers = set(y_sorted_layers)  # Layers drawn back to front by rect.bottom
+
+        # Background and bakeable sprites pre-rendered by bake()
+        self.static_layer = None
+        self.baked_sprites = {}
+
         super().__init__()
         self.game = game
         self.screen = pygame.display.get_surface()
@@ -451,6 +1235,92 @@ class AllSprites(pygame.sprite.Group):
         # Reference to game boundaries (will be set by Game class)
         self.game_area = None
 
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if getattr(sprite, 'static', False):
+            self.pending_static[sprite] = None  # Rect is only set after the sprite joins its groups
+        else:
+            self.dynamic_sprites[sprite] = None
+        if getattr(sprite, 'cosmetic', False):
+            self.cosmetic_sprites[sprite] = None
+        elif not getattr(sprite, 'bakeable', False):
+            self.updating[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.updating.pop(sprite, None)
+        self.cosmetic_sprites.pop(sprite, None)
+        if sprite in self.baked_sprites:
+            self.unbake()
+        if self.dynamic_sprites.pop(sprite, False) is False:
+            if self.pending_static.pop(sprite, False) is False:
+                self.static_index.remove(sprite)
+
+    def update(self, *args, **kwargs):
+        """Update every sprite except the bakeable ones, and the cosmetic ones while animation is off"""
+        for sprite in list(self.updating):
+            sprite.update(*args, **kwargs)
+        if self.animate:
+            for sprite in list(self.cosmetic_sprites):
+                sprite.update(*args, **kwargs)
+
+    def index_pending(self):
+        for sprite in self.pending_static:
+            self.static_index.insert(sprite)
+        self.pending_static.clear()
+
+    def bake(self, background):
+        """Pre-render the background and every bakeable static sprite into a StaticLayer"""
+        self.unbake()
+        self.index_pending()
+        sprites = [sprite for sprite in self.static_index.sprite_cells if getattr(sprite, 'bakeable', False)]
+        self.static_layer = StaticLayer(background, sprites)
+        for sprite in sprites:
+            self.static_index.remove(sprite)
+            self.baked_sprites[sprite] = None
+
+    def set_static_layer(self, layer):
+        """Draw the world from a layer that manages its own static sprites, such as a ChunkedWorld"""
+        self.unbake()
+        self.static_layer = layer
+
+    def unbake(self):
+        """Drop the baked layer and draw its sprites individually again"""
+        for sprite in self.baked_sprites:
+            self.static_index.insert(sprite)
+        self.baked_sprites.clear()
+        self.static_layer = None
+
+    def visible_sprites(self, view_rect):
+        """Return the sprites overlapping view_rect in draw order"""
+        self.index_pending()
+
+        visible = self.static_index.query(view_rect)
+        visible.extend(sprite for sprite in self.dynamic_sprites if sprite.rect.colliderect(view_rect))
+        visible.sort(key=self.draw_order)
+        return visible
+
+    def store_previous_positions(self):
+        """Remember where moving sprites are before a simulation step, for render interpolation"""
+        for sprite in self.dynamic_sprites:
+            sprite.previous_topleft = sprite.rect.topleft
+
+    def interpolated_rect(self, sprite, alpha):
+        """Return sprite.rect moved alpha of the way from its previous position to its current one"""
+        previous = getattr(sprite, 'previous_topleft', None)
+        if previous is None or alpha >= 1:
+            return sprite.rect
+        rect = sprite.rect.copy()
+        rect.x = round(previous[0] + (sprite.rect.x - previous[0]) * alpha)
+        rect.y = round(previous[1] + (sprite.rect.y - previous[1]) * alpha)
+        return rect
+
+    def draw_order(self, sprite):
+        layer = getattr(sprite, 'draw_layer', LAYERS['actors'])
+        if layer in self.y_sorted_layers:
+            return layer, sprite.rect.bottom
+        return layer, 0
+
     def set_boundaries(self, game_area):
         """Set the game boundaries for camera clamping"""
         self.game_area = game_area
@@ -479,48 +1349,50 @@ class AllSprites(pygame.sprite.Group):
 
         return pygame.Vector2(desired_x, desired_y)
 
-    def draw(self, target_pos, **kwargs):
-        """Draw sprites with clamped camera position"""
+    def draw(self, target_pos, alpha=1.0, **kwargs):
+        """Draw sprites with clamped camera position, interpolating moving sprites by alpha"""
         self.offset = self.calculate_camera(target_pos)
 
-        # Draw background
-        bg_pos = self.offset
-        self.screen.blit(self.game.background_current, bg_pos)
+        # Draw background, from the baked layer when there is one (rebaked if the background changed)
+        view_rect = pygame.Rect(-self.offset.x, -self.offset.y, self.screen_width, self.screen_height)
+        if self.static_layer and self.static_layer.background is not self.game.background_current:
+            if hasattr(self.static_layer, 'set_background'):
+                self.static_layer.set_background(self.game.background_current)
+            else:
+                self.bake(self.game.background_current)
+        if self.static_layer:
+            self.static_layer.draw(self.screen, self.offset, view_rect)
+        else:
+            bg_pos = self.offset
+            self.screen.blit(self.game.background_current, bg_pos)
 
-        for sprite in self:
-            offset_pos = sprite.rect.topleft + self.offset
+        # Only draw what the camera can see, layer by layer
+        for sprite in self.visible_sprites(view_rect):
+            if sprite in self.dynamic_sprites:
+                offset_pos = self.interpolated_rect(sprite, alpha).topleft + self.offset
+            else:
+                offset_pos = sprite.rect.topleft + self.offset
             self.screen.blit(sprite.image, offset_pos)
 
 class SpriteSheet:
     def __init__(self, sprite_obj):
         self.sprite = sprite_obj
         self.animations = {}
+        self.flipped_animations = {}  # Left-facing copies of self.animations
         self.frame_index = 0
         self.animation_speed = 5
         self.current_animation = None
         self.facing_right = True
+        self.frozen = False  # Skip frame updates when nothing is drawn
 
-    def load_spritesheet(self, path, num_frames, scale=1.2):
-        """Load a spritesheet and return list of frames"""
-        spritesheet = pygame.image.load(path).convert_alpha()
-        frame_width = spritesheet.get_width() // num_frames
-        frame_height = spritesheet.get_height()
-
-        frames = []
-        for i in range(num_frames):
-            # Extract each frame from the spritesheet
-            surface = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-            surface.blit(spritesheet, (0, 0),
-                         (i * frame_width, 0, frame_width, frame_height))
-            scaled_surface = pygame.transform.scale(surface,
-                                                    (int(frame_width * scale),
-                                                     int(frame_height * scale)))
-            frames.append(scaled_surface)
-        return frames
+    @staticmethod
+    def get_frames(path, num_frames, scale=1.2):
+        """Return the shared right- and left-facing frames, loading the sheet on first use"""
+        return image_cache.frames(path, num_frames, scale)
 
     def add_animation(self, name, path, num_frames, scale=1.2):
         """Add a new animation to the animations dictionary"""
-        self.animations[name] = self.load_spritesheet(path, num_frames, scale)
+        self.animations[name], self.flipped_animations[name] = self.get_frames(path, num_frames, scale)
         if not self.current_animation:  # Set first added animation as default
             self.current_animation = name
             self.sprite.image = self.animations[name][0]
@@ -534,7 +1406,7 @@ class SpriteSheet:
 
     def animate(self, dt):
         """Update animation frame"""
-        if not self.current_animation:
+        if not self.current_animation or self.frozen:
             return
 
         # Update frame index
@@ -544,12 +1416,9 @@ class SpriteSheet:
         if self.frame_index >= len(self.animations[self.current_animation]):
             self.frame_index = 0
 
-        # Update image
-        self.sprite.image = self.animations[self.current_animation][int(self.frame_index)]
-
-        # Flip sprite when changing directions
-        if not self.facing_right:
-            self.sprite.image = pygame.transform.flip(self.sprite.image, True, False)
+        # Update image, using the pre-flipped frames when facing left
+        animations = self.animations if self.facing_right else self.flipped_animations
+        self.sprite.image = animations[self.current_animation][int(self.frame_index)]
 
 # Animated Sprites
 class AnimatedSprite(pygame.sprite.Sprite):
@@ -569,6 +1438,13 @@ class AnimatedSprite(pygame.sprite.Sprite):
         self.animating = True
         self.current_frame = 0
 
+    def reset(self):
+        """Rewind to the first frame without playing"""
+        self.animating = False
+        self.current_frame = 0
+        self.animation_counter = 0
+        self.image = self.frames[0]
+
     def update(self):
         if self.animating:
             self.animation_counter += 1
@@ -10,6 +10,26 @@ import os
 # Import game-related classes
 from sprites import AllSprites, Boundary, Blocks, Collectibles, Ghost, Player, WinZone
 from sprites import WIDTH, HEIGHT, BLACK, WHITE
+from scene_manager import BaseScene, SceneManager, register
+from runtime import get_runtime
+from asset_manager import assets
+import profiling
+
+# Each story frame's image and sound, plus what every frame shares, prefetched when Manila is picked on the map
+STORY_ASSETS = [
+    ('scaled_image', "assets/first_airport.png", (1280, 720)), ('sound', "audio/first_airplane.wav"),
+    ('scaled_image', "assets/second_arrival.png", (1280, 720)), ('sound', "audio/second_terminal.wav"),
+    ('scaled_image', "assets/third_outside.png", (1280, 720)), ('sound', "audio/third_street.wav"),
+    ('scaled_image', "assets/fourth_intramuros.png", (1280, 720)), ('sound', "audio/fourth_bell.wav"),
+    ('scaled_image', "assets/fifth_santiago.png", (1280, 720)), ('sound', "audio/fifth_war.wav"),
+    ('scaled_image', "assets/sixth_trade.png", (1280, 720)), ('sound', "audio/sixth_footsteps.wav"),
+    ('scaled_image', "assets/seventh_prison.png", (1280, 720)), ('sound', "audio/seventh_banging.wav"),
+    ('scaled_image', "assets/eight_ghost.png", (1280, 720)), ('sound', "audio/eight_whispers.wav"),
+    ('scaled_image', "assets/ninth_guard.png", (1280, 720)), ('sound', "audio/ninth_lantern.wav"),
+    ('scaled_image', "assets/tenth_girl.png", (1280, 720)), ('sound', "audio/tenth_humming.wav"),
+    ('sound', "audio/typewriter.wav"),
+    ('font', "font/pixel_font.ttf", 14),
+]
 
 class SceneState(Enum):
     FADE_IN = auto()
@@ -134,20 +154,6 @@ class LoadingScreen:
                 self.draw_rounded_rect(self.screen, self.fill_color, progress_rect, 
                                      self.corner_radius - self.border_thickness)
 
-class AssetLoader:
-    @staticmethod
-    def load_image(path):
-        image = pygame.image.load(path)
-        return pygame.transform.scale(image, (1280, 720))
-    
-    @staticmethod
-    def load_sound(path):
-        try:
-            return pygame.mixer.Sound(path)
-        except Exception as e:
-            print(f"Warning: Could not load sound {path}: {e}")
-            return None
-        
 class Scene:
     def __init__(self, image_path: str, text: str, font: pygame.font.Font, 
                  sound_path: str = None, is_first_scene: bool = False, 
@@ -198,18 +204,20 @@ class Scene:
         # Typewriter sound
         self.typewriter_sound = None
         try:
-            self.typewriter_sound = pygame.mixer.Sound("audio/typewriter.wav")
+            self.typewriter_sound = assets.sound("audio/typewriter.wav")
             self.typewriter_sound.set_volume(0.3)
         except Exception as e:
             print(f"Warning: Could not load typewriter sound: {e}")
 
     def load_assets(self):
         if not self.loaded_image:
-            self.loaded_image = AssetLoader.load_image(self.image)
+            self.loaded_image = assets.scaled_image(self.image, (1280, 720))
         if self.sound_path and not self.sound:
-            self.sound = AssetLoader.load_sound(self.sound_path)
-            if self.sound:
+            try:
+                self.sound = assets.sound(self.sound_path)
                 self.sound.set_volume(0.0)
+            except Exception as e:
+                print(f"Warning: Could not load sound {self.sound_path}: {e}")
 
     def render(self, screen: pygame.Surface) -> None:
         if not self.loaded_image:
@@ -379,36 +387,34 @@ class Scene:
         if self.typewriter_sound and self.typewriter_sound.get_num_channels() > 0:
             self.typewriter_sound.stop()
 
-class OpeningSequence:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
-        
-        self.screen = pygame.display.set_mode((1280, 720))
-        pygame.display.set_caption("ISLA")
+class OpeningSequence(BaseScene):
+    def __init__(self, runtime=None):
+        self.runtime = runtime or get_runtime()
+        self.screen = self.runtime.screen
+        self.runtime.set_caption("ISLA")
         
         font_path = Path("font/pixel_font.ttf")
-        self.font = pygame.font.Font(font_path, 14)
+        self.font = assets.font(font_path, 14)
         pygame.display.set_icon(pygame.image.load("assets/first_airport.png"))
         
         self.scenes = self._initialize_scenes()
         self.loading_screen = LoadingScreen(self.screen, str(font_path))
         self.loading_complete = False
+        self.executor = None
+        self.futures = []
         
         self.current_scene = 0
-        self.clock = pygame.time.Clock()
         self.transitioning = False
         self.last_space_time = 0
         self.space_cooldown = 10
         
         self.initial_fade_alpha = 255
         self.initial_fade_complete = False
+        self.fade_surface = pygame.Surface((1280, 720))
+        self.fade_surface.fill((0, 0, 0))
         
         # Game transition properties
         self.game_started = False
-        self.game_instance = None
-        self.fade_out_complete = False
-        self.fade_alpha = 0
 
     def _initialize_scenes(self) -> list:
         return [
@@ -467,136 +473,96 @@ class OpeningSequence:
 
     def transition_to_game(self):
         """Smooth transition to game"""
-        if not self.game_instance:
-            # Clean up current sounds
-            for scene in self.scenes:
-                if scene.sound:
-                    scene.stop_sound()
-                if scene.typewriter_sound:
-                    scene.typewriter_sound.stop()
-            
-            # Import and initialize game
-            from intramuros import Game
-            self.game_instance = Game()
-            
-            # Start the game
-            self.game_instance.run()
+        if not self.game_started:
+            self.game_started = True
+            self.stop_sounds()
+            self.manager.replace('intramuros')
 
-    def _preload_assets(self):
-        total_assets = len(self.scenes)
-        assets_loaded = 0
-        
-        with ThreadPoolExecutor() as executor:
-            futures = []
-            for scene in self.scenes:
-                future = executor.submit(scene.load_assets)
-                futures.append(future)
-            
-            while assets_loaded < total_assets:
-                completed = sum(1 for f in futures if f.done())
-                progress = completed / total_assets
-                
-                self.loading_screen.update(progress)
-                self.loading_screen.draw()
-                pygame.display.flip()
-                
-                assets_loaded = completed
-                self.clock.tick(60)
-        
-        self.loading_complete = True
+    def stop_sounds(self):
+        for scene in self.scenes:
+            if scene.sound:
+                scene.stop_sound()
+            if scene.typewriter_sound:
+                scene.typewriter_sound.stop()
 
-    def fade_out(self):
-        fade_surface = pygame.Surface((1280, 720))
-        fade_surface.fill((0, 0, 0))
-        
-        while self.fade_alpha < 255:
-            self.screen.fill((0, 0, 0))
-            self.scenes[self.current_scene].render(self.screen)
-            fade_surface.set_alpha(self.fade_alpha)
-            self.screen.blit(fade_surface, (0, 0))
-            pygame.display.flip()
-            self.fade_alpha += 8
-            self.clock.tick(60)
-        
-        self.fade_out_complete = True
+    def fade_out(self, callback):
+        self.manager.fade_out(callback, speed=8)
 
-    def run(self):
-        self._preload_assets()
-        
-        running = True
-        self.scenes[0].start_sound()
-        fade_surface = pygame.Surface((1280, 720))
-        fade_surface.fill((0, 0, 0))
-        
-        while running:
-            current_time = pygame.time.get_ticks()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.fade_out()
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.initial_fade_complete:
-                        if current_time - self.last_space_time >= self.space_cooldown:
-                            current_scene = self.scenes[self.current_scene]
-                            
-                            # Check if it's the final scene and final text is shown
-                            if current_scene.is_final_scene and current_scene.final_text_shown:
-                                self.fade_out()
-                                self.transition_to_game()
-                                return
-                            
-                            current_scene.space_pressed = True
-                            current_scene._fade_out_typewriter()
-                            if not self.transitioning:
-                                if current_scene.is_final_scene and not current_scene.final_text_shown:
-                                    current_scene.state = SceneState.FADE_OUT
-                                elif not current_scene.is_final_scene and self.current_scene < len(self.scenes) - 1:
-                                    self.transitioning = True
-                                    current_scene.state = SceneState.FADE_OUT
-                            self.last_space_time = current_time
-                    elif event.key == pygame.K_ESCAPE:
-                        self.fade_out()
-                        running = False
-            
-            self.screen.fill((0, 0, 0))
-            
-            if not self.initial_fade_complete:
+    def enter(self):
+        # Load every scene's image and sound on worker threads behind the loading screen
+        self.executor = ThreadPoolExecutor()
+        self.futures = [self.executor.submit(scene.load_assets) for scene in self.scenes]
+
+    def exit(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.futures = []
+        self.stop_sounds()
+
+    def handle_event(self, event):
+        if not self.loading_complete or event.type != pygame.KEYDOWN:
+            return
+        current_time = pygame.time.get_ticks()
+        if event.key == pygame.K_SPACE and self.initial_fade_complete:
+            if current_time - self.last_space_time >= self.space_cooldown:
                 current_scene = self.scenes[self.current_scene]
-                current_scene.render(self.screen)
-                
-                fade_surface.set_alpha(self.initial_fade_alpha)
-                self.screen.blit(fade_surface, (0, 0))
-                
-                self.initial_fade_alpha = max(0, self.initial_fade_alpha - 5)
                 
-                if self.initial_fade_alpha <= 0:
-                    self.initial_fade_complete = True
-            else:
-                current_scene = self.scenes[self.current_scene]
-                current_scene.update()
+                # Check if it's the final scene and final text is shown
+                if current_scene.is_final_scene and current_scene.final_text_shown:
+                    self.fade_out(self.transition_to_game)
+                    return
                 
-                if self.transitioning and current_scene.alpha <= 0:
-                    if not self.scenes[self.current_scene].is_final_scene:
-                        current_scene.stop_sound()
-                    self.current_scene += 1
-                    if not self.scenes[self.current_scene - 1].is_final_scene:
-                        self.scenes[self.current_scene].start_sound()
-                    self.transitioning = False
-                    
-                current_scene.render(self.screen)
+                current_scene.space_pressed = True
+                current_scene._fade_out_typewriter()
+                if not self.transitioning:
+                    if current_scene.is_final_scene and not current_scene.final_text_shown:
+                        current_scene.state = SceneState.FADE_OUT
+                    elif not current_scene.is_final_scene and self.current_scene < len(self.scenes) - 1:
+                        self.transitioning = True
+                        current_scene.state = SceneState.FADE_OUT
+                self.last_space_time = current_time
+        elif event.key == pygame.K_ESCAPE:
+            self.fade_out(self.manager.quit)
+
+    def update(self, dt):
+        if not self.loading_complete:
+            completed = sum(1 for f in self.futures if f.done())
+            self.loading_screen.update(completed / len(self.futures))
+            if completed == len(self.futures):
+                self.loading_complete = True
+                self.scenes[0].start_sound()
+        elif not self.initial_fade_complete:
+            self.initial_fade_alpha = max(0, self.initial_fade_alpha - 5)
+            if self.initial_fade_alpha <= 0:
+                self.initial_fade_complete = True
+        else:
+            current_scene = self.scenes[self.current_scene]
+            current_scene.update()
             
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.transitioning and current_scene.alpha <= 0:
+                if not self.scenes[self.current_scene].is_final_scene:
+                    current_scene.stop_sound()
+                self.current_scene += 1
+                if not self.scenes[self.current_scene - 1].is_final_scene:
+                    self.scenes[self.current_scene].start_sound()
+                self.transitioning = False
+
+    def draw(self, screen):
+        if not self.loading_complete:
+            self.loading_screen.draw()
+            return
         
-        if not self.fade_out_complete:
-            for scene in self.scenes:
-                if scene.sound:
-                    scene.stop_sound()
-                if scene.typewriter_sound:
-                    scene.typewriter_sound.stop()
-            pygame.quit()
-            sys.exit()
+        self.screen.fill((0, 0, 0))
+        self.scenes[self.current_scene].render(self.screen)
+        if not self.initial_fade_complete:
+            self.fade_surface.set_alpha(self.initial_fade_alpha)
+            self.screen.blit(self.fade_surface, (0, 0))
+
+    def run(self):
+        SceneManager(self.runtime).run(self)
+        self.runtime.shutdown()
+        sys.exit()
+
+register('intramuros_story', OpeningSequence, assets=STORY_ASSETS)
 
 def main():
     try:
@@ -614,4 +580,4 @@ def main():
     sequence.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiling.run('intramuros_story', main)
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Sprites load their images relative to the repository, without a real window or sound card
+REPO = Path(__file__).resolve().parents[1]
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, str(REPO))
+
+@pytest.fixture(autouse=True)
+def in_repo(monkeypatch):
+    monkeypatch.chdir(REPO)
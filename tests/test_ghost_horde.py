@@ -0,0 +1,54 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+import pytest
+
+from ghost_horde import GhostHorde
+from sprites import CollisionGroup
+
+STEP = 1 / 120  # The fixed simulation step
+
+def make_horde(positions, player_centre, blocks=((5000, 5000, 64, 64),)):
+    group = CollisionGroup()
+    for block in blocks:
+        sprite = pygame.sprite.Sprite(group)
+        sprite.rect = pygame.Rect(block)
+    player = SimpleNamespace(rect=pygame.Rect(0, 0, 40, 60))
+    player.rect.center = player_centre
+    horde = GhostHorde(positions, player, group, seed=0)
+    horde.start_moving()
+    return horde
+
+def run(horde, seconds):
+    for _ in range(round(seconds / STEP)):
+        horde.update(STEP)
+
+@pytest.mark.parametrize('player_offset', [(150, 0), (106, 106)])
+def test_chase_moves_speed_times_dt(player_offset):
+    horde = make_horde([(1000, 1000)], (1000 + player_offset[0], 1000 + player_offset[1]))
+    horde.update(STEP)
+    assert math.hypot(*(horde.pos[0] - (1000, 1000))) == pytest.approx(horde.speed * STEP)
+    run(horde, 0.25 - STEP)
+    direction = np.array(player_offset) / math.hypot(*player_offset)
+    np.testing.assert_allclose(horde.pos[0], (1000, 1000) + direction * horde.speed * 0.25)
+
+def test_wander_keeps_its_heading():
+    horde = make_horde([(1000, 1000)], (3000, 3000))
+    heading = np.array([math.cos(math.radians(30)), math.sin(math.radians(30))])
+    horde.wander_direction[0] = heading
+    horde.wander_interval[0] = 10
+    run(horde, 1)
+    np.testing.assert_allclose(horde.pos[0], (1000, 1000) + heading * horde.speed * horde.wander_speed_factor)
+
+def test_blocks_stop_ghosts_at_their_edge():
+    horde = make_horde([(1000, 1000)], (1150, 1000), blocks=[(1050, 900, 64, 200)])
+    run(horde, 0.5)
+    assert horde.pos[0][0] == 1050 - horde.half_hitbox[0]
+
+def test_everything_is_visible_without_blocks():
+    horde = make_horde([(1000, 1000), (1100, 1050)], (1050, 1000), blocks=())
+    assert horde.line_of_sight(horde.pos, np.array([1050.0, 1000.0])).all()
+    horde.update(STEP)
+    assert horde.moving.all()
@@ -0,0 +1,25 @@
+from asset_manager import SHARED, assets
+from sprites import Collectibles, ImageCache
+
+SHARD = "img//env//shard1.png"
+
+def test_hold_takes_a_new_reference_after_the_owner_released():
+    cache = ImageCache()
+    assets.owner = 'round'
+    try:
+        cache.load(SHARD)
+        assets.release('round')  # What the SceneManager does when the scene leaves
+        assert not assets.holds('round', 'image', SHARD)
+
+        cache.load(SHARD)
+        assert assets.holds('round', 'image', SHARD)
+    finally:
+        cache.release()
+        assets.owner = SHARED
+    assert not assets.holds('round', 'image', SHARD)
+
+def test_collectible_frames_are_dropped_with_the_cache():
+    Collectibles((0, 0), (), SHARD)
+    assert Collectibles.frame_cache and Collectibles.glow_cache
+    assets.clear()
+    assert not Collectibles.frame_cache and not Collectibles.glow_cache